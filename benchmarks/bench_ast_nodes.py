@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los nodos del AST: nodos con __slots__ (tipo entero y campos con nombre) frente
+a las tuplas ('TIPO', ...) que producía el parser, en memoria por nodo y en velocidad de un
+recorrido completo. El recorrido con tuplas despacha como lo hacían el semántico y el
+generador (largo y primer elemento de cada tupla); el de nodos, por `kind`.
+
+Uso:
+    python benchmarks/bench_ast_nodes.py            # ~1 millón de nodos
+    python benchmarks/bench_ast_nodes.py 3000000    # cantidad aproximada de nodos
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_source
+from src.lexico.lexer import lexer
+from src.sintactico.parser import parser
+from src.sintactico.ast_nodes import (
+    Node, to_tuple, from_tuple, DECLARATION, ASSIGNMENT, IF, IF_ELSE, WHILE, RETURN, FUNC_CALL,
+    BINARY, NOT, CAST,
+)
+
+# Nodos promedio por línea del corpus generado
+NODES_PER_LINE = 3
+
+
+def traced(build):
+    """Ejecuta build() y devuelve (resultado, bytes retenidos)."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def walk_tuples(ast):
+    """Recorre un AST de tuplas y cuenta sus nodos, revisando la forma de cada tupla."""
+    count = 0
+    pending = list(ast)
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, tuple):
+            continue
+        count += 1
+        tag = node[0]
+        if tag == 'DECLARATION':
+            if node[1] == 'const':
+                pending.append(node[4])
+            elif len(node) == 4:
+                pending.append(node[3])
+        elif tag == 'ASSIGNMENT':
+            pending.append(node[2])
+        elif tag == 'IF' or tag == 'WHILE':
+            pending.append(node[1])
+            pending.extend(node[2])
+        elif tag == 'IF_ELSE':
+            pending.append(node[1])
+            pending.extend(node[2])
+            pending.extend(node[3])
+        elif tag == 'RETURN':
+            pending.append(node[1])
+        elif len(node) == 2 and tag == 'NOT':
+            pending.append(node[1])
+        elif len(node) == 3 and tag == 'CAST':
+            pending.append(node[2])
+        elif len(node) == 3 and tag == 'FUNC_CALL':
+            pending.extend(node[2])
+        elif len(node) == 3:
+            pending.append(node[1])
+            pending.append(node[2])
+    return count
+
+
+def walk_nodes(ast):
+    """El mismo recorrido sobre un AST de nodos, despachando por `kind`."""
+    count = 0
+    pending = list(ast)
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, Node):
+            continue
+        count += 1
+        kind = node.kind
+        if kind == BINARY:
+            pending.append(node.left)
+            pending.append(node.right)
+        elif kind == DECLARATION:
+            if node.init is not None:
+                pending.append(node.init)
+        elif kind == ASSIGNMENT:
+            pending.append(node.expr)
+        elif kind == IF:
+            pending.append(node.cond)
+            pending.extend(node.then_block)
+        elif kind == IF_ELSE:
+            pending.append(node.cond)
+            pending.extend(node.then_block)
+            pending.extend(node.else_block)
+        elif kind == WHILE:
+            pending.append(node.cond)
+            pending.extend(node.body)
+        elif kind == RETURN:
+            pending.append(node.expr)
+        elif kind == NOT:
+            pending.append(node.operand)
+        elif kind == CAST:
+            pending.append(node.expr)
+        elif kind == FUNC_CALL:
+            pending.extend(node.args)
+    return count
+
+
+def best_of(fn, arg, repeat=3):
+    """(mejor tiempo en segundos, resultado) de `repeat` ejecuciones de fn(arg)."""
+    best = None
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        result = fn(arg)
+        elapsed = time.perf_counter() - inicio
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv):
+    target_nodes = int(argv[0]) if argv else 1_000_000
+    ast = parser(lexer(generate_source(max(1, target_nodes // NODES_PER_LINE))))
+
+    # Las dos representaciones se copian del mismo AST: comparten las hojas (números y
+    # strings) y copian las listas de los bloques, así que la diferencia son los nodos
+    tuples, tuples_bytes = traced(lambda: to_tuple(ast))
+    nodes, nodes_bytes = traced(lambda: from_tuple(tuples))
+    del ast
+
+    tuples_seconds, count = best_of(walk_tuples, tuples)
+    nodes_seconds, node_count = best_of(walk_nodes, nodes)
+    if node_count != count:
+        raise AssertionError("Los recorridos visitaron distinta cantidad de nodos")
+
+    print("BENCHMARK DE NODOS DEL AST")
+    print("=" * 80)
+    print(f"Nodos: {count:,} en {len(nodes):,} sentencias de primer nivel")
+    print("-" * 80)
+    print(f"{'Representación':<28} {'Retenido (MB)':>14} {'Bytes/nodo':>11} {'Recorrido (s)':>14} "
+          f"{'ns/nodo':>9}")
+    print(f"{'Tuplas (tipo en string)':<28} {tuples_bytes / 1e6:>14.1f} {tuples_bytes / count:>11.1f} "
+          f"{tuples_seconds:>14.3f} {tuples_seconds / count * 1e9:>9.0f}")
+    print(f"{'Nodos con __slots__':<28} {nodes_bytes / 1e6:>14.1f} {nodes_bytes / count:>11.1f} "
+          f"{nodes_seconds:>14.3f} {nodes_seconds / count * 1e9:>9.0f}")
+    print("-" * 80)
+    print(f"Memoria: x{tuples_bytes / nodes_bytes:.2f}   Recorrido: x{tuples_seconds / nodes_seconds:.2f}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark del grafo de flujo de control: construye el CFG de las cuádruplas de programas de
+alrededor de 100k cuádruplas y mide por separado los bloques básicos (cortar y enlazar), los
+dominadores y los bucles naturales. Tres formas de programa: el corpus (declaraciones e
+if/else en secuencia), bucles while con un while y un if adentro, y if anidados (un árbol de
+dominadores tan profundo como el anidamiento). Los while se arman con from_tuple, porque el
+parser todavía no los reconoce.
+
+Uso:
+    python benchmarks/bench_cfg.py              # ~100k cuádruplas por programa
+    python benchmarks/bench_cfg.py 1000000      # ~1M cuádruplas por programa
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_source
+from src.compiler import Compiler
+from src.sintactico.ast_nodes import from_tuple
+from src.generador.code_generator import CodeGenerator
+from src.generador.cfg import ControlFlowGraph
+
+# Cuádruplas por línea del corpus y por repetición de los otros programas (aproximadas)
+QUADS_PER_LINE = 2.9
+QUADS_PER_LOOP = 22
+QUADS_PER_IF = 5
+
+
+def corpus_quads(num_quads):
+    return Compiler().compile(generate_source(int(num_quads / QUADS_PER_LINE))).quads
+
+
+def loop_quads(num_quads):
+    """while (i < n) { j = 0; while (j < i) { if (j == 3) { x = x + j; } j = j + 1; } i = i + 1; }"""
+    loop = ('WHILE', ('<', 'i', 10), [
+        ('ASSIGNMENT', 'j', 0),
+        ('WHILE', ('<', 'j', 'i'), [
+            ('IF', ('==', 'j', 3), [('ASSIGNMENT', 'x', ('+', 'x', 'j'))]),
+            ('ASSIGNMENT', 'j', ('+', 'j', 1)),
+        ]),
+        ('ASSIGNMENT', 'i', ('+', 'i', 1)),
+    ])
+    program = [('DECLARATION', 'int', 'i', 0), ('DECLARATION', 'int', 'j', 0), ('DECLARATION', 'int', 'x', 0)]
+    program += [loop] * (num_quads // QUADS_PER_LOOP)
+    return CodeGenerator().generate(from_tuple(program))
+
+
+def nested_if_quads(num_quads):
+    depth = num_quads // QUADS_PER_IF
+    source = "int x = 0; " + "if (x < 5) { " * depth + "x = 1;" + " }" * depth
+    return Compiler().compile(source).quads
+
+
+def main(argv):
+    num_quads = next((int(a) for a in argv if a.isdigit()), 100_000)
+
+    print("BENCHMARK DEL GRAFO DE FLUJO DE CONTROL")
+    print("=" * 96)
+    print(f"{'Programa':<12} {'Cuádruplas':>11} {'Bloques':>9} {'Aristas':>9} {'Bucles':>7} "
+          f"{'Bloques (s)':>12} {'Dominadores (s)':>16} {'Bucles (s)':>11} {'Total (s)':>10}")
+    print("-" * 96)
+
+    for name, build in (("corpus", corpus_quads), ("while", loop_quads), ("if anidados", nested_if_quads)):
+        quads = build(num_quads)
+
+        inicio = time.perf_counter()
+        cfg = ControlFlowGraph(quads)
+        bloques = time.perf_counter()
+        cfg.dominators()
+        dominadores = time.perf_counter()
+        loops = cfg.natural_loops()
+        fin = time.perf_counter()
+
+        edges = sum(len(block.successors) for block in cfg)
+        print(f"{name:<12} {len(quads):>11,} {len(cfg):>9,} {edges:>9,} {len(loops):>7,} "
+              f"{bloques - inicio:>12.3f} {dominadores - bloques:>16.3f} {fin - dominadores:>11.3f} "
+              f"{fin - inicio:>10.3f}")
+        del quads, cfg, loops
+
+    print("=" * 96)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Benchmark de programas profundamente anidados: el analizador sintáctico, la evaluación de
+tipos del semántico y el generador de código recorren el AST con pilas explícitas. Se
+comparan con las versiones recursivas anteriores (copiadas abajo como referencia), que con
+el límite de recursión por defecto fallan con RecursionError y, con el límite elevado,
+pagan la creación de un marco de Python por nodo.
+
+Uso:
+    python benchmarks/bench_deep_nesting.py                # profundidades 1k, 10k y 100k
+    python benchmarks/bench_deep_nesting.py 500 50000      # profundidades personalizadas
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexico.lexer import lexer
+from src.sintactico.parser import (
+    parser, TokenCursor, binary_operators, parse_primary, parse_statement, parse_id,
+    parse_equals, parse_semi, expect, expect_keyword, match, match_keyword,
+)
+from src.sintactico.ast_nodes import (
+    Node, Assignment, If, Binary, Not, Cast, BLOCK_ENTER_NODE, BLOCK_EXIT_NODE, ASSIGNMENT, IF, BINARY, NOT, CAST,
+)
+from src.semantico.semantic import SymbolTable, evaluate_expression, binary_type, cast_type_of, format_ast
+from src.generador.code_generator import CodeGenerator
+
+
+# --- Versiones recursivas anteriores (referencia) ---
+
+def recursive_parser(tokens):
+    """parser() con las funciones recursivas de expresiones e 'if' anidados."""
+    cursor = TokenCursor(tokens)
+    ast = []
+    while cursor:
+        ast.append(recursive_parse_statement(cursor))
+    return ast
+
+
+def recursive_parse_statement(tokens):
+    if match_keyword(tokens, 'if'):
+        return recursive_parse_if(tokens)
+    if match(tokens, 'IDENTIFIER'):
+        ident = parse_id(tokens)
+        parse_equals(tokens)
+        expr = recursive_parse_expression(tokens)
+        parse_semi(tokens)
+        return Assignment(ident, expr)
+    return parse_statement(tokens)
+
+
+def recursive_parse_if(tokens):
+    expect_keyword(tokens, 'if')
+    expect(tokens, 'LPAREN')
+    cond = recursive_parse_expression(tokens)
+    expect(tokens, 'RPAREN')
+    expect(tokens, 'LBRACE')
+    then_block = [BLOCK_ENTER_NODE]
+    while tokens and not match(tokens, 'RBRACE'):
+        then_block.append(recursive_parse_statement(tokens))
+    then_block.append(BLOCK_EXIT_NODE)
+    expect(tokens, 'RBRACE')
+    return If(cond, then_block)
+
+
+def recursive_parse_expression(tokens, min_precedence=1):
+    left = recursive_parse_unary(tokens)
+    while True:
+        token = tokens.current
+        if token is None:
+            return left
+        precedence = binary_operators.get(token[1])
+        if precedence is None or precedence < min_precedence:
+            return left
+        tokens.advance()
+        right = recursive_parse_expression(tokens, precedence + 1)
+        left = Binary(token[1], left, right)
+
+
+def recursive_parse_unary(tokens):
+    token = tokens.current
+    if token is not None and token[0] == 'OPERATOR' and token[1] == '!':
+        tokens.advance()
+        return Not(recursive_parse_unary(tokens))
+    return recursive_parse_primary(tokens)
+
+
+def recursive_parse_primary(tokens):
+    tk_type, tk_val, _ = tokens.peek()
+    if tk_type == 'LPAREN':
+        tokens.advance()
+        expr = recursive_parse_expression(tokens)
+        expect(tokens, 'RPAREN')
+        return expr
+    if tk_type == 'KEYWORD' and tk_val in ('int', 'float', 'string'):
+        tokens.advance()
+        expect(tokens, 'LPAREN')
+        expr = recursive_parse_expression(tokens)
+        expect(tokens, 'RPAREN')
+        return Cast(tk_val, expr)
+    _, value = parse_primary(tokens)  # Literales e identificadores (los casos de prueba no tienen llamadas)
+    return value
+
+
+def recursive_evaluate_expression(expr, symbols):
+    if isinstance(expr, Node):
+        if expr.kind == CAST:
+            return cast_type_of(expr.cast_type, recursive_evaluate_expression(expr.expr, symbols))
+        if expr.kind == NOT:
+            sub_type = recursive_evaluate_expression(expr.operand, symbols)
+            if sub_type != 'bool':
+                raise SyntaxError(f"Uso inválido del operador '!': se esperaba 'bool' pero se obtuvo '{sub_type}'")
+            return 'bool'
+        if expr.kind == BINARY:
+            left_type = recursive_evaluate_expression(expr.left, symbols)
+            right_type = recursive_evaluate_expression(expr.right, symbols)
+            return binary_type(expr.op, left_type, right_type)
+    return evaluate_expression(expr, symbols)  # Literales y variables
+
+
+class RecursiveCodeGenerator(CodeGenerator):
+    def generate_expression(self, expr):
+        if isinstance(expr, Node):
+            if expr.kind == NOT:
+                operand_temp = self.generate_expression(expr.operand)
+                return self.emit(self.new_temp(), '!', operand_temp, None)
+            if expr.kind == CAST:
+                operand_temp = self.generate_expression(expr.expr)
+                return self.emit(self.new_temp(), f'cast_{expr.cast_type}', operand_temp, None)
+            if expr.kind == BINARY:
+                left_temp = self.generate_expression(expr.left)
+                right_temp = self.generate_expression(expr.right)
+                return self.emit(self.new_temp(), expr.op, left_temp, right_temp)
+        return super().generate_expression(expr)  # Literales y variables
+
+    def generate_statement(self, stmt):
+        if stmt.kind != IF:
+            return super().generate_statement(stmt)
+        cond_temp = self.generate_expression(stmt.cond)
+        else_label = self.new_label()
+        end_label = self.new_label()
+        self.emit(None, 'if_false', cond_temp, else_label)
+        for inner in stmt.then_block:
+            self.generate_statement(inner)
+        self.emit(None, 'goto', end_label, None)
+        self.emit(else_label, 'label', None, None)
+        self.emit(end_label, 'label', None, None)
+
+
+# --- Programas de prueba ---
+
+SHAPES = {
+    'cadena +': lambda n: 'x = ' + ' + '.join(['1'] * n) + ';',
+    'paréntesis': lambda n: 'x = ' + '(' * n + '1' + ')' * n + ';',
+    'negaciones': lambda n: 'x = ' + '!' * n + 'true;',
+    'casts': lambda n: 'x = ' + 'int(float(' * (n // 2) + '1' + '))' * (n // 2) + ';',
+    'if anidados': lambda n: 'if (true) { ' * n + 'x = 1;' + ' }' * n,
+}
+
+
+def measure(fn, *args):
+    """(segundos, resultado) de fn(*args), o (None, 'RecursionError') si excede el límite."""
+    inicio = time.perf_counter()
+    try:
+        result = fn(*args)
+    except RecursionError:
+        return None, 'RecursionError'
+    return time.perf_counter() - inicio, result
+
+
+def phases(ast, explicit):
+    """Fases a medir sobre un AST: (nombre, función, argumentos)."""
+    first = ast[0]
+    yield 'parser', (parser if explicit else recursive_parser), None
+    if first.kind == ASSIGNMENT:
+        evaluate = evaluate_expression if explicit else recursive_evaluate_expression
+        yield 'tipos', evaluate, (first.expr, SymbolTable())
+    generator = CodeGenerator() if explicit else RecursiveCodeGenerator()
+    yield 'código', generator.generate, (ast,)
+
+
+def fmt(seconds, result):
+    return f"{seconds:>12.4f}" if seconds is not None else f"{result:>12}"
+
+
+def main(argv):
+    depths = [int(a) for a in argv if a.isdigit()] or [1_000, 10_000, 100_000]
+    default_limit = sys.getrecursionlimit()
+
+    print("BENCHMARK DE ANIDAMIENTO PROFUNDO")
+    print("=" * 92)
+    print(f"{'Caso':<12} {'Profundidad':>11} {'Fase':<8} {'Pila (s)':>12} {'Recursiva (s)':>14} "
+          f"{'Recursiva, límite por defecto':>31}")
+    print("-" * 92)
+
+    for shape, build in SHAPES.items():
+        for depth in depths:
+            tokens = lexer(build(depth))
+            ast = parser(tokens)
+            explicit_phases = list(phases(ast, True))
+            recursive_phases = list(phases(ast, False))
+
+            for (name, fn, args), (_, recursive_fn, recursive_args) in zip(explicit_phases, recursive_phases):
+                args = args or (tokens,)
+                recursive_args = recursive_args or (tokens,)
+                seconds, result = measure(fn, *args)
+
+                # Con el límite por defecto, la versión recursiva solo sirve para poca profundidad
+                _, default_result = measure(recursive_fn, *recursive_args)
+                default_status = 'RecursionError' if default_result == 'RecursionError' else 'ok'
+
+                sys.setrecursionlimit(max(default_limit, 10 * depth + 1000))
+                try:
+                    recursive_seconds, recursive_result = measure(recursive_fn, *recursive_args)
+                finally:
+                    sys.setrecursionlimit(default_limit)
+                # Los AST se comparan por su texto, que no depende de la recursión
+                if recursive_seconds is not None and format_ast(recursive_result) != format_ast(result):
+                    raise AssertionError(f"{shape}/{name}: la versión recursiva dio otro resultado")
+
+                print(f"{shape:<12} {depth:>11} {name:<8} {fmt(seconds, result)} "
+                      f"{fmt(recursive_seconds, recursive_result):>14} {default_status:>31}")
+            del tokens, ast
+
+    print("=" * 92)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
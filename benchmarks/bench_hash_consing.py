@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark de expresiones compartidas (hash-consing): el corpus generado repite las mismas
+subexpresiones ((3.14 * 2.0) / 1.5, !false, v{j} > 5, ...) miles de veces. Con un
+ExpressionPool cada subexpresión distinta es un solo nodo, el semántico reutiliza su tipo
+mientras sus variables tengan los mismos tipos y el generador reutiliza su temporal en el
+mismo camino. Se compara la memoria del AST (con la tabla de estructuras del pool, que sirve
+mientras se analiza, y sin ella), las evaluaciones de tipos y las cuádruplas.
+
+Uso:
+    python benchmarks/bench_hash_consing.py              # 10k y 100k líneas
+    python benchmarks/bench_hash_consing.py 500000
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_source
+from src.lexico.lexer import lexer
+from src.sintactico.parser import parser
+from src.sintactico.ast_nodes import (
+    Node, ExpressionPool, DECLARATION, ASSIGNMENT, IF, IF_ELSE, BINARY, NOT, CAST, FUNC_CALL,
+)
+from src.semantico.semantic import semantic
+from src.generador.code_generator import CodeGenerator
+
+
+def traced(build):
+    """Ejecuta build() y devuelve (resultado, bytes retenidos)."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def expressions(ast):
+    """Expresiones que revisa el semántico: inicializaciones, asignaciones y condiciones."""
+    pending = list(reversed(ast))
+    while pending:
+        node = pending.pop()
+        if node.kind == DECLARATION:
+            if node.init is not None:
+                yield node.init
+        elif node.kind == ASSIGNMENT:
+            yield node.expr
+        elif node.kind == IF:
+            yield node.cond
+            pending.extend(reversed(node.then_block))
+        elif node.kind == IF_ELSE:
+            yield node.cond
+            pending.extend(reversed(node.else_block))
+            pending.extend(reversed(node.then_block))
+
+
+def expression_size(expr):
+    """Subexpresiones (nodos y hojas) que evaluate_expression visita sin pool."""
+    size = 0
+    pending = [expr]
+    while pending:
+        expr = pending.pop()
+        size += 1
+        if isinstance(expr, Node):
+            if expr.kind == BINARY:
+                pending.append(expr.left)
+                pending.append(expr.right)
+            elif expr.kind == NOT:
+                pending.append(expr.operand)
+            elif expr.kind == CAST:
+                pending.append(expr.expr)
+            elif expr.kind == FUNC_CALL:
+                pending.extend(expr.args)
+    return size
+
+
+def front_end(ast, pool):
+    """(segundos del semántico, cuádruplas generadas)."""
+    inicio = time.perf_counter()
+    semantic(ast, pool)
+    elapsed = time.perf_counter() - inicio
+    return elapsed, len(CodeGenerator(pool).generate(ast))
+
+
+def main(argv):
+    sizes = [int(a) for a in argv if a.isdigit()] or [10_000, 100_000]
+
+    print("BENCHMARK DE EXPRESIONES COMPARTIDAS")
+    print("=" * 110)
+    print(f"{'Líneas':>8} {'Modo':<10} {'AST (MB)':>9} {'Sin tabla':>10} {'Nodos expr.':>12} "
+          f"{'Evaluaciones':>13} {'Reutilizadas':>13} {'Semántico (s)':>14} {'Cuádruplas':>11}")
+    print("-" * 110)
+
+    for num_lines in sizes:
+        tokens = lexer(generate_source(num_lines))
+
+        ast, ast_bytes = traced(lambda: parser(tokens))
+        evaluations = sum(map(expression_size, expressions(ast)))
+        seconds, quads = front_end(ast, None)
+        print(f"{num_lines:>8} {'árbol':<10} {ast_bytes / 1e6:>9.1f} {'':>10} {'':>12} "
+              f"{evaluations:>13,} {'':>13} {seconds:>14.3f} {quads:>11,}")
+        del ast
+
+        # Memoria con la tabla de estructuras del pool y después de soltarla
+        pool = ExpressionPool()
+        tracemalloc.start()
+        ast = parser(tokens, pool=pool)
+        shared_bytes, _ = tracemalloc.get_traced_memory()
+        pool.release()
+        released_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        seconds, shared_quads = front_end(ast, pool)
+        print(f"{num_lines:>8} {'compartido':<10} {shared_bytes / 1e6:>9.1f} {released_bytes / 1e6:>10.1f} "
+              f"{pool.shared:>12,} {pool.type_evals:>13,} {pool.type_hits:>13,} {seconds:>14.3f} "
+              f"{shared_quads:>11,}")
+        print(f"{'':>8} {'ahorro':<10} {1 - shared_bytes / ast_bytes:>9.0%} {1 - released_bytes / ast_bytes:>10.0%} "
+              f"{'de ' + format(pool.interned, ','):>12} {evaluations - pool.type_evals:>13,} {'':>13} "
+              f"{'':>14} {quads - shared_quads:>11,}")
+        del tokens, ast, pool
+
+    print("=" * 110)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
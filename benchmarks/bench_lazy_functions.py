@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark de cuerpos de función bajo demanda: un programa declara muchas funciones y llama
+solo algunas. El parser guarda el rango de tokens de cada cuerpo y lo analiza la primera vez
+que el semántico o el generador lo necesitan; se compara con analizar todos los cuerpos
+(lo que haría un parser que construye cada cuerpo al declararlo).
+
+Uso:
+    python benchmarks/bench_lazy_functions.py                 # 1k y 10k funciones, 10 llamadas
+    python benchmarks/bench_lazy_functions.py 5000 --calls=100
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexico.lexer import lexer
+from src.sintactico.parser import parser
+from src.sintactico.ast_nodes import FUNC_DECL
+from src.semantico.semantic import semantic
+from src.generador.code_generator import CodeGenerator
+
+# Cuerpo de cada función: unas cuantas declaraciones, un if y el retorno
+BODY = (
+    "int a = n * 2 + 1; float b = float(a) / 3.5; int c = a - n;"
+    " if (a > c) { c = c + a * (n - 1); } else { c = c - 1; } return c + a;"
+)
+
+
+def generate_program(num_functions, num_calls):
+    """Programa con `num_functions` funciones declaradas y `num_calls` de ellas llamadas."""
+    lines = [f"int f{i}(int n) {{ {BODY} }}" for i in range(num_functions)]
+    step = max(1, num_functions // max(1, num_calls))
+    lines.extend(f"int r{i} = f{i}({i});" for i in range(0, num_functions, step)[:num_calls])
+    return "\n".join(lines) + "\n"
+
+
+def front_end(ast, eager):
+    """Semántico y generación de código; con `eager` antes se analizan todos los cuerpos."""
+    if eager:
+        for node in ast:
+            if node.kind == FUNC_DECL:
+                node.body.statements()
+    semantic(ast)
+    return CodeGenerator().generate(ast)
+
+
+def main(argv):
+    sizes = [int(a) for a in argv if a.isdigit()] or [1_000, 10_000]
+    num_calls = next((int(a.split('=')[1]) for a in argv if a.startswith('--calls=')), 10)
+
+    print("BENCHMARK DE CUERPOS DE FUNCIÓN BAJO DEMANDA")
+    print("=" * 84)
+    print(f"{'Funciones':>10} {'Llamadas':>9} {'Tokens':>10} {'parser (s)':>11} "
+          f"{'Bajo demanda (s)':>17} {'Todos (s)':>10} {'Cuádruplas':>11}")
+    print("-" * 84)
+
+    for num_functions in sizes:
+        tokens = lexer(generate_program(num_functions, num_calls))
+
+        inicio = time.perf_counter()
+        ast = parser(tokens)
+        parse_elapsed = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        code = front_end(ast, eager=False)
+        lazy_elapsed = time.perf_counter() - inicio
+
+        ast = parser(tokens)  # Cuerpos sin analizar otra vez
+        inicio = time.perf_counter()
+        eager_code = front_end(ast, eager=True)
+        eager_elapsed = time.perf_counter() - inicio
+
+        if code != eager_code:
+            raise AssertionError("El código generado depende de cuándo se analizan los cuerpos")
+        print(f"{num_functions:>10} {num_calls:>9} {len(tokens):>10} {parse_elapsed:>11.3f} "
+              f"{lazy_elapsed:>17.4f} {eager_elapsed:>10.3f} {len(code):>11}")
+        del tokens, ast
+
+    print("=" * 84)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark del analizador léxico: tokens por segundo con el patrón maestro
+frente al recorrido secuencial de token_regex_compiled (motor anterior).
+
+Uso:
+    python benchmarks/bench_lexer.py                # 10k y 1M líneas
+    python benchmarks/bench_lexer.py 10000 100000   # tamaños personalizados
+    python benchmarks/bench_lexer.py --legacy ...   # incluye el motor anterior en todos los tamaños
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_source
+from src.lexico.lexer import lexer, keywords, token_regex_compiled
+
+# El motor secuencial solo se mide por defecto hasta este tamaño (es varias veces más lento)
+LEGACY_MAX_LINES = 100_000
+
+
+def legacy_lexer(source_code):
+    """Motor anterior: prueba cada patrón de token_regex_compiled en cada posición."""
+    position = 0
+    found_tokens = []
+    line = 1
+    col = 1
+    while position < len(source_code):
+        match = None
+        for token_type, regex in token_regex_compiled:
+            match = regex.match(source_code, position)
+            if match:
+                token_value = match.group(0)
+                start_line = line
+                start_col = col
+                lines = token_value.split('\n')
+                if len(lines) > 1:
+                    line += len(lines) - 1
+                    col = len(lines[-1]) + 1
+                else:
+                    col += len(token_value)
+                if token_type not in ('WHITESPACE', 'COMMENT'):
+                    if token_type == 'IDENTIFIER' and token_value in keywords:
+                        token_type = 'KEYWORD'
+                    found_tokens.append((token_type, token_value, start_line, start_col))
+                position = match.end()
+                break
+        if not match:
+            raise SyntaxError(f"Token no reconocido '{source_code[position]}' en línea {line}, columna {col}")
+    return found_tokens
+
+
+def measure(fn, source):
+    inicio = time.perf_counter()
+    tokens = fn(source)
+    return tokens, time.perf_counter() - inicio
+
+
+def main(argv):
+    include_legacy = '--legacy' in argv
+    sizes = [int(a) for a in argv if a.isdigit()] or [10_000, 1_000_000]
+
+    print("BENCHMARK DEL ANALIZADOR LÉXICO")
+    print("=" * 80)
+    print(f"{'Líneas':>10} {'Motor':<12} {'Tokens':>10} {'Tiempo (s)':>11} {'Tokens/s':>14}")
+    print("-" * 80)
+
+    for num_lines in sizes:
+        source = generate_source(num_lines)
+
+        tokens, elapsed = measure(lexer, source)
+        print(f"{num_lines:>10} {'maestro':<12} {len(tokens):>10} {elapsed:>11.3f} {len(tokens) / elapsed:>14,.0f}")
+
+        if include_legacy or num_lines <= LEGACY_MAX_LINES:
+            legacy_tokens, legacy_elapsed = measure(legacy_lexer, source)
+            if legacy_tokens != list(tokens.with_positions()):
+                raise AssertionError("El motor maestro no produjo los mismos tokens que el secuencial")
+            print(f"{num_lines:>10} {'secuencial':<12} {len(legacy_tokens):>10} {legacy_elapsed:>11.3f} "
+                  f"{len(legacy_tokens) / legacy_elapsed:>14,.0f}   (x{legacy_elapsed / elapsed:.2f})")
+        del source, tokens
+
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
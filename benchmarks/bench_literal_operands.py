@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark de literales como operandos inmediatos: el generador de código intermedio emitía un
+temporal y una cuádrupla '=' por cada literal antes de usarlo; ahora el literal va directo
+en la cuádrupla que lo usa. Se mide la compilación completa (léxico hasta código objeto) del
+corpus y se cuentan las cuádruplas, los slots y las instrucciones del código objeto. Los
+operandos literales son las cuádruplas que el generador agregaba con un temporal por literal.
+
+Uso:
+    python benchmarks/bench_literal_operands.py              # 10k y 100k líneas
+    python benchmarks/bench_literal_operands.py 500000
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_source
+from src.compiler import Compiler
+from src.sintactico.ast_nodes import literal_type
+
+
+def literal_operands(quads):
+    """Operandos literales de las cuádruplas (sin contar los índices de 'arg' ni de 'call')."""
+    return sum(
+        literal_type(arg) is not None
+        for _, op, arg1, arg2 in quads if op not in ('arg', 'call')
+        for arg in (arg1, arg2)
+    )
+
+
+def main(argv):
+    sizes = [int(a) for a in argv if a.isdigit()] or [10_000, 100_000]
+
+    print("BENCHMARK DE LITERALES COMO OPERANDOS INMEDIATOS")
+    print("=" * 92)
+    print(f"{'Líneas':>8} {'Compilación (s)':>16} {'generate (s)':>13} {'assemble (s)':>13} "
+          f"{'Cuádruplas':>11} {'Literales':>10} {'Slots':>8} {'Instrucciones':>14}")
+    print("-" * 92)
+
+    for num_lines in sizes:
+        source = generate_source(num_lines)
+        compiler = Compiler()
+        inicio = time.perf_counter()
+        compiler.lex(source)
+        compiler.parse()
+        compiler.analyze()
+        generado = time.perf_counter()
+        compiler.generate()
+        ensamblado = time.perf_counter()
+        compiler.assemble()
+        fin = time.perf_counter()
+
+        instrucciones = sum(not linea.startswith("SLOTS ") for linea in compiler.asm.splitlines())
+        print(f"{num_lines:>8} {fin - inicio:>16.3f} {ensamblado - generado:>13.3f} {fin - ensamblado:>13.3f} "
+              f"{len(compiler.quads):>11,} {literal_operands(compiler.quads):>10,} "
+              f"{len(compiler.slots):>8,} {instrucciones:>14,}")
+        del source, compiler
+
+    print("=" * 92)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark de ingestión de archivos grandes: lexer_file (mmap + patrones en bytes)
+frente a leer el archivo a un str y llamar a lexer().
+
+Cada variante corre en un proceso aparte para que la memoria máxima (RSS) de una no
+contamine a la otra.
+
+Uso:
+    python benchmarks/bench_mmap_lexer.py            # archivos de 100 y 200 MB
+    python benchmarks/bench_mmap_lexer.py 100 400    # tamaños en MB
+"""
+
+import sys
+import os
+import time
+import resource
+import subprocess
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import write_source
+
+# Bytes promedio por línea del corpus generado
+BYTES_PER_LINE = 36
+
+
+def run_variant(variant, path):
+    """Se ejecuta en el proceso hijo: lexea el archivo e imprime tokens, segundos y RSS máximo."""
+    from src.lexico.lexer import lexer, lexer_file
+
+    inicio = time.perf_counter()
+    if variant == "mmap":
+        tokens = lexer_file(path)
+    else:
+        with open(path, encoding="utf-8") as f:
+            tokens = lexer(f.read())
+    elapsed = time.perf_counter() - inicio
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(len(tokens), elapsed, max_rss_mb)
+
+
+def measure(variant, path):
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--run", variant, path],
+                            capture_output=True, text=True, check=True)
+    count, elapsed, max_rss_mb = result.stdout.split()[-3:]
+    return int(count), float(elapsed), float(max_rss_mb)
+
+
+def main(argv):
+    sizes_mb = [int(a) for a in argv if a.isdigit()] or [100, 200]
+
+    print("BENCHMARK DE INGESTIÓN CON MMAP")
+    print("=" * 80)
+    print(f"{'Archivo (MB)':>12} {'Variante':<18} {'Tokens':>12} {'Tiempo (s)':>11} {'RSS máx (MB)':>13}")
+    print("-" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in sizes_mb:
+            path = write_source(os.path.join(tmp, f"programa_{size_mb}mb.txt"),
+                                size_mb * 1_000_000 // BYTES_PER_LINE)
+            real_mb = os.path.getsize(path) / 1e6
+            results = {}
+            for variant, label in (("str", "read() + lexer()"), ("mmap", "lexer_file()")):
+                results[variant] = measure(variant, path)
+                count, elapsed, max_rss_mb = results[variant]
+                print(f"{real_mb:>12.0f} {label:<18} {count:>12,} {elapsed:>11.2f} {max_rss_mb:>13.0f}")
+            if results["str"][0] != results["mmap"][0]:
+                raise AssertionError("Las dos variantes no produjeron la misma cantidad de tokens")
+            print(f"{'':>12} {'mejora':<18} {'':>12} {results['str'][1] / results['mmap'][1]:>10.2f}x "
+                  f"{results['str'][2] / results['mmap'][2]:>12.2f}x")
+            os.remove(path)
+
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        run_variant(sys.argv[2], sys.argv[3])
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escalabilidad del lexer paralelo con 1, 2, 4 y 8 procesos.
+
+Uso:
+    python benchmarks/bench_parallel_lexer.py            # 500k líneas
+    python benchmarks/bench_parallel_lexer.py 2000000    # cantidad de líneas
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_source
+from src.lexico.lexer import lexer
+from src.lexico.parallel import parallel_lexer
+
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def main(argv):
+    num_lines = int(argv[0]) if argv else 500_000
+    source = generate_source(num_lines)
+
+    print("BENCHMARK DEL LEXER PARALELO")
+    print("=" * 80)
+    print(f"Líneas: {num_lines:,}   Caracteres: {len(source):,}   CPUs disponibles: {os.cpu_count()}")
+    print("-" * 80)
+
+    inicio = time.perf_counter()
+    reference = lexer(source)
+    sequential = time.perf_counter() - inicio
+    print(f"{'Procesos':>9} {'Tiempo (s)':>11} {'Tokens/s':>14} {'Aceleración':>12}")
+    print(f"{'lexer()':>9} {sequential:>11.3f} {len(reference) / sequential:>14,.0f} {1.0:>11.2f}x")
+
+    for workers in WORKER_COUNTS:
+        inicio = time.perf_counter()
+        tokens = parallel_lexer(source, workers=workers, min_size=0)
+        elapsed = time.perf_counter() - inicio
+        if (tokens.kinds, tokens.starts, tokens.ends, tokens.lines) != \
+           (reference.kinds, reference.starts, reference.ends, reference.lines):
+            raise AssertionError(f"El resultado con {workers} procesos difiere de lexer()")
+        print(f"{workers:>9} {elapsed:>11.3f} {len(tokens) / elapsed:>14,.0f} {sequential / elapsed:>11.2f}x")
+
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
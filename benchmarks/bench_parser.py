@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark del analizador sintáctico: tiempo de parser() para programas de 1k a 1M
+tokens. Con el cursor de tokens el costo por token debe mantenerse constante.
+
+Uso:
+    python benchmarks/bench_parser.py                       # 1k, 10k, 100k y 1M tokens
+    python benchmarks/bench_parser.py 5000 50000            # cantidades de tokens personalizadas
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_lines
+from src.lexico.lexer import lexer
+from src.sintactico.parser import parser
+
+
+def source_with_tokens(num_tokens):
+    """Programa del corpus con al menos `num_tokens` tokens (cortado en una línea completa)."""
+    lines = []
+    total = 0
+    for line in generate_lines(num_tokens):
+        lines.append(line)
+        total += len(lexer(line))
+        if total >= num_tokens:
+            break
+    return "\n".join(lines) + "\n"
+
+
+def main(argv):
+    sizes = [int(a) for a in argv if a.isdigit()] or [1_000, 10_000, 100_000, 1_000_000]
+
+    print("BENCHMARK DEL ANALIZADOR SINTÁCTICO")
+    print("=" * 70)
+    print(f"{'Tokens':>10} {'Sentencias':>11} {'Tiempo (s)':>11} {'Tokens/s':>14} {'ns/token':>10}")
+    print("-" * 70)
+
+    for num_tokens in sizes:
+        tokens = lexer(source_with_tokens(num_tokens))
+
+        inicio = time.perf_counter()
+        ast = parser(tokens)
+        elapsed = time.perf_counter() - inicio
+
+        print(f"{len(tokens):>10} {len(ast):>11} {elapsed:>11.3f} {len(tokens) / elapsed:>14,.0f} "
+              f"{elapsed / len(tokens) * 1e9:>10.0f}")
+        del tokens, ast
+
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Llamadas a funciones de Python por token en parser(), contadas con cProfile sobre el
+corpus sintético.
+
+Uso:
+    python benchmarks/bench_parser_calls.py          # 10k líneas
+    python benchmarks/bench_parser_calls.py 50000    # tamaño personalizado
+"""
+
+import sys
+import os
+import cProfile
+import pstats
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_source
+from src.lexico.lexer import lexer
+from src.sintactico.parser import parser
+
+
+def main(argv):
+    num_lines = int(argv[0]) if argv else 10_000
+    tokens = lexer(generate_source(num_lines))
+
+    profile = cProfile.Profile()
+    profile.runcall(parser, tokens)
+    stats = pstats.Stats(profile)
+
+    print("LLAMADAS A FUNCIONES EN EL ANALIZADOR SINTÁCTICO")
+    print("=" * 70)
+    print(f"Tokens: {len(tokens)}")
+    print(f"Llamadas totales: {stats.total_calls}")
+    print(f"Llamadas por token: {stats.total_calls / len(tokens):.2f}")
+    print("-" * 70)
+    print(f"{'Función':<40} {'Llamadas':>12} {'Por token':>12}")
+    by_calls = sorted(stats.stats.items(), key=lambda item: item[1][1], reverse=True)
+    for (_, _, name), (_, calls, _, _, _) in by_calls[:12]:
+        print(f"{name:<40} {calls:>12} {calls / len(tokens):>12.2f}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
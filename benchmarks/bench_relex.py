@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark del lexer incremental: tiempo de relex() después de editar una línea
+frente a volver a lexear el archivo completo con lexer().
+
+Uso:
+    python benchmarks/bench_relex.py                # 100k líneas
+    python benchmarks/bench_relex.py 10000 1000000  # tamaños personalizados
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_source
+from src.lexico.lexer import lexer
+from src.lexico.incremental import relex
+
+
+def edits(source):
+    """Ediciones de una línea en la mitad del archivo: (descripción, desplazamiento, borrados, insertado)."""
+    middle = source.index('\n', len(source) // 2) + 1
+    line_end = source.index('\n', middle)
+    return [
+        ("renombrar", middle + 4, 1, "renombrada"),
+        ("nueva línea", middle, 0, "int extra = 1 + 2;\n"),
+        ("borrar línea", middle, line_end - middle + 1, ""),
+    ]
+
+
+def main(argv):
+    sizes = [int(a) for a in argv if a.isdigit()] or [100_000]
+
+    print("BENCHMARK DEL LEXER INCREMENTAL")
+    print("=" * 80)
+    print(f"{'Líneas':>10} {'Edición':<14} {'Tokens':>10} {'lexer() (s)':>12} {'relex() (s)':>12} {'Aceleración':>12}")
+    print("-" * 80)
+
+    for num_lines in sizes:
+        source = generate_source(num_lines)
+        tokens = lexer(source)
+
+        for name, offset, deleted, inserted in edits(source):
+            new_source = source[:offset] + inserted + source[offset + deleted:]
+
+            inicio = time.perf_counter()
+            relexed = relex(tokens, offset, deleted, inserted)
+            relex_elapsed = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            expected = lexer(new_source)
+            full_elapsed = time.perf_counter() - inicio
+
+            if (relexed.kinds, relexed.starts, relexed.ends, relexed.lines) != \
+               (expected.kinds, expected.starts, expected.ends, expected.lines):
+                raise AssertionError("relex() no produjo el mismo flujo que lexer()")
+            print(f"{num_lines:>10} {name:<14} {len(expected):>10} {full_elapsed:>12.4f} {relex_elapsed:>12.4f} "
+                  f"{full_elapsed / relex_elapsed:>11.0f}x")
+        del source, tokens
+
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark del parser incremental: después de editar una línea (y de relex()), tiempo de
+IncrementalParser.parse() frente a volver a analizar todo con parser().
+
+Uso:
+    python benchmarks/bench_reparse.py                # 100k líneas
+    python benchmarks/bench_reparse.py 10000 1000000  # tamaños personalizados
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_source
+from src.lexico.lexer import lexer
+from src.lexico.incremental import relex
+from src.sintactico.parser import parser
+from src.sintactico.incremental import IncrementalParser
+from src.semantico.semantic import format_ast
+
+
+def edits(source):
+    """Ediciones en la mitad del archivo: (descripción, desplazamiento, borrados, insertado)."""
+    middle = source.index('\n', len(source) // 2) + 1
+    literal = source.index(' + 2 * 4;', middle) + 3
+    block = source.index('; } else {', middle)
+    line_end = source.index('\n', middle)
+    return [
+        ("literal", literal, 1, "7"),
+        ("dentro de if", block, 0, " + 1"),
+        ("nueva línea", middle, 0, "int extra = 1 + 2;\n"),
+        ("borrar línea", middle, line_end - middle + 1, ""),
+    ]
+
+
+def main(argv):
+    sizes = [int(a) for a in argv if a.isdigit()] or [100_000]
+
+    print("BENCHMARK DEL PARSER INCREMENTAL")
+    print("=" * 86)
+    print(f"{'Líneas':>10} {'Edición':<14} {'Sentencias':>11} {'Cambiadas':>10} {'parser() (s)':>13} "
+          f"{'parse() (s)':>12} {'Aceleración':>12}")
+    print("-" * 86)
+
+    for num_lines in sizes:
+        source = generate_source(num_lines)
+        tokens = lexer(source)
+
+        for name, offset, deleted, inserted in edits(source):
+            incremental = IncrementalParser()
+            incremental.parse(tokens)
+            new_source = source[:offset] + inserted + source[offset + deleted:]
+            new_tokens = relex(tokens, offset, deleted, inserted)
+
+            inicio = time.perf_counter()
+            ast, changed = incremental.parse(new_tokens)
+            incremental_elapsed = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            expected = parser(new_tokens)
+            full_elapsed = time.perf_counter() - inicio
+
+            if format_ast(ast) != format_ast(expected) or format_ast(expected) != format_ast(parser(lexer(new_source))):
+                raise AssertionError("IncrementalParser no produjo el mismo AST que parser()")
+            print(f"{num_lines:>10} {name:<14} {len(ast):>11} {len(changed):>10} {full_elapsed:>13.4f} "
+                  f"{incremental_elapsed:>12.4f} {full_elapsed / incremental_elapsed:>11.0f}x")
+        del source, tokens
+
+    print("=" * 86)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
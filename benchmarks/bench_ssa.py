@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la forma SSA: construye la forma SSA de programas de alrededor de 100k
+cuádruplas (los tres de bench_cfg: el corpus, bucles while con un while y un if adentro, e if
+anidados) y vuelve a cuádruplas. Mide por separado la construcción (grafo, dominadores,
+frontera de dominancia, phi y renombrado) y la destrucción (vida de las versiones,
+superposiciones y copias), cuenta las versiones y las phi, y comprueba que la ida y vuelta
+devuelve las mismas cuádruplas.
+
+Uso:
+    python benchmarks/bench_ssa.py              # ~100k cuádruplas por programa
+    python benchmarks/bench_ssa.py 1000000      # ~1M cuádruplas por programa
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_cfg import corpus_quads, loop_quads, nested_if_quads
+from src.generador.ssa import to_ssa, from_ssa
+
+
+def main(argv):
+    num_quads = next((int(a) for a in argv if a.isdigit()), 100_000)
+
+    print("BENCHMARK DE LA FORMA SSA")
+    print("=" * 92)
+    print(f"{'Programa':<12} {'Cuádruplas':>11} {'Bloques':>9} {'Versiones':>10} {'Phi':>8} "
+          f"{'Construcción (s)':>17} {'Destrucción (s)':>16} {'Ida y vuelta':>13}")
+    print("-" * 92)
+
+    for name, build in (("corpus", corpus_quads), ("while", loop_quads), ("if anidados", nested_if_quads)):
+        quads = build(num_quads)
+
+        inicio = time.perf_counter()
+        ssa = to_ssa(quads)
+        construido = time.perf_counter()
+        lowered = from_ssa(ssa)
+        fin = time.perf_counter()
+
+        phis = sum(quad[1] == 'phi' for block in ssa.cfg for quad in block.quads)
+        print(f"{name:<12} {len(quads):>11,} {len(ssa.cfg):>9,} {len(ssa.versions):>10,} {phis:>8,} "
+              f"{construido - inicio:>17.3f} {fin - construido:>16.3f} "
+              f"{'igual' if lowered == quads else 'DISTINTA':>13}")
+        del quads, ssa, lowered
+
+    print("=" * 92)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la tabla de símbolos: un programa declara miles de variables globales y las usa
+dentro de muchos bloques anidados. La SymbolTable resuelve cada nombre con la pila de
+declaraciones visibles de ese nombre; la referencia busca como antes, remontando los ámbitos
+activos desde el más interno y mirando el diccionario de cada uno, así que su costo crece con
+la profundidad. La referencia también mantiene las pilas por nombre (solo cambia la
+búsqueda), y el semántico anterior buscaba dos veces cada variable usada, así que la mejora
+real es algo mayor que la medida.
+
+Uso:
+    python benchmarks/bench_symbol_table.py                     # 10k variables, 10/100/1000 niveles
+    python benchmarks/bench_symbol_table.py 100 2000 --vars=20000
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexico.lexer import lexer
+from src.sintactico.parser import parser
+from src.semantico import semantic as semantic_module
+from src.semantico.semantic import SymbolTable, semantic
+
+
+class ScopeWalkTable(SymbolTable):
+    """Búsqueda de referencia: recorre los ámbitos activos del más interno al global."""
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes):
+            variables = self.table[scope]
+            if name in variables:
+                return variables[name]
+        raise SyntaxError(f"Variable '{name}' no declarada en ningún ámbito accesible")
+
+    def variable_types(self, names):
+        types = []
+        for name in names:
+            try:
+                types.append(self.lookup(name)['type'])
+            except SyntaxError:
+                return None
+        return tuple(types)
+
+
+def generate_program(num_vars, depth):
+    """
+    `num_vars` variables globales y `depth` bloques if anidados, cada uno con su variable
+    local; en el bloque más interno cada global se actualiza con ella misma y con otra.
+    """
+    lines = [f"int v{i} = {i};" for i in range(num_vars)]
+    lines.extend(f"if (v{k % num_vars} >= 0) {{ int d{k} = {k};" for k in range(depth))
+    lines.extend(f"v{i} = v{i} + v{(i * 7) % num_vars} - d{i % depth};" for i in range(num_vars))
+    lines.append("}" * depth)
+    return "\n".join(lines) + "\n"
+
+
+def timed_semantic(ast, table_class):
+    """Segundos de semantic(ast) usando `table_class` como tabla de símbolos."""
+    semantic_module.SymbolTable = table_class
+    try:
+        inicio = time.perf_counter()
+        table = semantic(ast)
+        return time.perf_counter() - inicio, table
+    finally:
+        semantic_module.SymbolTable = SymbolTable
+
+
+def main(argv):
+    depths = [int(a) for a in argv if a.isdigit()] or [10, 100, 1_000]
+    num_vars = next((int(a.split('=')[1]) for a in argv if a.startswith('--vars=')), 10_000)
+
+    print("BENCHMARK DE LA TABLA DE SÍMBOLOS")
+    print("=" * 72)
+    print(f"{'Variables':>10} {'Profundidad':>12} {'Búsquedas':>10} {'Recorriendo (s)':>16} "
+          f"{'Por nombre (s)':>15} {'Mejora':>7}")
+    print("-" * 72)
+
+    for depth in depths:
+        ast = parser(lexer(generate_program(num_vars, depth)))
+        walk_seconds, walk_table = timed_semantic(ast, ScopeWalkTable)
+        seconds, table = timed_semantic(ast, SymbolTable)
+        if table != walk_table:
+            raise AssertionError("Las dos tablas de símbolos dieron resultados distintos")
+        # Cada asignación del bloque interno busca su destino y tres variables dos veces
+        # (usos y tipos), y cada condición una variable dos veces
+        lookups = num_vars * 7 + depth * 2
+        print(f"{num_vars:>10,} {depth:>12,} {lookups:>10,} {walk_seconds:>16.3f} {seconds:>15.3f} "
+              f"{walk_seconds / seconds:>6.1f}x")
+
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
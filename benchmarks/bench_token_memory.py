@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria del flujo de tokens: TokenStream (estructura de arreglos)
+frente a la lista de tuplas (tipo, valor, línea, columna) que devolvía el lexer.
+
+Uso:
+    python benchmarks/bench_token_memory.py            # ~1 millón de tokens
+    python benchmarks/bench_token_memory.py 3000000    # cantidad aproximada de tokens
+"""
+
+import sys
+import os
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_source
+from src.lexico.lexer import lexer
+
+# Tokens promedio por línea del corpus generado
+TOKENS_PER_LINE = 9
+
+
+def traced(build):
+    """Ejecuta build() y devuelve (resultado, bytes retenidos, pico de bytes)."""
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def main(argv):
+    target_tokens = int(argv[0]) if argv else 1_000_000
+    source = generate_source(max(1, target_tokens // TOKENS_PER_LINE))
+
+    print("BENCHMARK DE MEMORIA DEL FLUJO DE TOKENS")
+    print("=" * 80)
+    print(f"Código fuente: {len(source):,} caracteres")
+
+    stream, stream_bytes, stream_peak = traced(lambda: lexer(source))
+    count = len(stream)
+    tuples, tuples_bytes, tuples_peak = traced(lambda: list(stream.with_positions()))
+
+    print(f"Tokens: {count:,}")
+    print("-" * 80)
+    print(f"{'Representación':<28} {'Retenido (MB)':>14} {'Pico (MB)':>10} {'Bytes/token':>12}")
+    print(f"{'TokenStream (arreglos)':<28} {stream_bytes / 1e6:>14.1f} {stream_peak / 1e6:>10.1f} "
+          f"{stream_bytes / count:>12.1f}")
+    print(f"{'Lista de tuplas de 4':<28} {tuples_bytes / 1e6:>14.1f} {tuples_peak / 1e6:>10.1f} "
+          f"{tuples_bytes / count:>12.1f}")
+    print("-" * 80)
+    print(f"Reducción: x{tuples_bytes / stream_bytes:.1f} menos memoria por token")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
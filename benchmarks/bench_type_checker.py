@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark del chequeo de expresiones en un solo recorrido: el semántico revisaba cada
+inicialización, asignación, condición y retorno dos veces, un recorrido para los tipos y otro
+para los usos de las variables. check_expression hace las dos cosas en un recorrido y anota el
+tipo de cada nodo. Se cuentan las subexpresiones visitadas por compilación: con dos
+recorridos cada expresión se visitaba entera dos veces; con uno, lo que cuenta la
+SymbolTable del análisis.
+
+Uso:
+    python benchmarks/bench_type_checker.py              # 10k y 100k líneas
+    python benchmarks/bench_type_checker.py 500000
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_source
+from src.lexico.lexer import lexer
+from src.sintactico.parser import parser
+from src.sintactico.ast_nodes import Node, DECLARATION, ASSIGNMENT, IF, IF_ELSE, BINARY, NOT, CAST, FUNC_CALL
+from src.semantico import semantic as semantic_module
+from src.semantico.semantic import SymbolTable, semantic
+
+
+class CountingTable(SymbolTable):
+    """SymbolTable que queda guardada en la clase para leer sus visitas después del análisis."""
+
+    def __init__(self, diagnostics=None):
+        super().__init__(diagnostics)
+        CountingTable.last = self
+
+
+def expressions(ast):
+    """Expresiones que revisa el semántico: inicializaciones, asignaciones y condiciones."""
+    pending = list(reversed(ast))
+    while pending:
+        node = pending.pop()
+        if node.kind == DECLARATION:
+            if node.init is not None:
+                yield node.init
+        elif node.kind == ASSIGNMENT:
+            yield node.expr
+        elif node.kind == IF:
+            yield node.cond
+            pending.extend(reversed(node.then_block))
+        elif node.kind == IF_ELSE:
+            yield node.cond
+            pending.extend(reversed(node.else_block))
+            pending.extend(reversed(node.then_block))
+
+
+def expression_size(expr):
+    """Subexpresiones (nodos y hojas) de una expresión: lo que visita un recorrido completo."""
+    size = 0
+    pending = [expr]
+    while pending:
+        expr = pending.pop()
+        size += 1
+        if isinstance(expr, Node):
+            if expr.kind == BINARY:
+                pending.append(expr.left)
+                pending.append(expr.right)
+            elif expr.kind == NOT:
+                pending.append(expr.operand)
+            elif expr.kind == CAST:
+                pending.append(expr.expr)
+            elif expr.kind == FUNC_CALL:
+                pending.extend(expr.args)
+    return size
+
+
+def main(argv):
+    sizes = [int(a) for a in argv if a.isdigit()] or [10_000, 100_000]
+
+    print("BENCHMARK DEL CHEQUEO EN UN RECORRIDO")
+    print("=" * 66)
+    print(f"{'Líneas':>8} {'Expresiones':>12} {'Dos recorridos':>15} {'Un recorrido':>13} "
+          f"{'Visitas/expr.':>14}")
+    print("-" * 66)
+
+    semantic_module.SymbolTable = CountingTable
+    try:
+        for num_lines in sizes:
+            ast = parser(lexer(generate_source(num_lines)))
+            sizes_per_expr = list(map(expression_size, expressions(ast)))
+            two_walks = 2 * sum(sizes_per_expr)
+
+            semantic(ast)
+            visits = CountingTable.last.visits
+
+            print(f"{num_lines:>8} {len(sizes_per_expr):>12,} {two_walks:>15,} {visits:>13,} "
+                  f"{visits / len(sizes_per_expr):>14.2f}")
+    finally:
+        semantic_module.SymbolTable = SymbolTable
+
+    print("=" * 66)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
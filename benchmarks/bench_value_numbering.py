@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la numeración de valores: compila el corpus con y sin eliminar las operaciones
+repetidas (forma SSA, numeración de valores y vuelta a cuádruplas) y compara las
+cuádruplas, las instrucciones del código objeto y el tiempo de ejecución en la VM (el mejor
+de varias corridas). También se mide el corpus después de plegar y propagar constantes,
+que deja menos operaciones repetidas, y se comprueba que las variables terminan iguales.
+
+Uso:
+    python benchmarks/bench_value_numbering.py              # 10k y 50k líneas
+    python benchmarks/bench_value_numbering.py 100000
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_source
+from src.compiler import Compiler
+from src.generador.optimizer import TEMP_NAME
+
+RUNS = 3
+
+
+def instructions(compiler):
+    return sum(not linea.startswith("SLOTS ") for linea in compiler.asm.splitlines())
+
+
+def run(compiler):
+    """Mejor tiempo de ejecución en la VM y las variables (sin temporales) al terminar."""
+    best = None
+    for _ in range(RUNS):
+        inicio = time.perf_counter()
+        vm = compiler.run()
+        elapsed = time.perf_counter() - inicio
+        best = elapsed if best is None else min(best, elapsed)
+    variables = {name: value for name, value in vm.get_memory_state().items() if not TEMP_NAME.match(name)}
+    return best, variables
+
+
+def main(argv):
+    sizes = [int(a) for a in argv if a.isdigit()] or [10_000, 50_000]
+
+    print("BENCHMARK DE LA NUMERACIÓN DE VALORES")
+    print("=" * 104)
+    print(f"{'Líneas':>8} {'Optimizado':>10} {'Reutilizadas':>12} {'Cuádruplas':>19} {'Instrucciones':>19} "
+          f"{'VM (s)':>15} {'Mejora':>7} {'Pase (s)':>9}")
+    print("-" * 104)
+
+    for num_lines in sizes:
+        source = generate_source(num_lines)
+        for optimize in (False, True):
+            base = Compiler(optimize=optimize).compile(source)
+            numerado = Compiler(optimize=optimize, cse=True)
+            numerado.lex(source)
+            numerado.parse()
+            numerado.analyze()
+            numerado.generate()
+            if optimize:
+                numerado.optimize()
+            inicio = time.perf_counter()
+            numerado.to_ssa()
+            numerado.number_values()
+            numerado.from_ssa()
+            pase = time.perf_counter() - inicio
+            numerado.assemble()
+
+            base_time, base_vars = run(base)
+            cse_time, cse_vars = run(numerado)
+            if base_vars != cse_vars:
+                raise AssertionError(f"Las variables terminan distintas con {num_lines} líneas")
+
+            print(f"{num_lines:>8} {'sí' if optimize else 'no':>10} {numerado.value_numbering.reused:>12,} "
+                  f"{len(base.quads):>9,} -> {len(numerado.quads):>6,} "
+                  f"{instructions(base):>9,} -> {instructions(numerado):>6,} "
+                  f"{base_time:>6.3f} -> {cse_time:>5.3f} {1 - cse_time / base_time:>7.1%} {pase:>9.3f}")
+            del base, numerado
+        del source
+
+    print("=" * 104)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
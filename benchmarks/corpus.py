@@ -0,0 +1,42 @@
+"""
+Generador de programas sintéticos para los benchmarks.
+Produce código fuente válido (léxica, sintáctica y semánticamente) con la mezcla
+de construcciones que aparece en los programas generados por máquina: declaraciones,
+expresiones aritméticas, cadenas, caracteres, comentarios y bloques if/else.
+"""
+
+# Plantillas de línea; {i} se reemplaza por un índice único para no redeclarar nombres
+LINE_TEMPLATES = [
+    "int v{i} = {i} + 2 * 4;",
+    "float f{i} = (3.14 * 2.0) / 1.5;",
+    "string s{i} = \"texto numero {i}\";",
+    "// comentario de relleno {i}",
+    "char c{i} = 'x';",
+    "bool b{i} = !false;",
+    "if (v{j} > 5) {{ v{j} = v{j} - 1; }} else {{ v{j} = v{j} + 1; }}",
+    "int w{i} = v{j} * (v{j} + 3) - 7;",
+]
+
+
+def generate_lines(num_lines):
+    """Genera `num_lines` líneas de código; cada línea solo usa variables ya declaradas."""
+    templates = LINE_TEMPLATES
+    period = len(templates)
+    for n in range(num_lines):
+        block = n // period
+        # v{j} siempre es la variable 'v' declarada al inicio del bloque actual
+        yield templates[n % period].format(i=n, j=block * period)
+
+
+def generate_source(num_lines):
+    """Devuelve un programa de `num_lines` líneas como un solo string."""
+    return "\n".join(generate_lines(num_lines)) + "\n"
+
+
+def write_source(path, num_lines):
+    """Escribe un programa de `num_lines` líneas en `path` sin armarlo completo en memoria."""
+    with open(path, "w", encoding="utf-8") as f:
+        for line in generate_lines(num_lines):
+            f.write(line)
+            f.write("\n")
+    return path
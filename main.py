@@ -12,12 +12,8 @@ from tests import tests_compiler
 # Agregar el directorio actual al path para los imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.lexico.lexer import lexer
-from src.sintactico.parser import parser
-from src.semantico.semantic import semantic
-from src.generador.code_generator import CodeGenerator
-from src.CodigoObjeto.codigob import CodeGeneratorob
-from src.VM.virtualmachine import VirtualMachine
+from src.compiler import Compiler
+from src.diagnostics import Diagnostics
 
 def prompt_menu():
     """
@@ -45,24 +41,41 @@ def prompt_menu():
     return opts
 
 #En esta función compilar se da la integración de todas las fases
-def compilar(codigo, options):
+def compilar(codigo, options, hash_consing=False, diagnostics_mode='text', optimize=False):
     """
     Ejecuta todo el pipeline y muestra únicamente las fases seleccionadas.
     
     Args:
-        codigo (str): Código fuente a compilar
+        codigo (str | archivo): Código fuente a compilar, o un archivo abierto en modo
+            texto que se lee por bloques sin cargarlo completo en memoria
         options (set[int]): Conjunto de fases a imprimir
+        hash_consing (bool): Compartir las subexpresiones iguales en un solo nodo del AST,
+            con su tipo y su temporal calculados una vez
+        diagnostics_mode (str): Cómo se muestran las advertencias del análisis semántico:
+            'text' o 'jsonl' (un objeto JSON por línea)
+        optimize (bool): Optimizar las cuádruplas (constantes y ramas) antes del código objeto
     """
+    diagnostics = Diagnostics()
+    compiler = Compiler(hash_consing, diagnostics, optimize) # ← contexto con el estado de esta compilación
+
     # 1) Léxico
-    tokens = lexer(codigo) # ← llamada al lexer
-    if 1 in options:
-        print("\n--- FASE 1: ANÁLISIS LÉXICO ---")
-        print(f"Tokens ({len(tokens)}):")
-        for t in tokens:
-            print(f"  {t}")
+    if hasattr(codigo, 'read'):
+        # Flujo perezoso: los tokens se producen a medida que el parser los consume
+        if 1 in options:
+            print("\n--- FASE 1: ANÁLISIS LÉXICO ---")
+            print("Tokens (leídos por bloques):")
+        on_token = (lambda t: print(f"  {t}")) if 1 in options else None
+        compiler.lex(codigo, on_token=on_token) # ← llamada al lexer por flujo
+    else:
+        tokens = compiler.lex(codigo) # ← llamada al lexer
+        if 1 in options:
+            print("\n--- FASE 1: ANÁLISIS LÉXICO ---")
+            print(f"Tokens ({len(tokens)}):")
+            for t in tokens.with_positions():  # ← líneas y columnas calculadas bajo demanda
+                print(f"  {t}")
 
     # 2) Sintáctico
-    ast = parser(tokens) # ← llamada al parser
+    ast = compiler.parse() # ← llamada al parser
     if 2 in options:
         print("\n--- FASE 2: ANÁLISIS SINTÁCTICO ---")
         print("AST:")
@@ -71,7 +84,7 @@ def compilar(codigo, options):
 
     # 3) Semántico
     try:
-        symbol_table = semantic(ast) # ← llamada al analizador semántico
+        symbol_table = compiler.analyze() # ← llamada al analizador semántico
         if 3 in options:
             print("\n--- FASE 3: ANÁLISIS SEMÁNTICO ---")
             print("Tabla de símbolos resultante:")
@@ -79,19 +92,20 @@ def compilar(codigo, options):
     except Exception as e:
         print(f"\n[ERROR SEMÁNTICO] {e}")
         raise
+    finally:
+        diagnostics.write(mode=diagnostics_mode)  # ← advertencias reunidas por el semántico
 
     # 4) Código intermedio
-    icg = CodeGenerator()
-    quads = icg.generate(ast) # ← generación de cuádruplas
+    quads = compiler.generate() # ← generación de cuádruplas
+    if optimize:
+        quads = compiler.optimize() # ← plegado y propagación de constantes, poda de ramas
     if 4 in options:
         print("\n--- FASE 4: CÓDIGO INTERMEDIO (CUÁDRUPLAS) ---")
         for i, q in enumerate(quads, 1):
             print(f"  {i:2d}: {q}")
 
     # 5) Objeto (ensamblador)
-    ocg = CodeGeneratorob()
-    ocg.generate_code(quads)  # ← conversión a código objeto (ensamblador)
-    asm = ocg.get_code()
+    asm = compiler.assemble()  # ← conversión a código objeto (ensamblador)
     if 5 in options:
         print("\n--- FASE 5: CÓDIGO OBJETO---")
         print(asm)
@@ -99,9 +113,7 @@ def compilar(codigo, options):
     # 6) Ejecutar en VM
     if 6 in options:
         print("\n--- FASE 6: EJECUCIÓN EN VM ---")
-        vm = VirtualMachine()
-        vm.load_program(asm)  # ← carga y ejecución en la máquina virtual
-        vm.run()
+        vm = compiler.run()  # ← carga y ejecución en la máquina virtual
         print(f">> Pila (cima): {vm.get_final_stack_top()}")
         print(f">> Memoria: {vm.get_memory_state()}")
 
@@ -115,6 +127,12 @@ def main():
         print("No seleccionaste ninguna fase. Saliendo.")
         return
 
+    # Si se pasó un archivo por línea de comandos, se compila leyéndolo por bloques
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding="utf-8") as fuente:
+            compilar(fuente, options)
+        return
+
     # 2) Correr los tests definidos en tests_simple.TEST_CASES
     for idx, caso in enumerate(tests_compiler.TEST_CASES, start=1):
         print(f"\n{'='*60}")
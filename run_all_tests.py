@@ -84,6 +84,18 @@ def main():
         {
             "script": "tests/test_error_cases.py", 
             "description": "Suite de Errores - Casos Específicos de Fallo"
+        },
+        {
+            "script": "tests/test_lexer.py",
+            "description": "Suite del Analizador Léxico - Tokens y Errores"
+        },
+        {
+            "script": "tests/test_parser.py",
+            "description": "Suite del Analizador Sintáctico - Expresiones y Sentencias"
+        },
+        {
+            "script": "tests/test_compiler.py",
+            "description": "Suite del Contexto de Compilación - Compilaciones Concurrentes"
         }
     ]
     
@@ -1,5 +1,9 @@
 import collections
 
+# Prefijo de las instrucciones tipadas según el tipo de los dos operandos
+TYPE_PREFIXES = {'int': 'I', 'float': 'F'}
+
+
 class CodeGeneratorob:
     def __init__(self):
         self.code = []
@@ -7,10 +11,58 @@ class CodeGeneratorob:
     def emit(self, instruction):
         self.code.append(instruction)
 
-    def generate_code(self, intermediate_quads):
+    def generate_code(self, intermediate_quads, slots=None, types=None):
+        """
+        Traduce las cuádruplas a ensamblador. Con `slots` (variable o temporal -> slot, los
+        del CodeGenerator) el programa empieza con "SLOTS" y los nombres de sus slots, y cada
+        variable o temporal se escribe como @slot, así que la VM no resuelve nombres.
+        Con `types` (variable o temporal -> tipo, también del CodeGenerator) las operaciones
+        entre dos int o dos float usan las instrucciones tipadas (IADD, FMUL, ILT, ...) y los
+        slots int y float llevan su tipo en "SLOTS" (nombre:int), para los bancos de la VM.
+        Los literales de las cuádruplas (números, booleanos, strings y chars) se escriben tal
+        cual como operandos inmediatos.
+        """
         parsed_lines = intermediate_quads 
+        types = types or {}
+
+        if slots:
+            self.emit("SLOTS " + " ".join(
+                name + (f":{types[name]}" if types.get(name) in TYPE_PREFIXES else "")
+                for name in sorted(slots, key=slots.get)
+            ))
+        else:
+            slots = {}
+
+        def operand(arg):
+            # Variable o temporal con slot: @slot; literales y nombres sin slot, tal cual
+            slot = slots.get(arg) if isinstance(arg, str) else None
+            return str(arg) if slot is None else f"@{slot}"
+
+        def operand_type(arg):
+            # Tipo de un operando: el de su variable o temporal, o el de un literal numérico
+            if type(arg) in (int, float):
+                return type(arg).__name__
+            if not isinstance(arg, str):
+                return None
+            if arg in types:
+                return types[arg]
+            text = arg
+            if text.lstrip('-').isdigit():
+                return 'int'
+            try:
+                float(text)
+                return 'float'
+            except ValueError:
+                return None
+
+        def typed(mnemonic, arg1, arg2):
+            # Instrucción tipada si los dos operandos son int o los dos float
+            if types:
+                arg_type = operand_type(arg1)
+                if arg_type in TYPE_PREFIXES and operand_type(arg2) == arg_type:
+                    return TYPE_PREFIXES[arg_type] + mnemonic
+            return mnemonic
 
-        temp_map = {} 
         usage_count = collections.defaultdict(int)
 
         # Mapeo de operadores de cuádrupla a mnemónicos de ensamblador
@@ -28,22 +80,14 @@ class CodeGeneratorob:
             '!': 'NOT' # Para operadores unarios como NOT
         }
 
-        # Primera pasada: Popular temp_map para propagación de constantes y contar usos
+        # Primera pasada: contar usos de los temporales
         for i, parts in enumerate(parsed_lines):
             dest, op, arg1, arg2 = parts[0], parts[1], parts[2], parts[3]
 
-            if op == "=" and str(dest).startswith("t") and arg1 is not None and not str(arg1).startswith("t"):
-                temp_map[str(dest)] = str(arg1) 
-            
             for arg in [arg1, arg2]:
                 if arg is not None and str(arg).startswith("t"):
                     usage_count[str(arg)] += 1
 
-        def resolve_operand(arg):
-            if arg is not None and str(arg).startswith("t") and str(arg) in temp_map:
-                return temp_map[str(arg)]
-            return str(arg) if arg is not None else None
-
         skip_indexes = set()
 
         # Segunda pasada: Generar código con optimizaciones
@@ -63,20 +107,27 @@ class CodeGeneratorob:
                 next_dest, next_op, next_arg1, _ = next_parts 
                 
                 if next_op == "=" and next_arg1 == dest and not str(next_dest).startswith("t"):
-                    
-                    resolved_arg1_for_opt = resolve_operand(arg1)
-                    resolved_arg2_for_opt = resolve_operand(arg2)
 
                     # Usar el mapeo de operadores para las operaciones
                     mnemonic_op = op_to_mnemonic.get(op, op.upper()) # Obtener el mnemónico, si existe
                     
                     if op == "=": 
-                        self.emit(f"LOAD {resolved_arg1_for_opt}")
-                        self.emit(f"STORE {next_dest}") 
+                        self.emit(f"LOAD {operand(arg1)}")
+                        self.emit(f"STORE {operand(next_dest)}") 
                     elif op in op_to_mnemonic: # Usar el conjunto de operadores mapeados
-                        self.emit(f"LOAD {resolved_arg1_for_opt}")
-                        self.emit(f"{mnemonic_op} {resolved_arg2_for_opt}")
-                        self.emit(f"STORE {next_dest}") 
+                        self.emit(f"LOAD {operand(arg1)}")
+                        self.emit(f"{typed(mnemonic_op, arg1, arg2)} {operand(arg2)}")
+                        self.emit(f"STORE {operand(next_dest)}") 
+                    elif op.startswith("cast_"):
+                        self.emit(f"LOAD {operand(arg1)}")
+                        self.emit(f"CAST {op.split('_')[1]}")
+                        self.emit(f"STORE {operand(next_dest)}")
+                    elif op == "call":
+                        self.emit(f"CALL {str(arg1)}, {str(arg2)}")
+                        self.emit(f"STORE {operand(next_dest)}")
+                    elif op == "arg":
+                        self.emit(f"ARG {str(arg1)}")
+                        self.emit(f"STORE {operand(next_dest)}")
                     # Considerar otros casos de un solo uso que no sean operadores binarios si es necesario
                     
                     skip_indexes.add(i + 1) 
@@ -87,35 +138,42 @@ class CodeGeneratorob:
             mnemonic = op_to_mnemonic.get(op, op.upper()) # Si no está en el mapeo, usar la versión en mayúsculas
 
             if op == "=":
-                resolved_arg1 = resolve_operand(arg1) 
-                self.emit(f"LOAD {resolved_arg1}")
-                self.emit(f"STORE {dest}")
+                self.emit(f"LOAD {operand(arg1)}")
+                self.emit(f"STORE {operand(dest)}")
             elif op in ["+", "-", "*", "/", "==", "!=", "<", ">", "<=", ">="]: 
-                self.emit(f"LOAD {str(arg1)}") 
-                self.emit(f"{mnemonic} {str(arg2)}") # Usamos el mnemónico aquí
-                self.emit(f"STORE {str(dest)}")
+                self.emit(f"LOAD {operand(arg1)}") 
+                self.emit(f"{typed(mnemonic, arg1, arg2)} {operand(arg2)}") # Usamos el mnemónico aquí
+                self.emit(f"STORE {operand(dest)}")
             elif op == "!": 
-                self.emit(f"LOAD {str(arg1)}")
+                self.emit(f"LOAD {operand(arg1)}")
                 self.emit(f"{mnemonic}") # Usamos el mnemónico 'NOT' aquí
-                self.emit(f"STORE {str(dest)}")
+                self.emit(f"STORE {operand(dest)}")
             elif op.startswith("cast_"): 
                 cast_type = op.split('_')[1]
-                self.emit(f"LOAD {str(arg1)}")
+                self.emit(f"LOAD {operand(arg1)}")
                 self.emit(f"CAST {cast_type}")
-                self.emit(f"STORE {str(dest)}")
+                self.emit(f"STORE {operand(dest)}")
             elif op == "param":
-                self.emit(f"PARAM {str(arg1)}")
+                self.emit(f"PARAM {operand(arg1)}")
             elif op == "call":
                 self.emit(f"CALL {str(arg1)}, {str(arg2)}")
                 if dest is not None:
-                    self.emit(f"STORE {str(dest)}")
+                    self.emit(f"STORE {operand(dest)}")
+            elif op == "arg":
+                self.emit(f"ARG {str(arg1)}")
+                self.emit(f"STORE {operand(dest)}")
+            elif op == "halt":
+                self.emit("HALT")
+            elif op == "frame":
+                # Slots propios de la función de la etiqueta anterior, que la VM guarda en cada llamada
+                self.emit(" ".join(["FRAME"] + [operand(name) for name in arg1]))
             elif op == "return":
                 if arg1 is not None:
-                    self.emit(f"RETURN {str(arg1)}")
+                    self.emit(f"RETURN {operand(arg1)}")
                 else:
                     self.emit(f"RETURN")
             elif op == "if_false":
-                self.emit(f"IF_FALSE {str(arg1)} GOTO {str(arg2)}")
+                self.emit(f"IF_FALSE {operand(arg1)} GOTO {str(arg2)}")
             elif op == "goto":
                 self.emit(f"GOTO {str(arg1)}")
             elif op == "label":
@@ -1,17 +1,69 @@
 # src/vm/virtual_machine.py
 
+from array import array
+
+ARITHMETIC_OPS = ("ADD", "SUB", "MUL", "DIV", "EQ", "NEQ", "LT", "GT", "LE", "GE")
+
+# Instrucciones tipadas: la misma operación para dos int (I...) o dos float (F...)
+INT_OPS = tuple("I" + op for op in ARITHMETIC_OPS)
+FLOAT_OPS = tuple("F" + op for op in ARITHMETIC_OPS)
+TYPED_OPS = INT_OPS + FLOAT_OPS
+
+# Tipo de cada banco de memoria tipado (array.typecode)
+BANK_TYPECODES = {'int': 'q', 'float': 'd'}
+
+# Comillas de los literales string ("...") y char ('.')
+QUOTES = ('"', "'")
+
+
 class VirtualMachine:
-    def __init__(self):
+    """
+    Máquina de pila. Cada variable y temporal ocupa un slot, reservado al cargar el programa:
+    los slots int van en un array('q'), los float en un array('d') y el resto en la lista
+    `memory`, así que leer o escribir una variable es indexar su banco. Un int que no cabe en
+    64 bits pasa su slot a `memory` (ver spill), así que los enteros siguen sin límite. El compilador ya
+    resuelve los nombres: el programa empieza con "SLOTS nombre0 nombre1:int nombre2:float ..."
+    y los operandos @n son el slot n. Un operando con nombre (código escrito a mano) recibe su
+    slot, en `memory`, al cargar el programa. get_memory_state() arma la vista nombre -> valor.
+    Las instrucciones tipadas (IADD, FMUL, ILT, ...) operan sin revisar tipos: solo las emite el
+    compilador, para operandos que el semántico ya tipó. Cualquier operando puede ser un literal
+    inmediato (número, true/false, "string" o 'c'), que se convierte al cargar el programa.
+    Una función declara con "FRAME @n ..." (después de su etiqueta) sus slots propios:
+    parámetros, variables locales y temporales. CALL guarda solo esos slots y RETURN los
+    restaura, así que una llamada recursiva no pisa los de quien la llama y lo que la función
+    asigna a las variables globales queda al retornar.
+    """
+
+    def __init__(self, diagnostics=None):
+        # Diagnostics que recibe como trazas las llamadas y retornos simulados (None: no se reportan)
+        self.diagnostics = diagnostics
         self.stack = []
-        self.memory = {}
+        self.memory = []  # Slots sin banco tipado
+        self.ints = array('q')  # Slots int
+        self.floats = array('d')  # Slots float
+        self.assigned = bytearray()  # 1 si el slot ya se asignó
+        self.slot_names = []  # Nombre de la variable o temporal de cada slot
+        self.slot_locations = []  # (banco, índice en el banco) de cada slot
+        self.slots = {}  # Nombre -> slot
         self.program_counter = 0
         self.program = []
         self.labels = {}
+        self.frame_slots = {}  # Función -> (banco, índice, slot) de cada slot de su FRAME
+        self.frames = []  # Llamadas activas: (pc de retorno, slots de la función, valores guardados, argumentos)
 
     def load_program(self, assembly_code_string):
         lines = assembly_code_string.strip().split('\n')
         self.program = []
         self.labels = {}
+        self.memory = []
+        self.ints = array('q')
+        self.floats = array('d')
+        self.assigned = bytearray()
+        self.slot_names = []
+        self.slot_locations = []
+        self.slots = {}
+        self.frame_slots = {}
+        last_label = None
 
         for line_num, line in enumerate(lines):
             stripped_line = line.strip()
@@ -19,6 +71,18 @@ class VirtualMachine:
                 continue
 
             parts = stripped_line.split(' ', 3)
+
+            if parts[0].upper() == "SLOTS":
+                # Slots que asignó el compilador, con su tipo si es int o float (primera línea)
+                for declared in stripped_line.split()[1:]:
+                    name, _, slot_type = declared.partition(':')
+                    self.new_slot(name, slot_type)
+                continue
+
+            if parts[0].upper() == "FRAME":
+                # Slots propios de la función de la etiqueta anterior
+                self.frame_slots[last_label] = [self.location(name) for name in stripped_line.split()[1:]]
+                continue
             
             opcode_raw = parts[0]
             operand1_raw = parts[1] if len(parts) > 1 else None
@@ -28,11 +92,13 @@ class VirtualMachine:
             if opcode_raw.upper() == "LABEL" and operand1_raw and operand1_raw.endswith(':'):
                 label_name = operand1_raw[:-1]
                 self.labels[label_name] = len(self.program)
+                last_label = label_name
                 continue
 
             if opcode_raw.endswith(':'):
                 label_name = opcode_raw[:-1]
                 self.labels[label_name] = len(self.program)
+                last_label = label_name
                 if len(parts) == 1:
                     continue 
                 opcode_raw = parts[1] 
@@ -40,45 +106,74 @@ class VirtualMachine:
                 operand2_raw = parts[3] if len(parts) > 3 else None
                 operand3_raw = None
 
+            if operand1_raw and operand1_raw.startswith(QUOTES):
+                # Un string o char literal puede tener espacios: es el resto de la línea
+                operand1_raw = stripped_line[stripped_line.index(operand1_raw):]
+
             # --- Adaptación al formato de instrucciones ---
             if opcode_raw.upper() == "LOAD":
-                if operand1_raw.upper() == "TRUE":
-                    self.program.append(("PUSH", 1))
-                elif operand1_raw.upper() == "FALSE":
-                    self.program.append(("PUSH", 0))
+                is_literal, value = self.literal(operand1_raw)
+                if is_literal:
+                    self.program.append(("PUSH", value))
                 else:
-                    try:
-                        # Prioritize float conversion if there's a decimal point
-                        if '.' in operand1_raw:
-                            val = float(operand1_raw)
-                        else:
-                            val = int(operand1_raw)
-                        self.program.append(("PUSH", val))
-                    except ValueError:
-                        self.program.append(("LOAD_VAR", operand1_raw)) 
+                    self.program.append(("LOAD_VAR", *self.location(operand1_raw))) 
             
             elif operand1_raw and operand1_raw.upper() == "STORE":
                 try:
                     literal_to_store = int(opcode_raw)
                     target_var = operand2_raw
-                    self.program.append(("PUSH_LITERAL_THEN_STORE", literal_to_store, target_var))
+                    self.program.append(("PUSH_LITERAL_THEN_STORE", literal_to_store, *self.location(target_var)))
                 except ValueError:
                     pass
             
             elif opcode_raw.upper() == "STORE":
-                self.program.append(("STORE", operand1_raw))
+                self.program.append(("STORE", *self.location(operand1_raw)))
+
+            elif opcode_raw.upper() in ARITHMETIC_OPS or opcode_raw.upper() in TYPED_OPS:
+                # (operación, banco, índice, slot) del segundo operando si es una variable,
+                # (operación, None, valor, None) si es un literal; sin operando (solo las no
+                # tipadas) el segundo operando se toma de la pila
+                if operand1_raw is not None:
+                    self.program.append((opcode_raw.upper(), *self.operand(operand1_raw)))
+                elif opcode_raw.upper() in ARITHMETIC_OPS:
+                    self.program.append((opcode_raw.upper(), None, None, None))
+                else:
+                    raise Exception(f"Falta el operando de {opcode_raw} en línea {line_num+1}")
 
-            elif opcode_raw.upper() in ["ADD", "SUB", "MUL", "DIV", "EQ", "NEQ", "LT", "GT", "LE", "GE", "NOT"]:
-                self.program.append((opcode_raw.upper(), operand1_raw))
+            elif opcode_raw.upper() == "NOT":
+                self.program.append(("NOT", None))
 
             elif opcode_raw.upper() == "IF_FALSE":
-                self.program.append(("LOAD_VAR", operand1_raw)) 
+                is_literal, value = self.literal(operand1_raw)
+                if is_literal:
+                    self.program.append(("PUSH", value))
+                else:
+                    self.program.append(("LOAD_VAR", *self.location(operand1_raw))) 
                 self.program.append(("JUMPF", operand3_raw)) 
 
             elif opcode_raw.upper() == "GOTO":
                 self.program.append(("JUMP", operand1_raw))
 
-            elif opcode_raw.upper() in ["PRINT", "READ", "CAST", "CALL", "RETURN"]:
+            elif opcode_raw.upper() == "CALL":
+                # "CALL nombre, n": el nombre llega con la coma
+                self.program.append(("CALL", operand1_raw.rstrip(','), int(operand2_raw)))
+
+            elif opcode_raw.upper() == "ARG":
+                self.program.append(("ARG", int(operand1_raw)))
+
+            elif opcode_raw.upper() == "HALT":
+                self.program.append(("HALT",))
+
+            elif opcode_raw.upper() == "READ":
+                self.program.append(("READ", *self.location(operand1_raw)))
+
+            elif opcode_raw.upper() in ["PARAM", "RETURN"]:
+                if operand1_raw is None:
+                    self.program.append((opcode_raw.upper(), None, None, None))
+                else:
+                    self.program.append((opcode_raw.upper(), *self.operand(operand1_raw)))
+
+            elif opcode_raw.upper() in ["PRINT", "CAST"]:
                 self.program.append((opcode_raw.upper(), operand1_raw))
             
             else:
@@ -86,9 +181,114 @@ class VirtualMachine:
         
         # print(f"DEBUG MV: Programa cargado (adaptado): {self.program}")
 
+    def new_slot(self, name, slot_type=None):
+        """Reserva el siguiente slot para `name`, en el banco de su tipo (int, float u otro)."""
+        slot = self.slots[name] = len(self.slot_names)
+        self.slot_names.append(name)
+        if slot_type == 'int':
+            bank, default = self.ints, 0
+        elif slot_type == 'float':
+            bank, default = self.floats, 0.0
+        else:
+            bank, default = self.memory, None
+        self.slot_locations.append((bank, len(bank)))
+        bank.append(default)
+        self.assigned.append(0)
+        return slot
+
+    def location(self, operand):
+        """
+        (banco, índice, slot) de un operando variable: @n si el compilador ya lo resolvió, o
+        un nombre que recibe un slot nuevo la primera vez que aparece.
+        """
+        if operand.startswith('@'):
+            slot = int(operand[1:])
+        else:
+            slot = self.slots.get(operand)
+            if slot is None:
+                slot = self.new_slot(operand)
+        bank, index = self.slot_locations[slot]
+        return bank, index, slot
+
+    @staticmethod
+    def literal(operand):
+        """
+        (True, valor) de un literal inmediato, o (False, None) si el operando es una variable:
+        true/false son 1/0, los números int o float y los strings y chars van sin comillas.
+        """
+        upper = operand.upper()
+        if upper == "TRUE":
+            return True, 1
+        if upper == "FALSE":
+            return True, 0
+        if operand.startswith(QUOTES):
+            return True, operand[1:-1]
+        if operand[0].isdigit() or operand[0] in '-.':
+            try:
+                return True, int(operand)
+            except ValueError:
+                try:
+                    return True, float(operand)
+                except ValueError:
+                    pass
+        return False, None
+
+    def operand(self, operand):
+        """(None, valor, None) de un literal inmediato o (banco, índice, slot) de una variable."""
+        is_literal, value = self.literal(operand)
+        if is_literal:
+            return None, value, None
+        return self.location(operand)
+
+    def read(self, bank, index, slot):
+        """Valor de un slot; falla si todavía no se asignó."""
+        if not self.assigned[slot]:
+            raise Exception(f"Error de ejecución: Variable no inicializada o inexistente: '{self.slot_names[slot]}'")
+        return bank[index]
+
+    def write(self, bank, index, slot, value):
+        """
+        Guarda `value` en un slot; un int de más de 64 bits pasa su slot int a `memory`, y falla
+        si no cabe en su banco (un float en uno int, o un string en uno int o float).
+        """
+        try:
+            bank[index] = value
+        except OverflowError:
+            if bank is not self.ints or type(value) is not int:
+                raise Exception(f"Error de ejecución: Valor {value!r} inválido para '{self.slot_names[slot]}'") from None
+            bank, index = self.spill(slot)
+            bank[index] = value
+        except TypeError:
+            raise Exception(f"Error de ejecución: Valor {value!r} inválido para '{self.slot_names[slot]}'") from None
+        self.assigned[slot] = 1
+
+    def spill(self, slot):
+        """
+        Pasa un slot del banco int a `memory`, donde un int no tiene límite, y devuelve su nuevo
+        (banco, índice). Las instrucciones y los FRAME que lo usan se reescriben (también los
+        de las llamadas activas, que comparten las listas de frame_slots).
+        """
+        old_bank, old_index = self.slot_locations[slot]
+        location = self.slot_locations[slot] = (self.memory, len(self.memory))
+        self.memory.append(old_bank[old_index])
+        program = self.program
+        for i, instruction in enumerate(program):
+            if instruction[0] == "PUSH_LITERAL_THEN_STORE":
+                if instruction[4] == slot:
+                    program[i] = (instruction[0], instruction[1], *location, slot)
+            elif len(instruction) == 4 and instruction[3] == slot and instruction[1] is old_bank:
+                program[i] = (instruction[0], *location, slot)
+        for frame in self.frame_slots.values():
+            for i, (bank, index, frame_slot) in enumerate(frame):
+                if frame_slot == slot:
+                    frame[i] = (*location, slot)
+        return location
 
     def run(self):
         self.program_counter = 0
+        self.frames = []
+        stack = self.stack
+        assigned = self.assigned
 
         while self.program_counter < len(self.program):
             instruction = self.program[self.program_counter]
@@ -98,51 +298,71 @@ class VirtualMachine:
             # print(f"DEBUG MV: PC={self.program_counter}, Instr='{instruction}', Stack={self.stack}, Mem={self.memory}")
 
             if opcode == "PUSH":
-                self.stack.append(operand1) 
+                stack.append(operand1) 
 
             elif opcode == "LOAD_VAR": 
-                var_name = operand1
-                if var_name in self.memory:
-                    self.stack.append(self.memory[var_name])
+                if not assigned[instruction[3]]:
+                    raise Exception(f"Error de ejecución: Variable no inicializada o inexistente: '{self.slot_names[instruction[3]]}'")
+                stack.append(operand1[instruction[2]])
+
+            elif opcode == "STORE": 
+                if not stack:
+                    raise Exception("Error de ejecución: Pila vacía, no hay valor para STORE")
+                self.write(operand1, instruction[2], instruction[3], stack[-1])
+
+            elif opcode in TYPED_OPS:
+                # Operandos ya tipados por el compilador: sin conversiones ni revisiones de tipo
+                if operand1 is None:
+                    b_val = instruction[2]
+                elif assigned[instruction[3]]:
+                    b_val = operand1[instruction[2]]
                 else:
-                    raise Exception(f"Error de ejecución: Variable no inicializada o inexistente: '{var_name}'")
+                    raise Exception(f"Error de ejecución: Operando desconocido o variable no declarada para {opcode}: '{self.slot_names[instruction[3]]}'")
+                a = stack.pop()
+
+                if opcode == "IADD" or opcode == "FADD": result = a + b_val
+                elif opcode == "ISUB" or opcode == "FSUB": result = a - b_val
+                elif opcode == "IMUL" or opcode == "FMUL": result = a * b_val
+                elif opcode == "IDIV":
+                    # División entera truncada hacia cero
+                    if b_val == 0: raise Exception("Error de ejecución: División por cero")
+                    result = abs(a) // abs(b_val)
+                    if (a < 0) != (b_val < 0): result = -result
+                elif opcode == "FDIV":
+                    if b_val == 0: raise Exception("Error de ejecución: División por cero")
+                    result = a / b_val
+                elif opcode == "ILT" or opcode == "FLT": result = (1 if a < b_val else 0)
+                elif opcode == "IGT" or opcode == "FGT": result = (1 if a > b_val else 0)
+                elif opcode == "ILE" or opcode == "FLE": result = (1 if a <= b_val else 0)
+                elif opcode == "IGE" or opcode == "FGE": result = (1 if a >= b_val else 0)
+                elif opcode == "IEQ" or opcode == "FEQ": result = (1 if a == b_val else 0)
+                else: result = (1 if a != b_val else 0)
+
+                stack.append(result)
             
             elif opcode == "PUSH_LITERAL_THEN_STORE": 
                 literal_val = operand1 
-                var_location = instruction[2] 
-                self.stack.append(literal_val) 
-                self.memory[var_location] = literal_val 
-
-            elif opcode == "STORE": 
-                var_location = operand1
-                if not self.stack:
-                    raise Exception("Error de ejecución: Pila vacía, no hay valor para STORE")
-                value = self.stack[-1] 
-                self.memory[var_location] = value 
+                stack.append(literal_val) 
+                self.write(instruction[2], instruction[3], instruction[4], literal_val)
 
-            elif opcode in ["ADD", "SUB", "MUL", "DIV", "EQ", "NEQ", "LT", "GT", "LE", "GE"]:
-                if not self.stack:
+            elif opcode in ARITHMETIC_OPS:
+                if not stack:
                     raise Exception(f"Error de ejecución: Pila vacía, falta el primer operando para {opcode}")
 
-                a = self.stack.pop() 
+                a = stack.pop() 
 
                 b_val = None
-                if operand1 is not None: 
-                    try:
-                        # *** CAMBIO CLAVE AQUÍ: Intentar float antes que int ***
-                        if '.' in str(operand1): # Check for decimal point for float conversion
-                             b_val = float(operand1)
-                        else:
-                             b_val = int(operand1) # Otherwise try int
-                    except ValueError:
-                        if operand1 in self.memory:
-                            b_val = self.memory[operand1]
-                        else:
-                            raise Exception(f"Error de ejecución: Operando desconocido o variable no declarada para {opcode}: '{operand1}'")
+                if operand1 is not None:
+                    # Segundo operando en un slot (el literal ya se convirtió al cargar)
+                    if not assigned[instruction[3]]:
+                        raise Exception(f"Error de ejecución: Operando desconocido o variable no declarada para {opcode}: '{self.slot_names[instruction[3]]}'")
+                    b_val = operand1[instruction[2]]
+                elif instruction[2] is not None:
+                    b_val = instruction[2]
                 else:
-                    if not self.stack:
+                    if not stack:
                         raise Exception(f"Error de ejecución: Pila insuficiente, falta el segundo operando para {opcode}")
-                    b_val = self.stack.pop()
+                    b_val = stack.pop()
                 
                 result = None
                 if opcode == "ADD": result = a + b_val
@@ -150,7 +370,12 @@ class VirtualMachine:
                 elif opcode == "MUL": result = a * b_val
                 elif opcode == "DIV":
                     if b_val == 0: raise Exception("Error de ejecución: División por cero")
-                    result = a / b_val
+                    if type(a) is int and type(b_val) is int:
+                        # Dos int: división entera truncada hacia cero, como IDIV
+                        result = abs(a) // abs(b_val)
+                        if (a < 0) != (b_val < 0): result = -result
+                    else:
+                        result = a / b_val
                 elif opcode == "EQ": result = (1 if a == b_val else 0)
                 elif opcode == "NEQ": result = (1 if a != b_val else 0)
                 elif opcode == "LT": result = (1 if a < b_val else 0)
@@ -158,12 +383,12 @@ class VirtualMachine:
                 elif opcode == "LE": result = (1 if a <= b_val else 0)
                 elif opcode == "GE": result = (1 if a >= b_val else 0)
 
-                self.stack.append(result) 
+                stack.append(result) 
 
             elif opcode == "NOT":
-                if not self.stack: raise Exception("Error de ejecución: Pila vacía para NOT")
-                val = self.stack.pop()
-                self.stack.append(1 if not val else 0)
+                if not stack: raise Exception("Error de ejecución: Pila vacía para NOT")
+                val = stack.pop()
+                stack.append(1 if not val else 0)
 
             elif opcode == "JUMP":
                 label = operand1
@@ -174,9 +399,9 @@ class VirtualMachine:
 
             elif opcode == "JUMPF":
                 label = operand1
-                if not self.stack:
+                if not stack:
                     raise Exception("Error de ejecución: Pila vacía para JUMPF (se esperaba condición)")
-                condition = self.stack.pop()
+                condition = stack.pop()
                 if not condition: 
                     if label not in self.labels:
                         raise Exception(f"Error de ejecución: Etiqueta de salto JUMPF no encontrada: '{label}'")
@@ -184,40 +409,75 @@ class VirtualMachine:
                     continue 
 
             elif opcode == "PRINT":
-                if not self.stack: raise Exception("Error de ejecución: Pila vacía para PRINT")
-                val_to_print = self.stack.pop()
+                if not stack: raise Exception("Error de ejecución: Pila vacía para PRINT")
+                val_to_print = stack.pop()
                 print(f"OUTPUT: {val_to_print}")
 
             elif opcode == "READ":
-                var_location = operand1
-                user_input = input(f"INPUT ({var_location}): ")
+                slot = instruction[3]
+                user_input = input(f"INPUT ({self.slot_names[slot]}): ")
                 try:
-                    if '.' in user_input: self.memory[var_location] = float(user_input)
-                    else: self.memory[var_location] = int(user_input)
+                    if '.' in user_input: value = float(user_input)
+                    else: value = int(user_input)
                 except ValueError:
-                    self.memory[var_location] = user_input
+                    value = user_input
+                self.write(operand1, instruction[2], slot, value)
 
             elif opcode == "CAST":
-                if not self.stack: raise Exception("Error de ejecución: Pila vacía para CAST")
-                value = self.stack.pop()
+                if not stack: raise Exception("Error de ejecución: Pila vacía para CAST")
+                value = stack.pop()
                 target_type = operand1.lower()
-                if target_type == "int": self.stack.append(int(value))
-                elif target_type == "float": self.stack.append(float(value))
-                elif target_type == "bool": self.stack.append(bool(value))
+                if target_type == "int": stack.append(int(value))
+                elif target_type == "float": stack.append(float(value))
+                elif target_type == "bool": stack.append(bool(value))
                 else: raise Exception(f"Error de ejecución: Tipo de cast no soportado: '{target_type}'")
 
+            elif opcode == "PARAM":
+                stack.append(instruction[2] if operand1 is None else self.read(operand1, instruction[2], instruction[3]))
+
             elif opcode == "CALL":
-                func_name, num_params_str = operand1.split(',')
-                num_params = int(num_params_str.strip())
-                if len(self.stack) < num_params:
+                func_name = operand1
+                num_params = instruction[2]
+                if len(stack) < num_params:
                     raise Exception(f"Error de ejecución: No hay suficientes parámetros en la pila para CALL {func_name}")
-                print(f"DEBUG MV: Llamando a función '{func_name.strip()}' con {num_params} parámetros (simulado)")
+                if func_name not in self.labels:
+                    if self.diagnostics is not None and self.diagnostics.tracing:
+                        self.diagnostics.trace('vm-simulated-call',
+                                               f"Llamando a función '{func_name}' con {num_params} parámetros (simulado)",
+                                               'vm', f"pc={self.program_counter}")
+                else:
+                    # La función trabaja sobre la memoria de quien la llama; solo sus slots
+                    # propios se guardan para restaurarlos al retornar
+                    args = stack[len(stack) - num_params:]
+                    del stack[len(stack) - num_params:]
+                    frame = self.frame_slots.get(func_name, ())
+                    saved = [(bank[index], assigned[slot]) for bank, index, slot in frame]
+                    self.frames.append((self.program_counter + 1, frame, saved, args))
+                    self.program_counter = self.labels[func_name]
+                    continue
+
+            elif opcode == "ARG":
+                stack.append(self.frames[-1][3][operand1])
 
             elif opcode == "RETURN":
-                if self.stack: print(f"DEBUG MV: Retornando de función con valor: {self.stack[-1]} (simulado)")
-                else: print("DEBUG MV: Retornando de función sin valor (simulado)")
+                if self.frames:
+                    if instruction[3] is None: value = instruction[2]
+                    else: value = self.read(operand1, instruction[2], instruction[3])
+                    self.program_counter, frame, saved, _ = self.frames.pop()
+                    for (bank, index, slot), (old, was_assigned) in zip(frame, saved):
+                        bank[index] = old
+                        assigned[slot] = was_assigned
+                    stack.append(value)
+                    continue
+                if self.diagnostics is not None and self.diagnostics.tracing:
+                    if stack: message = f"Retornando de función con valor: {stack[-1]} (simulado)"
+                    else: message = "Retornando de función sin valor (simulado)"
+                    self.diagnostics.trace('vm-simulated-return', message, 'vm', f"pc={self.program_counter}")
                 break 
 
+            elif opcode == "HALT":
+                break
+
             else:
                 raise Exception(f"Instrucción desconocida o formato inesperado: '{opcode}'")
             
@@ -227,5 +487,6 @@ class VirtualMachine:
         return self.stack[-1] if self.stack else None
 
     def get_memory_state(self):
-        return self.memory
-    
+        """Vista nombre -> valor de los slots asignados."""
+        return {name: bank[index] for name, (bank, index), is_assigned
+                in zip(self.slot_names, self.slot_locations, self.assigned) if is_assigned}
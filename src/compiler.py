@@ -0,0 +1,140 @@
+"""
+Contexto de compilación: un Compiler guarda todo el estado de una compilación (opciones,
+pool de expresiones, tokens, AST, tabla de símbolos, cuádruplas y código objeto) y corre
+las fases en orden. Ninguna fase guarda estado en variables del módulo: el parser lleva el
+suyo en el TokenCursor, el semántico en su SymbolTable y los generadores en sus instancias,
+así que varios Compiler pueden trabajar a la vez en hilos distintos sin mezclar resultados.
+"""
+
+from .lexico.lexer import lexer, iter_tokens
+from .sintactico.parser import parser
+from .sintactico.ast_nodes import ExpressionPool
+from .semantico.semantic import semantic, variable_slots, slot_types
+from .generador.code_generator import CodeGenerator
+from .generador.optimizer import Optimizer
+from .generador.ssa import to_ssa, from_ssa, variable_of
+from .generador.value_numbering import ValueNumbering
+from .CodigoObjeto.codigob import CodeGeneratorob
+from .VM.virtualmachine import VirtualMachine
+
+
+class Compiler:
+    """
+    Una compilación. Cada fase guarda su resultado en el contexto y la siguiente lo toma de
+    ahí; compile() las corre todas hasta el código objeto.
+
+    Args:
+        hash_consing (bool): Compartir las subexpresiones iguales en un solo nodo del AST,
+            con su tipo y su temporal calculados una vez
+        diagnostics (Diagnostics | None): Dónde reportan las fases sus advertencias y
+            trazas (None: no se reporta nada)
+        optimize (bool): Plegar y propagar constantes y podar ramas en las cuádruplas
+            antes del código objeto
+        ssa (bool): Pasar las cuádruplas a forma SSA y volver a cuádruplas comunes antes
+            del código objeto (después de optimizar)
+        cse (bool): Quitar las operaciones repetidas con numeración de valores sobre la
+            forma SSA (implica ssa)
+    """
+
+    def __init__(self, hash_consing=False, diagnostics=None, optimize=False, ssa=False, cse=False):
+        self.pool = ExpressionPool() if hash_consing else None
+        self.diagnostics = diagnostics
+        self.optimizer = Optimizer() if optimize else None
+        self.value_numbering = ValueNumbering() if cse else None
+        self.ssa_pass = ssa or cse
+        self.ssa = None  # SSAForm de las cuádruplas, entre to_ssa() y from_ssa()
+        self.tokens = None
+        self.ast = None
+        self.symbol_table = None
+        self.quads = None
+        self.slots = None  # Variable o temporal -> slot de la VM
+        self.types = None  # Variable o temporal -> tipo, para las instrucciones tipadas
+        self.asm = None
+
+    def lex(self, codigo, on_token=None):
+        """
+        Tokeniza `codigo`: una cadena, o un archivo abierto en modo texto que se lee por
+        bloques a medida que el parser consume los tokens (`on_token` recibe cada uno).
+        """
+        if hasattr(codigo, 'read'):
+            self.tokens = iter_tokens(codigo, on_token=on_token)
+        else:
+            self.tokens = lexer(codigo)
+        if self.diagnostics is not None:
+            # Las líneas y columnas de los diagnósticos salen de las posiciones de los tokens
+            self.diagnostics.line_index = self.tokens.line_index
+        return self.tokens
+
+    def parse(self):
+        self.ast = parser(self.tokens, pool=self.pool)
+        return self.ast
+
+    def analyze(self):
+        self.symbol_table = semantic(self.ast, self.pool, self.diagnostics)
+        return self.symbol_table
+
+    def generate(self):
+        # Los temporales reciben slots después de los que el semántico dio a las variables,
+        # y el tipo de la operación que los calcula
+        slots = types = None
+        if self.symbol_table is not None:
+            slots = variable_slots(self.symbol_table)
+            types = slot_types(self.symbol_table)
+        icg = CodeGenerator(self.pool, slots, types)
+        self.quads = icg.generate(self.ast)
+        self.slots = icg.slots
+        self.types = icg.types
+        return self.quads
+
+    def optimize(self):
+        self.quads = (self.optimizer or Optimizer()).optimize(self.quads)
+        return self.quads
+
+    def to_ssa(self):
+        self.ssa = to_ssa(self.quads)
+        return self.ssa
+
+    def number_values(self):
+        (self.value_numbering or ValueNumbering()).run(self.ssa)
+        return self.ssa
+
+    def from_ssa(self):
+        self.quads = from_ssa(self.ssa)
+        # Las versiones que no volvieron al nombre de su variable (y las copias para romper
+        # ciclos) reciben el siguiente slot libre y el tipo de su variable
+        if self.slots is not None:
+            for dest, op, _, _ in self.quads:
+                if isinstance(dest, str) and op != 'label' and dest not in self.slots:
+                    self.slots[dest] = len(self.slots)
+                    if self.types is not None:
+                        self.types[dest] = self.types.get(variable_of(dest))
+        return self.quads
+
+    def assemble(self):
+        ocg = CodeGeneratorob()
+        ocg.generate_code(self.quads, self.slots, self.types)
+        self.asm = ocg.get_code()
+        return self.asm
+
+    def compile(self, codigo):
+        """Corre todas las fases hasta el código objeto y devuelve el contexto."""
+        self.lex(codigo)
+        self.parse()
+        self.analyze()
+        self.generate()
+        if self.optimizer is not None:
+            self.optimize()
+        if self.ssa_pass:
+            self.to_ssa()
+            if self.value_numbering is not None:
+                self.number_values()
+            self.from_ssa()
+        self.assemble()
+        return self
+
+    def run(self):
+        """Ejecuta el código objeto en una VirtualMachine nueva y la devuelve."""
+        vm = VirtualMachine(self.diagnostics)
+        vm.load_program(self.asm)
+        vm.run()
+        return vm
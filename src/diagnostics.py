@@ -0,0 +1,97 @@
+"""
+Diagnósticos de la compilación.
+
+Las fases no imprimen sus advertencias ni sus trazas: las reportan a un Diagnostics, que las
+guarda como registros (severidad, código, mensaje, fase y ubicación) y las escribe después
+en texto o en JSON lines (un objeto JSON por línea). Cada fase recibe el Diagnostics como
+parámetro opcional; con None no se reporta nada y no se arma ningún mensaje. Las trazas (el
+AST completo, las llamadas simuladas de la VM) solo se arman si el Diagnostics las pide
+(`tracing`), porque formatearlas cuesta más que el análisis en entradas grandes.
+
+Un registro puede llevar además el desplazamiento en el código fuente de lo que lo causó (por
+ejemplo, el nombre de una declaración). La línea y la columna salen de ese desplazamiento
+con el LineIndex del código (`line_index`, que asigna quien tokeniza) recién al escribir el
+registro, así que una compilación que no escribe sus diagnósticos no construye el índice.
+"""
+
+import sys
+import json
+from collections import namedtuple
+
+# Severidades, de menor a mayor
+TRACE, INFO, WARNING, ERROR = range(4)
+SEVERITY_NAMES = ('trace', 'info', 'warning', 'error')
+
+# Un registro: `location` es lo que la fase sabe de dónde ocurrió (un ámbito, una
+# instrucción de la VM), o None; `offset` es el desplazamiento en el código fuente, o None
+Diagnostic = namedtuple('Diagnostic', 'severity code message phase location offset', defaults=(None,))
+
+
+class Diagnostics:
+    """
+    Colector de diagnósticos de una compilación. Guarda los registros con severidad
+    `level` o mayor; con level=TRACE también las trazas.
+    """
+
+    def __init__(self, level=INFO):
+        self.level = level
+        self.tracing = level <= TRACE
+        self.records = []
+        self.line_index = None  # LineIndex del código fuente, para ubicar los desplazamientos
+
+    def report(self, severity, code, message, phase, location=None, offset=None):
+        if severity >= self.level:
+            self.records.append(Diagnostic(severity, code, message, phase, location, offset))
+
+    def warning(self, code, message, phase, location=None, offset=None):
+        self.report(WARNING, code, message, phase, location, offset)
+
+    def trace(self, code, message, phase, location=None, offset=None):
+        self.report(TRACE, code, message, phase, location, offset)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def by_code(self, code):
+        """Registros con el código `code`."""
+        return [record for record in self.records if record.code == code]
+
+    def position(self, record):
+        """(línea, columna) de un registro, o None si no tiene desplazamiento o no hay LineIndex."""
+        if record.offset is None or self.line_index is None:
+            return None
+        return self.line_index.position(record.offset)
+
+    def format_text(self, record):
+        """warning[unused-variable] semántico (global, línea 1, columna 5): mensaje"""
+        where = [] if record.location is None else [str(record.location)]
+        position = self.position(record)
+        if position is not None:
+            where.append(f"línea {position[0]}, columna {position[1]}")
+        where = f" ({', '.join(where)})" if where else ""
+        return (f"{SEVERITY_NAMES[record.severity]}[{record.code}] "
+                f"{record.phase}{where}: {record.message}")
+
+    def format_json(self, record):
+        line, column = self.position(record) or (None, None)
+        return json.dumps({
+            'severity': SEVERITY_NAMES[record.severity],
+            'code': record.code,
+            'message': record.message,
+            'phase': record.phase,
+            'location': record.location,
+            'line': line,
+            'column': column,
+        }, ensure_ascii=False)
+
+    def write(self, stream=None, mode='text'):
+        """Escribe los registros en `stream` (stdout por omisión), en 'text' o 'jsonl'."""
+        if mode not in ('text', 'jsonl'):
+            raise ValueError(f"Modo de salida desconocido: '{mode}'")
+        stream = sys.stdout if stream is None else stream
+        format_record = self.format_text if mode == 'text' else self.format_json
+        for record in self.records:
+            stream.write(format_record(record) + "\n")
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Grafo de flujo de control del código intermedio
+
+Divide las cuádruplas del CodeGenerator en bloques básicos (tramos que solo se entran por la
+primera cuádrupla y solo se dejan por la última), enlaza cada bloque con sus sucesores y
+predecesores, y calcula los dominadores y los bucles naturales. Es la base común para los pases
+que razonan sobre el flujo de control y para ejecutar el programa un bloque a la vez, en lugar
+de recorrer la lista plana de cuádruplas buscando 'label', 'goto' e 'if_false'.
+
+Un bloque empieza en la primera cuádrupla, en una etiqueta (varias etiquetas seguidas abren un
+solo bloque) y después de cada goto, if_false, return o halt. El programa principal entra por
+el bloque 0 y cada función llamada por el bloque de su etiqueta; una llamada no es una arista,
+porque la función vuelve a la cuádrupla siguiente. Un bloque al que no se llega desde ninguna
+entrada no tiene dominador inmediato ni está en ningún bucle.
+"""
+
+from collections import namedtuple
+
+# Cuádruplas que terminan un bloque
+TERMINATORS = {'goto', 'if_false', 'return', 'halt'}
+
+# Bucle natural: `header` domina todos los bloques de `blocks` (índices, incluido el header) y
+# `latches` son los bloques con la arista de vuelta al header
+Loop = namedtuple('Loop', 'header blocks latches')
+
+
+class BasicBlock:
+    """
+    Bloque básico: las cuádruplas [start, end) del programa, en `quads`. `labels` son las
+    etiquetas con las que empieza; `jump_target` es el bloque al que salta su goto o if_false
+    y `fallthrough` el que sigue si no salta (None si no hay). `successors` y `predecessors`
+    son los bloques vecinos, sin repetir.
+    """
+    __slots__ = ('index', 'start', 'end', 'quads', 'labels', 'jump_target', 'fallthrough',
+                 'successors', 'predecessors')
+
+    def __init__(self, index, start, end, quads):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.quads = quads
+        self.labels = []
+        self.jump_target = None
+        self.fallthrough = None
+        self.successors = []
+        self.predecessors = []
+
+    @property
+    def terminator(self):
+        """La última cuádrupla si es un salto, return o halt; None si el bloque sigue al siguiente."""
+        last = self.quads[-1]
+        return last if last[1] in TERMINATORS else None
+
+    def __repr__(self):
+        labels = f" {','.join(self.labels)}:" if self.labels else ""
+        return (f"BasicBlock({self.index}{labels} [{self.start}:{self.end}] -> "
+                f"{[block.index for block in self.successors]})")
+
+
+class ControlFlowGraph:
+    """
+    Grafo de flujo de control de una lista de cuádruplas.
+
+    Args:
+        quads: Cuádruplas del CodeGenerator (o de un pase que conserve su formato)
+    """
+
+    def __init__(self, quads):
+        self.quads = quads
+        self.blocks = []
+        self.labels = {}  # Etiqueta -> bloque
+        self.entries = []  # Bloque del programa principal y de cada función llamada
+        self.idom = None  # Dominador inmediato de cada bloque (índice), calculado bajo demanda
+        self.preorder = None  # Numeración del árbol de dominadores, para dominates()
+        self.postorder = None
+        self.build_blocks()
+        self.link_blocks()
+
+    def build_blocks(self):
+        """Corta las cuádruplas en bloques básicos."""
+        quads = self.quads
+        leaders = []
+        previous_op = None
+        for i, quad in enumerate(quads):
+            op = quad[1]
+            if i == 0 or previous_op in TERMINATORS or (op == 'label' and previous_op != 'label'):
+                leaders.append(i)
+            previous_op = op
+        leaders.append(len(quads))
+
+        for index in range(len(leaders) - 1):
+            start, end = leaders[index], leaders[index + 1]
+            block = BasicBlock(index, start, end, quads[start:end])
+            for quad in block.quads:
+                if quad[1] != 'label':
+                    break
+                block.labels.append(quad[0])
+                self.labels[quad[0]] = block
+            self.blocks.append(block)
+
+    def link_blocks(self):
+        """Enlaza cada bloque con el destino de su salto y con el bloque que le sigue."""
+        blocks = self.blocks
+        called = set()
+        for block in blocks:
+            next_block = blocks[block.index + 1] if block.index + 1 < len(blocks) else None
+            last = block.quads[-1]
+            op = last[1]
+            if op == 'goto':
+                block.jump_target = self.target(last[2])
+            elif op == 'if_false':
+                block.jump_target = self.target(last[3])
+                block.fallthrough = next_block
+            elif op not in TERMINATORS:
+                block.fallthrough = next_block
+            for quad in block.quads:
+                if quad[1] == 'call':
+                    called.add(quad[2])
+
+            for successor in (block.fallthrough, block.jump_target):
+                if successor is not None and successor not in block.successors:
+                    block.successors.append(successor)
+                    successor.predecessors.append(block)
+
+        if blocks:
+            self.entries.append(blocks[0])
+        for name in called:
+            block = self.labels.get(name)
+            if block is not None and block is not blocks[0]:
+                self.entries.append(block)
+        self.entries.sort(key=lambda block: block.index)
+
+    def target(self, label):
+        block = self.labels.get(label)
+        if block is None:
+            raise ValueError(f"Salto a una etiqueta inexistente: '{label}'")
+        return block
+
+    def reverse_postorder(self):
+        """Bloques alcanzables desde las entradas, en postorden inverso (recorrido sin recursión)."""
+        visited = [False] * len(self.blocks)
+        postorder = []
+        for entry in self.entries:
+            if visited[entry.index]:
+                continue
+            visited[entry.index] = True
+            stack = [(entry, iter(entry.successors))]
+            while stack:
+                block, successors = stack[-1]
+                for successor in successors:
+                    if not visited[successor.index]:
+                        visited[successor.index] = True
+                        stack.append((successor, iter(successor.successors)))
+                        break
+                else:
+                    stack.pop()
+                    postorder.append(block)
+        postorder.reverse()
+        return postorder
+
+    def dominators(self):
+        """
+        Dominador inmediato de cada bloque, por índice: None para las entradas y los bloques
+        inalcanzables. Algoritmo iterativo de Cooper, Harvey y Kennedy sobre el postorden
+        inverso, con una raíz virtual sobre todas las entradas.
+        """
+        if self.idom is not None:
+            return self.idom
+
+        root = len(self.blocks)  # Raíz virtual
+        rpo = self.reverse_postorder()
+        order = [None] * (root + 1)
+        for position, block in enumerate(rpo):
+            order[block.index] = position
+        order[root] = -1
+        idom = [None] * (root + 1)
+        idom[root] = root
+        for entry in self.entries:
+            idom[entry.index] = root
+
+        changed = True
+        while changed:
+            changed = False
+            for block in rpo:
+                if idom[block.index] == root:
+                    continue
+                new_idom = None
+                for predecessor in block.predecessors:
+                    p = predecessor.index
+                    if idom[p] is None:
+                        continue
+                    if new_idom is None:
+                        new_idom = p
+                        continue
+                    # Intersección: subir por el árbol desde los dos hasta encontrarse
+                    a, b = p, new_idom
+                    while a != b:
+                        while order[a] > order[b]:
+                            a = idom[a]
+                        while order[b] > order[a]:
+                            b = idom[b]
+                    new_idom = a
+                if idom[block.index] != new_idom:
+                    idom[block.index] = new_idom
+                    changed = True
+
+        self.idom = [None if d == root else d for d in idom[:root]]
+        self.number_dominator_tree()
+        return self.idom
+
+    def dominator_tree(self):
+        """Hijos de cada bloque en el árbol de dominadores, por índice."""
+        children = [[] for _ in self.blocks]
+        for index, parent in enumerate(self.dominators()):
+            if parent is not None:
+                children[parent].append(index)
+        return children
+
+    def roots(self):
+        """Raíces del árbol de dominadores: las entradas y los bloques alcanzables sin dominador inmediato."""
+        idom = self.dominators()
+        return list(self.entries) + [block for block in self.blocks if idom[block.index] is None
+                                     and self.reachable(block.index) and block not in self.entries]
+
+    def dominance_frontiers(self):
+        """
+        Frontera de dominancia de cada bloque, por índice: los bloques donde deja de dominar
+        (un predecesor suyo está dominado y el bloque no). Ahí se juntan las definiciones que
+        llegan por caminos distintos, por ejemplo para ubicar las funciones phi de SSA.
+        """
+        idom = self.dominators()
+        frontiers = [set() for _ in self.blocks]
+        for block in self.blocks:
+            if len(block.predecessors) < 2 or not self.reachable(block.index):
+                continue
+            for predecessor in block.predecessors:
+                runner = predecessor.index
+                if not self.reachable(runner):
+                    continue
+                while runner is not None and runner != idom[block.index]:
+                    frontiers[runner].add(block.index)
+                    runner = idom[runner]
+        return frontiers
+
+    def reachable(self, index):
+        """Si se llega al bloque `index` desde alguna entrada."""
+        self.dominators()
+        return self.preorder[index] is not None
+
+    def number_dominator_tree(self):
+        """Numera el árbol de dominadores en pre y postorden: `a` domina a `b` si lo encierra."""
+        size = len(self.blocks)
+        self.preorder = [None] * size
+        self.postorder = [None] * size
+        children = [[] for _ in self.blocks]
+        for index, parent in enumerate(self.idom):
+            if parent is not None:
+                children[parent].append(index)
+        counter = 0
+        for entry in self.entries:
+            stack = [(entry.index, False)]
+            while stack:
+                index, done = stack.pop()
+                if done:
+                    self.postorder[index] = counter
+                    counter += 1
+                    continue
+                self.preorder[index] = counter
+                counter += 1
+                stack.append((index, True))
+                stack.extend((child, False) for child in reversed(children[index]))
+
+    def dominates(self, a, b):
+        """Si el bloque `a` domina al bloque `b` (índices o bloques; todo bloque se domina a sí mismo)."""
+        if isinstance(a, BasicBlock):
+            a = a.index
+        if isinstance(b, BasicBlock):
+            b = b.index
+        self.dominators()
+        if self.preorder[a] is None or self.preorder[b] is None:
+            return False
+        return self.preorder[a] <= self.preorder[b] and self.postorder[b] <= self.postorder[a]
+
+    def natural_loops(self):
+        """
+        Bucles naturales: por cada arista de vuelta (de un bloque a otro que lo domina), el
+        header y los bloques que llegan a la arista sin pasar por el header. Las aristas de
+        vuelta a un mismo header forman un solo bucle. Ordenados por header.
+        """
+        loops = {}  # Header -> (bloques, latches)
+        for block in self.blocks:
+            for successor in block.successors:
+                if self.dominates(successor.index, block.index):
+                    body, latches = loops.setdefault(successor.index, ({successor.index}, []))
+                    latches.append(block.index)
+                    pending = [block.index]
+                    while pending:
+                        index = pending.pop()
+                        if index not in body and self.preorder[index] is not None:
+                            body.add(index)
+                            pending.extend(p.index for p in self.blocks[index].predecessors)
+        return [Loop(header, frozenset(body), tuple(latches))
+                for header, (body, latches) in sorted(loops.items())]
+
+    def to_quads(self):
+        """Cuádruplas de los bloques en orden (con las que un pase haya cambiado en `quads`)."""
+        return [quad for block in self.blocks for quad in block.quads]
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def __iter__(self):
+        return iter(self.blocks)
+
+
+def build_cfg(quads):
+    """
+    Función principal para construir el grafo de flujo de control.
+
+    Args:
+        quads: Lista de cuádruplas del código intermedio
+
+    Returns:
+        ControlFlowGraph: Bloques básicos enlazados
+    """
+    return ControlFlowGraph(quads)
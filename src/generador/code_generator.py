@@ -8,21 +8,96 @@ El código intermedio es una representación más cercana al código máquina pe
 aún independiente de la arquitectura del procesador.
 """
 
+from src.sintactico import ast_nodes
+from src.sintactico.ast_nodes import Node, from_tuple, literal_type, is_variable
+from src.semantico.semantic import binary_type
+
+# Pasos pendientes de CodeGenerator.generate_expression: generar una subexpresión o emitir la
+# operación que combina los resultados ya generados
+EXPR, BINARY, UNARY, CALL, SHARE = range(5)
+
+
+class PendingQuad(tuple):
+    """Cuádrupla que generate_statement emite cuando termina el bloque que la precede."""
+
+
 class CodeGenerator:
     """
     Generador de código intermedio que convierte un AST en cuádruplas.
     Las cuádruplas tienen el formato: (resultado, operador, operando1, operando2)
     """
     
-    def __init__(self):
+    def __init__(self, pool=None, slots=None, types=None):
         self.temp_counter = 0  # Contador para variables temporales
         self.label_counter = 0  # Contador para etiquetas
         self.code = []  # Lista de cuádruplas generadas
+        self.functions = {}  # Declaraciones de función (FUNC_DECL) por nombre
+        self.called_functions = []  # Funciones llamadas cuyo cuerpo hay que generar, en orden
+        self.frame = None  # Parámetros, variables locales y temporales de la función que se genera
+        # Ámbitos como en el semántico: cada nombre se resuelve al de su declaración visible en
+        # las cuádruplas (el `storage` que anotó el semántico; sin anotación, el mismo nombre)
+        self.bindings = {}  # Variable -> nombres en las cuádruplas de sus declaraciones visibles
+        self.scopes = []  # Variables declaradas en cada bloque abierto (o en la función)
+        # Con el ExpressionPool de un AST con subexpresiones compartidas, el temporal de un nodo
+        # compartido se reutiliza mientras siga valiendo: hasta la próxima etiqueta (otro
+        # camino puede llegar ahí sin haberlo calculado), hasta que se asigne una de sus variables
+        # o hasta una llamada (la función puede asignarlas)
+        self.pool = pool
+        self.shared_temps = {}  # Nodo compartido -> temporal con su valor
+        self.temp_users = {}  # Variable -> nodos de shared_temps que la leen
+        # Con los slots que el semántico dio a las variables (variable_slots), cada temporal
+        # recibe el siguiente slot libre; `slots` queda con los de todo el programa
+        self.variable_slots = slots
+        self.slots = dict(slots) if slots is not None else None
+        # Con los tipos de las variables (slot_types), cada temporal queda con el tipo que el
+        # semántico anotó en su nodo; el generador de código objeto elige con ellos las
+        # instrucciones tipadas
+        self.variable_types = types
+        self.types = dict(types) if types is not None else None
         
     def new_temp(self):
         """Genera una nueva variable temporal (t1, t2, t3, ...)"""
         self.temp_counter += 1
-        return f"t{self.temp_counter}"
+        temp = f"t{self.temp_counter}"
+        if self.frame is not None:
+            self.frame[temp] = None
+        if self.slots is not None:
+            self.slots.setdefault(temp, len(self.slots))
+        return temp
+
+    def resolve(self, name):
+        """Nombre en las cuádruplas de la declaración visible de la variable `name`."""
+        visible = self.bindings.get(name)
+        return visible[-1] if visible else name
+
+    def declare(self, name, storage):
+        """Declara `name` en el ámbito actual con el nombre `storage` en las cuádruplas."""
+        self.forget_shared(name)
+        self.bindings.setdefault(name, []).append(storage)
+        if self.scopes:
+            self.scopes[-1].append(name)
+
+    def exit_scope(self):
+        """Cierra el ámbito actual: sus variables dejan de verse."""
+        for name in reversed(self.scopes.pop()):
+            self.forget_shared(name)
+            self.bindings[name].pop()
+
+    def forget_shared(self, name):
+        # Los nodos compartidos que leen `name` no valen cuando el nombre pasa a otra declaración
+        if self.shared_temps:
+            for node in self.temp_users.pop(self.resolve(name), ()):
+                self.shared_temps.pop(node, None)
+
+    def operand_type(self, arg):
+        """Tipo de un operando: el registrado en su literal, o el de su variable o temporal."""
+        arg_type = literal_type(arg)
+        return arg_type if arg_type is not None else self.types.get(arg)
+
+    def set_type(self, temp, temp_type):
+        """Registra el tipo de un temporal."""
+        if self.types is not None:
+            self.types[temp] = temp_type
     
     def new_label(self):
         """Genera una nueva etiqueta (L1, L2, L3, ...)"""
@@ -41,146 +116,184 @@ class CodeGenerator:
         """
         quad = (result, op, arg1, arg2)
         self.code.append(quad)
+        if self.shared_temps:
+            if op == 'label' or op == 'call':
+                self.shared_temps.clear()
+                self.temp_users.clear()
+            elif result in self.temp_users:
+                for node in self.temp_users.pop(result):
+                    self.shared_temps.pop(node, None)
         return result
     
     def generate_expression(self, expr):
         """
         Genera código intermedio para una expresión.
-        Retorna la variable temporal que contiene el resultado.
+        Retorna la variable temporal que contiene el resultado, o el literal mismo: los
+        literales van directo en las cuádruplas como operandos inmediatos.
+
+        La expresión se recorre con una pila explícita en postorden (los operandos antes que la
+        operación), así que una expresión muy profunda no excede el límite de recursión. Los
+        temporales se numeran en el mismo orden que en un recorrido recursivo.
         
         Args:
-            expr: Expresión del AST (número, string, variable, o tupla de operación)
+            expr: Expresión del AST (número, string, variable, o nodo de operación)
             
         Returns:
-            str: Variable temporal con el resultado
+            Variable o temporal con el resultado, o un literal
         """
-        # Casos base: literales
-        if isinstance(expr, (int, float)):
-            temp = self.new_temp()
-            self.emit(temp, '=', expr, None)
-            return temp
-            
-        elif isinstance(expr, str):
-            # Verificar si es un literal string o una variable
-            if expr.startswith('"') and expr.endswith('"'):
-                # Es un literal string
-                temp = self.new_temp()
-                self.emit(temp, '=', expr, None)
-                return temp
-            elif expr.startswith("'") and expr.endswith("'"):
-                # Es un literal char
-                temp = self.new_temp()
-                self.emit(temp, '=', expr, None)
-                return temp
-            elif expr in ('true', 'false'):
-                # Es un literal booleano
-                temp = self.new_temp()
-                self.emit(temp, '=', expr, None)
-                return temp
-            else:
-                # Es una variable, la devolvemos directamente
-                return expr
-                
-        elif isinstance(expr, bool):
-            # Literal booleano en Python
-            temp = self.new_temp()
-            value = 'true' if expr else 'false'
-            self.emit(temp, '=', value, None)
-            return temp
-            
-        # Casos complejos: operaciones
-        elif isinstance(expr, tuple):
-            if len(expr) == 2 and expr[0] == 'NOT':
-                # Operador unario NOT
-                _, operand = expr
-                operand_temp = self.generate_expression(operand)
+        pending = [(EXPR, expr)]  # Pasos por hacer (el último es el siguiente)
+        results = []  # Temporales, variables o literales con el resultado de cada subexpresión
+
+        while pending:
+            step = pending.pop()
+            kind = step[0]
+
+            if kind == EXPR:
+                expr = step[1]
+
+                if not isinstance(expr, Node):
+                    # Casos base: literales (número, booleano, o string o char con el tipo que
+                    # registró el parser) y variables (con el nombre de su declaración), que se
+                    # usan directamente como operandos
+                    if isinstance(expr, (str, int, float)):
+                        results.append(self.resolve(expr) if is_variable(expr) else expr)
+                    else:
+                        raise ValueError(f"Expresión no reconocida en generación de código: {expr}")
+
+                # Casos complejos: operaciones (primero se generan los operandos)
+                elif self.shared_temps and expr in self.shared_temps:
+                    # Nodo compartido ya calculado en este camino
+                    results.append(self.shared_temps[expr])
+
+                elif expr.kind == ast_nodes.BINARY:
+                    # Operación binaria: Binary(op, left, right)
+                    self.share(expr, pending)
+                    pending.append((BINARY, expr.op, expr.type, isinstance(expr, ast_nodes.SharedBinary)))
+                    pending.append((EXPR, expr.right))
+                    pending.append((EXPR, expr.left))
+
+                elif expr.kind == ast_nodes.NOT:
+                    # Operador unario NOT
+                    self.share(expr, pending)
+                    pending.append((UNARY, '!', expr.type))
+                    pending.append((EXPR, expr.operand))
+
+                elif expr.kind == ast_nodes.CAST:
+                    # Conversión de tipo (cast)
+                    self.share(expr, pending)
+                    pending.append((UNARY, f'cast_{expr.cast_type}', expr.type))
+                    pending.append((EXPR, expr.expr))
+
+                elif expr.kind == ast_nodes.FUNC_CALL:
+                    # Llamada a función: argumentos, luego param por cada uno y la llamada
+                    args = expr.args
+                    pending.append((CALL, expr.name, len(args), expr.type))
+                    pending.extend((EXPR, arg) for arg in reversed(args))
+
+                else:
+                    # Caso no manejado
+                    raise ValueError(f"Expresión no reconocida en generación de código: {expr}")
+
+            elif kind == BINARY:
+                # Generar código para la operación con los operandos ya generados
+                right_temp = results.pop()
+                left_temp = results.pop()
                 result_temp = self.new_temp()
-                self.emit(result_temp, '!', operand_temp, None)
-                return result_temp
-                
-            elif len(expr) == 3 and expr[0] == 'CAST':
-                # Conversión de tipo (cast)
-                _, cast_type, inner_expr = expr
-                operand_temp = self.generate_expression(inner_expr)
+                if self.types is not None:
+                    # Un nodo compartido (pool) guarda el último tipo anotado, que puede ser el
+                    # de otro ámbito: su tipo aquí sale de los de sus operandos. Los demás nodos
+                    # aparecen una sola vez y su tipo es el de este punto
+                    self.set_type(result_temp, binary_type(step[1], self.operand_type(left_temp),
+                                                           self.operand_type(right_temp))
+                                  if step[3] else step[2])
+                self.emit(result_temp, step[1], left_temp, right_temp)
+                results.append(result_temp)
+
+            elif kind == UNARY:
+                operand_temp = results.pop()
                 result_temp = self.new_temp()
-                self.emit(result_temp, f'cast_{cast_type}', operand_temp, None)
-                return result_temp
-                
-            elif len(expr) == 3 and expr[0] == 'FUNC_CALL':
-                # Llamada a función
-                _, func_name, args = expr
-                
-                # Generar código para argumentos
-                arg_temps = []
-                for arg in args:
-                    arg_temp = self.generate_expression(arg)
-                    arg_temps.append(arg_temp)
-                
+                self.set_type(result_temp, step[2])
+                self.emit(result_temp, step[1], operand_temp, None)
+                results.append(result_temp)
+
+            elif kind == SHARE:
+                # El resultado del nodo compartido queda para sus próximas apariciones
+                node = step[1]
+                self.shared_temps[node] = results[-1]
+                for name in node.free_vars:
+                    self.temp_users.setdefault(self.resolve(name), []).append(node)
+
+            else:  # CALL
+                _, func_name, arg_count, return_type = step
+                arg_temps = results[len(results) - arg_count:]
+                del results[len(results) - arg_count:]
+
                 # Emitir llamadas param para cada argumento
                 for arg_temp in arg_temps:
                     self.emit(None, 'param', arg_temp, None)
-                
-                # Emitir llamada a función
-                result_temp = self.new_temp()
-                self.emit(result_temp, 'call', func_name, len(args))
-                return result_temp
-                
-            elif len(expr) == 3:
-                # Operación binaria: (op, left, right)
-                op, left, right = expr
-                
-                # Generar código para operandos
-                left_temp = self.generate_expression(left)
-                right_temp = self.generate_expression(right)
-                
-                # Generar código para la operación
+
+                # Emitir llamada a función (su cuerpo se genera al final, la primera vez)
+                self.request_function(func_name)
                 result_temp = self.new_temp()
-                self.emit(result_temp, op, left_temp, right_temp)
-                return result_temp
-        
-        # Caso no manejado
-        raise ValueError(f"Expresión no reconocida en generación de código: {expr}")
+                self.set_type(result_temp, return_type)
+                self.emit(result_temp, 'call', func_name, arg_count)
+                results.append(result_temp)
+
+        return results.pop()
+
+    def share(self, node, pending):
+        """Con un pool, guarda el temporal de un nodo compartido (sin llamadas) al generarlo."""
+        if self.pool is not None and getattr(node, 'free_vars', None) is not None:
+            pending.append((SHARE, node))
     
     def generate_statement(self, stmt):
         """
         Genera código intermedio para una sentencia.
+
+        Los bloques anidados (if, else, while) no se generan con recursión: sus sentencias se
+        apilan junto con las cuádruplas que van después de cada bloque (saltos y etiquetas), así
+        que la profundidad de anidamiento no depende del límite de recursión.
         
         Args:
             stmt: Sentencia del AST
         """
-        if not isinstance(stmt, tuple):
+        pending = [stmt]  # Sentencias y cuádruplas por generar (la última es la siguiente)
+        while pending:
+            stmt = pending.pop()
+            if type(stmt) is PendingQuad:
+                self.emit(*stmt)
+            else:
+                self.generate_simple_statement(stmt, pending)
+
+    def generate_simple_statement(self, stmt, pending):
+        """
+        Genera el código de una sentencia; las sentencias de sus bloques y las cuádruplas que
+        cierran cada bloque se agregan a `pending` (ver generate_statement).
+        """
+        if not isinstance(stmt, Node):
             raise ValueError(f"Sentencia inválida: {stmt}")
             
-        stmt_type = stmt[0]
+        stmt_type = stmt.kind
         
-        if stmt_type == 'DECLARATION':
-            if len(stmt) == 4:
-                # Declaración con inicialización: ('DECLARATION', tipo, nombre, expr)
-                _, var_type, var_name, init_expr = stmt
-                expr_temp = self.generate_expression(init_expr)
-                self.emit(var_name, '=', expr_temp, None)
-                
-            elif len(stmt) == 5 and stmt[1] == 'const':
-                # Declaración de constante: ('DECLARATION', 'const', tipo, nombre, expr)
-                _, _, var_type, var_name, init_expr = stmt
-                expr_temp = self.generate_expression(init_expr)
-                self.emit(var_name, '=', expr_temp, None)
-                
-            elif len(stmt) == 3:
-                # Declaración sin inicialización: ('DECLARATION', tipo, nombre)
-                _, var_type, var_name = stmt
-                # No generamos código para declaraciones sin inicialización
-                pass
-            
-        elif stmt_type == 'ASSIGNMENT':
-            # Asignación: ('ASSIGNMENT', variable, expr)
-            _, var_name, expr = stmt
-            expr_temp = self.generate_expression(expr)
-            self.emit(var_name, '=', expr_temp, None)
-            
-        elif stmt_type == 'IF':
-            # Estructura condicional: ('IF', condición, bloque)
-            _, condition, then_block = stmt
+        if stmt_type == ast_nodes.DECLARATION:
+            # Declaración, de variable o constante: Declaration(tipo, nombre, expr)
+            storage = stmt.storage if stmt.storage is not None else stmt.name
+            self.declare(stmt.name, storage)
+            if self.frame is not None:
+                self.frame[storage] = None
+            if stmt.init is not None:
+                expr_temp = self.generate_expression(stmt.init)
+                self.emit(storage, '=', expr_temp, None)
+            # No generamos código para declaraciones sin inicialización
+            
+        elif stmt_type == ast_nodes.ASSIGNMENT:
+            # Asignación: Assignment(variable, expr)
+            expr_temp = self.generate_expression(stmt.expr)
+            self.emit(self.resolve(stmt.name), '=', expr_temp, None)
+            
+        elif stmt_type == ast_nodes.IF:
+            # Estructura condicional: If(condición, bloque)
+            condition, then_block = stmt.cond, stmt.then_block
             
             # Generar código para la condición
             cond_temp = self.generate_expression(condition)
@@ -192,22 +305,18 @@ class CodeGenerator:
             # Salto condicional
             self.emit(None, 'if_false', cond_temp, else_label)
             
-            # Generar código del bloque then
-            for stmt in then_block:
-                self.generate_statement(stmt)
-            
-            # Salto al final
-            self.emit(None, 'goto', end_label, None)
-            
-            # Etiqueta else (aunque no haya else)
-            self.emit(else_label, 'label', None, None)
+            # Después del bloque then (se apila al revés de como se genera):
+            # etiqueta de fin, etiqueta else (aunque no haya else) y el salto al final
+            pending.append(PendingQuad((end_label, 'label', None, None)))
+            pending.append(PendingQuad((else_label, 'label', None, None)))
+            pending.append(PendingQuad((None, 'goto', end_label, None)))
             
-            # Etiqueta de fin
-            self.emit(end_label, 'label', None, None)
+            # Generar código del bloque then
+            pending.extend(reversed(then_block))
             
-        elif stmt_type == 'IF_ELSE':
-            # Estructura condicional: ('IF_ELSE', condición, bloque_then, bloque_else)
-            _, condition, then_block, else_block = stmt
+        elif stmt_type == ast_nodes.IF_ELSE:
+            # Estructura condicional: IfElse(condición, bloque_then, bloque_else)
+            condition, then_block, else_block = stmt.cond, stmt.then_block, stmt.else_block
             
             # Generar código para la condición
             cond_temp = self.generate_expression(condition)
@@ -219,26 +328,17 @@ class CodeGenerator:
             # Salto condicional al else
             self.emit(None, 'if_false', cond_temp, else_label)
             
-            # Generar código del bloque then
-            for stmt in then_block:
-                self.generate_statement(stmt)
-            
-            # Salto al final (saltando el else)
-            self.emit(None, 'goto', end_label, None)
-            
-            # Etiqueta del else
-            self.emit(else_label, 'label', None, None)
-            
-            # Generar código del bloque else
-            for stmt in else_block:
-                self.generate_statement(stmt)
+            # Se apila al revés de como se genera: bloque then, salto al final (saltando
+            # el else), etiqueta del else, bloque else y etiqueta de fin
+            pending.append(PendingQuad((end_label, 'label', None, None)))
+            pending.extend(reversed(else_block))
+            pending.append(PendingQuad((else_label, 'label', None, None)))
+            pending.append(PendingQuad((None, 'goto', end_label, None)))
+            pending.extend(reversed(then_block))
             
-            # Etiqueta de fin
-            self.emit(end_label, 'label', None, None)
-            
-        elif stmt_type == 'WHILE':
-            # Bucle while: ('WHILE', condición, bloque)
-            _, condition, body_block = stmt
+        elif stmt_type == ast_nodes.WHILE:
+            # Bucle while: While(condición, bloque)
+            condition, body_block = stmt.cond, stmt.body
             
             # Generar etiquetas
             start_label = self.new_label()
@@ -253,39 +353,41 @@ class CodeGenerator:
             # Salto condicional de salida
             self.emit(None, 'if_false', cond_temp, end_label)
             
-            # Generar código del cuerpo
-            for stmt in body_block:
-                self.generate_statement(stmt)
-            
-            # Salto de vuelta al inicio
-            self.emit(None, 'goto', start_label, None)
+            # Después del cuerpo: salto de vuelta al inicio y etiqueta de fin
+            pending.append(PendingQuad((end_label, 'label', None, None)))
+            pending.append(PendingQuad((None, 'goto', start_label, None)))
             
-            # Etiqueta de fin
-            self.emit(end_label, 'label', None, None)
+            # Generar código del cuerpo
+            pending.extend(reversed(body_block))
             
-        elif stmt_type == 'RETURN':
-            # Sentencia return: ('RETURN', expr)
-            _, expr = stmt
+        elif stmt_type == ast_nodes.RETURN:
+            # Sentencia return: Return(expr)
+            expr = stmt.expr
             if expr is not None:
                 expr_temp = self.generate_expression(expr)
                 self.emit(None, 'return', expr_temp, None)
             else:
                 self.emit(None, 'return', None, None)
                 
-        elif stmt_type == 'FUNC_CALL':
+        elif stmt_type == ast_nodes.FUNC_CALL:
             # Llamada a función como sentencia
             self.generate_expression(stmt)
+
+        elif stmt_type == ast_nodes.FUNC_DECL:
+            # Declaración de función: no genera código aquí; el cuerpo se genera solo si se llama
+            if stmt.body is not None:
+                self.functions[stmt.name] = stmt
             
-        elif stmt_type == 'BLOCK_ENTER':
-            # Marca de entrada de bloque - ignorar en generación de código
-            pass
+        elif stmt_type == ast_nodes.BLOCK_ENTER:
+            # Marca de entrada de bloque: sus declaraciones ocultan las de afuera
+            self.scopes.append([])
             
-        elif stmt_type == 'BLOCK_EXIT':
-            # Marca de salida de bloque - ignorar en generación de código
-            pass
+        elif stmt_type == ast_nodes.BLOCK_EXIT:
+            # Marca de salida de bloque: vuelven a verse las declaraciones de afuera
+            self.exit_scope()
             
         else:
-            raise ValueError(f"Tipo de sentencia no reconocido: {stmt_type}")
+            raise ValueError(f"Tipo de sentencia no reconocido: {stmt.as_tuple()[0]}")
     
     def generate(self, ast):
         """
@@ -300,11 +402,65 @@ class CodeGenerator:
         self.code = []  # Reiniciar el código
         self.temp_counter = 0
         self.label_counter = 0
+        self.functions = {}
+        self.called_functions = []
+        self.frame = None
+        self.shared_temps = {}
+        self.temp_users = {}
+        self.bindings = {}
+        self.scopes = []
+        if self.variable_slots is not None:
+            self.slots = dict(self.variable_slots)
+        if self.variable_types is not None:
+            self.types = dict(self.variable_types)
         
         for stmt in ast:
             self.generate_statement(stmt)
+
+        # Cuerpos de las funciones llamadas, después del programa (que se detiene antes de
+        # llegar a ellos). Un cuerpo puede llamar otras funciones, que se agregan a la lista.
+        if self.called_functions:
+            self.emit(None, 'halt', None, None)
+            for name in self.called_functions:
+                self.generate_function(self.functions[name])
         
         return self.code
+
+    def request_function(self, name):
+        """Pide generar el cuerpo de una función declarada la primera vez que se llama."""
+        if name in self.functions and name not in self.called_functions:
+            self.called_functions.append(name)
+
+    def generate_function(self, decl):
+        """
+        Genera el cuerpo de una función: una etiqueta con su nombre, una cuádrupla 'frame' con
+        los nombres propios de la función (parámetros, variables locales y temporales, que la
+        VM guarda al llamarla y restaura al retornar), una cuádrupla 'arg' por parámetro
+        (copia el argumento i al parámetro) y las sentencias del cuerpo, que se analizan
+        recién ahora si nadie lo había hecho. Termina con un return sin valor por si el cuerpo
+        no retorna en todos los caminos.
+
+        Args:
+            decl: Declaración FuncDecl(nombre, tipos, tipo_retorno, cuerpo)
+        """
+        name, body = decl.name, decl.body
+        self.emit(name, 'label', None, None)
+        # Los nombres se conocen al terminar el cuerpo: la cuádrupla se completa entonces
+        frame_index = len(self.code)
+        self.emit(None, 'frame', (), None)
+        # El cuerpo ve las variables globales y las propias (un ámbito, como en el semántico)
+        param_storage = body.param_storage if body.param_storage is not None else body.param_names
+        self.frame = dict.fromkeys(param_storage)
+        self.scopes.append([])
+        for i, (param_name, storage) in enumerate(zip(body.param_names, param_storage)):
+            self.declare(param_name, storage)
+            self.emit(storage, 'arg', i, None)
+        for stmt in body.statements():
+            self.generate_statement(stmt)
+        self.emit(None, 'return', None, None)
+        self.exit_scope()
+        self.code[frame_index] = (None, 'frame', tuple(self.frame), None)
+        self.frame = None
     
     def print_code(self):
         """Imprime el código intermedio de forma legible."""
@@ -327,6 +483,10 @@ class CodeGenerator:
                 print(f"{i:3d}: param {arg1}")
             elif op == 'call':
                 print(f"{i:3d}: {result} = call {arg1}, {arg2}")
+            elif op == 'halt':
+                print(f"{i:3d}: halt")
+            elif op == 'frame':
+                print(f"{i:3d}: frame {', '.join(arg1)}")
             elif arg2 is None:
                 if arg1 is None:
                     print(f"{i:3d}: {result} {op}")
@@ -370,9 +530,9 @@ if __name__ == "__main__":
     print("=" * 50)
     
     # AST de ejemplo: int a = 5 + 2;
-    ast_ejemplo = [
+    ast_ejemplo = from_tuple([
         ('DECLARATION', 'int', 'a', ('+', 5, 2))
-    ]
+    ])
     
     print("AST de entrada:")
     print(ast_ejemplo)
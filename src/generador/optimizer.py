@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Optimizador del código intermedio
+
+Recibe las cuádruplas del CodeGenerator y las simplifica sin cambiar lo que hace el programa:
+
+- Plegado de constantes: las operaciones aritméticas, comparaciones, '!' y cast_* cuyos
+  operandos son literales se reemplazan por su resultado.
+- Propagación de constantes: dentro de un bloque básico (hasta la próxima etiqueta, donde se
+  juntan caminos) un temporal o variable con valor conocido se reemplaza por el literal. Una
+  llamada olvida los valores de las variables, que la función puede asignar.
+- Poda de ramas: un if_false con condición constante se vuelve un goto o desaparece; se
+  eliminan el código inalcanzable, los saltos a la cuádrupla siguiente y las etiquetas a las
+  que ya no salta nadie.
+- Los temporales que ya nadie lee se eliminan.
+
+Las pasadas se repiten hasta que no cambia nada: quitar una etiqueta junta dos bloques y deja
+propagar más constantes.
+"""
+
+import re
+import math
+import operator
+
+# Nombres que da CodeGenerator.new_temp a sus temporales
+TEMP_NAME = re.compile(r't\d+$')
+
+ARITHMETIC = {'+': operator.add, '-': operator.sub, '*': operator.mul}
+COMPARISONS = {
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '>': operator.gt, '<=': operator.le, '>=': operator.ge,
+}
+CASTS = {'cast_int': int, 'cast_float': float, 'cast_bool': bool}
+
+# Cuádruplas que solo calculan su resultado a partir de sus operandos. Una '/' además falla
+# con divisor cero: solo no tiene otros efectos si su divisor es un literal distinto de cero
+# (ver is_pure)
+PURE_OPS = {'=', '!', '/'} | set(ARITHMETIC) | set(COMPARISONS) | set(CASTS)
+
+# Después de estas la ejecución no sigue con la cuádrupla siguiente
+UNCONDITIONAL = {'goto', 'return', 'halt'}
+
+# Rango de los enteros que la VM guarda en su banco int (array('q'))
+INT_MIN, INT_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def constant_value(arg):
+    """Valor de un operando literal int, float o bool; None si es un nombre o un string."""
+    if type(arg) in (int, float, bool):
+        return arg
+    return None
+
+
+def is_number(value):
+    return type(value) in (int, float)
+
+
+def is_pure(quad):
+    """Si la cuádrupla no tiene efectos además de asignar su resultado."""
+    op = quad[1]
+    if op == '/':
+        divisor = constant_value(quad[3])
+        return is_number(divisor) and divisor != 0
+    return op in PURE_OPS
+
+
+def representable(value):
+    """Si el ensamblador puede escribir `value` como literal y la VM volver a leerlo igual."""
+    if type(value) is int:
+        return INT_MIN <= value <= INT_MAX
+    if type(value) is float:
+        return math.isfinite(value)
+    return type(value) is bool
+
+
+def fold(op, left, right=None):
+    """
+    Resultado de `op` sobre operandos constantes, o None si no se pliega (tipos mezclados,
+    división por cero o un resultado que no se puede escribir como literal).
+    """
+    if op in ARITHMETIC or op == '/':
+        if type(left) is not type(right) or not is_number(left):
+            return None
+        if op == '/':
+            if right == 0:
+                return None
+            if type(left) is int:
+                # División entera truncada hacia cero, como IDIV en la VM
+                result = abs(left) // abs(right)
+                result = -result if (left < 0) != (right < 0) else result
+            else:
+                result = left / right
+        else:
+            result = ARITHMETIC[op](left, right)
+    elif op in COMPARISONS:
+        if type(left) is bool and type(right) is bool and op in ('==', '!='):
+            result = COMPARISONS[op](left, right)
+        elif is_number(left) and is_number(right):
+            result = COMPARISONS[op](left, right)
+        else:
+            return None
+    elif op == '!':
+        result = not left
+    elif op in CASTS:
+        result = CASTS[op](left)
+    else:
+        return None
+    return result if representable(result) else None
+
+
+def operand_positions(quad):
+    """Índices de la cuádrupla que son operandos leídos (nombres o literales)."""
+    op = quad[1]
+    if op in ARITHMETIC or op in COMPARISONS or op == '/':
+        return (2, 3)
+    if op in ('=', '!', 'if_false', 'param', 'return') or op in CASTS:
+        return (2,)
+    return ()
+
+
+class Optimizer:
+    """
+    Optimizador de cuádruplas (resultado, operador, operando1, operando2). Cuenta lo que hace
+    en `folded` (operaciones plegadas), `propagated` (operandos reemplazados por su
+    constante) y `pruned` (ramas con condición constante).
+    """
+
+    def __init__(self):
+        self.folded = 0
+        self.propagated = 0
+        self.pruned = 0
+
+    def optimize(self, quads):
+        """
+        Optimiza una lista de cuádruplas.
+
+        Args:
+            quads: Cuádruplas del CodeGenerator
+
+        Returns:
+            list: Cuádruplas optimizadas (la lista original no se modifica)
+        """
+        code = list(quads)
+        while True:
+            size = len(code)
+            changed = False
+            code, propagated = self.propagate(code)
+            changed |= propagated
+            code = self.remove_unreachable(code)
+            code = self.remove_dead_temps(code)
+            if not changed and len(code) == size:
+                return code
+
+    def propagate(self, code):
+        """
+        Propaga y pliega constantes bloque por bloque, y poda los if_false con condición
+        constante. Devuelve las cuádruplas nuevas y si cambió alguna.
+        """
+        known = {}  # Nombre -> valor constante en este punto del bloque
+        result = []
+        changed = False
+        for quad in code:
+            dest, op, arg1, arg2 = quad
+            if op == 'label':
+                known.clear()
+                result.append(quad)
+                continue
+
+            args = [arg1, arg2]
+            for position in operand_positions(quad):
+                name = args[position - 2]
+                if isinstance(name, str) and name in known:
+                    args[position - 2] = known[name]
+                    self.propagated += 1
+            arg1, arg2 = args
+
+            if op == 'if_false':
+                condition = constant_value(arg1)
+                if condition is not None:
+                    self.pruned += 1
+                    changed = True
+                    if not condition:
+                        result.append((None, 'goto', arg2, None))
+                    continue
+            elif op != '=' and op in PURE_OPS:
+                left, right = constant_value(arg1), constant_value(arg2)
+                if left is not None and (right is not None or arg2 is None):
+                    value = fold(op, left, right)
+                    if value is not None:
+                        self.folded += 1
+                        op, arg1, arg2 = '=', value, None
+
+            new_quad = (dest, op, arg1, arg2)
+            changed |= new_quad != quad
+            result.append(new_quad)
+
+            if op == 'call':
+                # La función puede asignar las variables del programa que la llama (no sus
+                # temporales)
+                known = {name: value for name, value in known.items() if TEMP_NAME.match(name)}
+            if dest is not None and op != 'label':
+                value = constant_value(arg1) if op == '=' else None
+                if value is not None:
+                    known[dest] = value
+                else:
+                    known.pop(dest, None)
+        return result, changed
+
+    def remove_unreachable(self, code):
+        """
+        Quita el código después de un salto incondicional hasta la próxima etiqueta, los goto
+        a la etiqueta siguiente y las etiquetas que nadie referencia.
+        """
+        while True:
+            targets = set()
+            for dest, op, arg1, arg2 in code:
+                if op in ('goto', 'call'):
+                    targets.add(arg1)
+                elif op == 'if_false':
+                    targets.add(arg2)
+
+            result = []
+            reachable = True
+            for i, quad in enumerate(code):
+                op = quad[1]
+                if op == 'label':
+                    if quad[0] not in targets:
+                        continue
+                    reachable = True
+                if not reachable:
+                    continue
+                if op == 'goto' and self.jumps_to_next(code, i):
+                    continue
+                result.append(quad)
+                if op in UNCONDITIONAL:
+                    reachable = False
+
+            if len(result) == len(code):
+                return result
+            code = result
+
+    @staticmethod
+    def jumps_to_next(code, i):
+        """Si el goto de la posición `i` salta a una de las etiquetas que lo siguen."""
+        label = code[i][2]
+        for dest, op, _, _ in code[i + 1:]:
+            if op != 'label':
+                return False
+            if dest == label:
+                return True
+        return False
+
+    @staticmethod
+    def remove_dead_temps(code):
+        """Quita las cuádruplas sin efectos que asignan un temporal que nadie lee."""
+        while True:
+            used = set()
+            for quad in code:
+                for position in operand_positions(quad):
+                    if isinstance(quad[position], str):
+                        used.add(quad[position])
+            result = [
+                quad for quad in code
+                if not (is_pure(quad) and isinstance(quad[0], str)
+                        and TEMP_NAME.match(quad[0]) and quad[0] not in used)
+            ]
+            if len(result) == len(code):
+                return result
+            code = result
+
+
+def optimize_intermediate_code(quads):
+    """
+    Función principal para optimizar código intermedio.
+
+    Args:
+        quads: Lista de cuádruplas del CodeGenerator
+
+    Returns:
+        list: Lista de cuádruplas optimizadas
+    """
+    return Optimizer().optimize(quads)
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+Forma SSA del código intermedio
+
+Convierte las cuádruplas del CodeGenerator a SSA (static single assignment): cada asignación
+crea una versión nueva de su variable o temporal (x#1, x#2, ...) y donde se juntan caminos con
+versiones distintas una cuádrupla 'phi' elige la que corresponde a la arista por la que se
+llegó. Así cada nombre tiene una sola definición y un pase puede seguir un valor de su
+definición a sus usos sin recorrer el programa entero, aunque `x` se reasigne en un while.
+
+- Construcción: las phi van en la frontera de dominancia iterada de los bloques que definen
+  la variable (Cytron et al.), solo para los nombres vivos entre bloques; después se
+  renombra recorriendo el árbol de dominadores.
+- Destrucción: cada versión vuelve al nombre de su variable si no se superpone con otra
+  versión viva de la misma variable; las que se superponen (porque un pase movió sus usos)
+  quedan con su nombre y las phi se reemplazan por copias al final de cada predecesor,
+  partiendo las aristas de un if_false.
+
+La memoria de la VM es visible por nombre: una función lee y asigna las variables del
+programa que la llama (salvo las de su 'frame', que la VM restaura al retornar) y el estado
+final es el del programa principal. Por eso antes de cada 'call' hay una cuádrupla 'use' con
+las versiones vigentes de las variables que la función puede leer, después una 'def' por
+cada variable que puede asignar, y en cada salida del programa principal una 'exit' con las
+versiones de todas; la destrucción deja esos valores en el nombre de su variable. Sin pases
+en el medio, la ida y vuelta devuelve las mismas cuádruplas.
+
+Cuádruplas propias de la forma SSA (la destrucción las quita):
+    (version, 'phi', ((predecesor, version), ...), None)   None: no definida por ese camino
+    (None, 'use', (version, ...), None)
+    (version, 'def', None, None)   La llamada anterior dejó un valor en la variable
+    (None, 'exit', (version, ...), None)
+
+Los pases sobre la forma SSA pueden reemplazar usos y quitar definiciones sin usos (salvo
+las 'def'), pero no agregar definiciones de una variable: la 'exit' no cuenta en la vida de
+las versiones (haría vivas todas las variables hasta el final), porque ninguna definición
+queda entre la versión que observa y la salida.
+"""
+
+from src.generador.cfg import ControlFlowGraph
+from src.generador.optimizer import TEMP_NAME, UNCONDITIONAL, operand_positions
+from src.sintactico.ast_nodes import is_variable
+
+# Separa la variable del número de versión; no puede aparecer en un identificador
+SEPARATOR = '#'
+
+
+def variable_of(name):
+    """Variable o temporal de la que sale un nombre de la forma SSA (x#2, x#c1 -> x)."""
+    return name.split(SEPARATOR, 1)[0]
+
+
+def reads(quad):
+    """Nombres que lee una cuádrupla, incluidas 'phi', 'use' y 'exit'."""
+    op = quad[1]
+    if op == 'phi':
+        return [value for _, value in quad[2] if is_variable(value)]
+    if op in ('use', 'exit'):
+        return list(quad[2])
+    return [quad[position] for position in operand_positions(quad) if is_variable(quad[position])]
+
+
+def defines(quad):
+    """Nombre que asigna una cuádrupla, o None."""
+    return quad[0] if quad[0] is not None and quad[1] != 'label' else None
+
+
+def sequentialize(copies, fresh):
+    """
+    Copias paralelas (destino, origen) como cuádruplas '=' en secuencia: primero las que
+    escriben un nombre que ninguna otra lee; un ciclo (x <- y, y <- x) pasa por `fresh()`.
+    """
+    pending = [(dest, src) for dest, src in copies if dest != src]
+    moves = []
+    while pending:
+        sources = {src for _, src in pending}
+        for i, (dest, src) in enumerate(pending):
+            if dest not in sources:
+                moves.append((dest, '=', src, None))
+                del pending[i]
+                break
+        else:
+            saved = pending[0][1]
+            temp = fresh(saved)
+            moves.append((temp, '=', saved, None))
+            pending = [(dest, temp if src == saved else src) for dest, src in pending]
+    return moves
+
+
+class SSAForm:
+    """
+    Programa en forma SSA: el grafo de flujo de control con las cuádruplas renombradas en
+    los bloques (las phi al principio, después de las etiquetas) y `versions`, la variable
+    o temporal de cada versión.
+    """
+
+    def __init__(self, cfg, versions):
+        self.cfg = cfg
+        self.versions = versions
+
+    def variable(self, name):
+        """Variable o temporal original de un nombre (el mismo si no es una versión)."""
+        return self.versions.get(name, name)
+
+    def quads(self):
+        return self.cfg.to_quads()
+
+    def definitions(self):
+        """Versión -> (bloque, posición en el bloque) de su única definición."""
+        definitions = {}
+        for block in self.cfg:
+            for position, quad in enumerate(block.quads):
+                name = defines(quad)
+                if name in self.versions:
+                    definitions[name] = (block.index, position)
+        return definitions
+
+    def uses(self):
+        """Versión -> lista de (bloque, posición) de las cuádruplas que la leen."""
+        uses = {}
+        for block in self.cfg:
+            for position, quad in enumerate(block.quads):
+                for name in reads(quad):
+                    if name in self.versions:
+                        uses.setdefault(name, []).append((block.index, position))
+        return uses
+
+    def liveness(self):
+        """
+        Nombres vivos a la entrada y a la salida de cada bloque, por índice. El argumento
+        de una phi se usa al final del predecesor de donde viene, no en el bloque de la phi.
+        """
+        blocks = self.cfg.blocks
+        upward = []  # Leídos antes de asignarse en el bloque
+        killed = []
+        phi_uses = [{} for _ in blocks]  # Predecesor -> nombres que sus phi leen por esa arista
+        for block in blocks:
+            read_first, assigned = set(), set()
+            for quad in block.quads:
+                if quad[1] == 'phi':
+                    for predecessor, value in quad[2]:
+                        if is_variable(value):
+                            phi_uses[block.index].setdefault(predecessor, set()).add(value)
+                elif quad[1] != 'exit':
+                    read_first.update(name for name in reads(quad) if name not in assigned)
+                name = defines(quad)
+                if name is not None:
+                    assigned.add(name)
+            upward.append(read_first)
+            killed.append(assigned)
+
+        live_in = [set(names) for names in upward]
+        live_out = [set() for _ in blocks]
+        pending = list(blocks)  # Se sacan del final: los últimos bloques primero
+        queued = [True] * len(blocks)
+        while pending:
+            block = pending.pop()
+            queued[block.index] = False
+            out = set()
+            for successor in block.successors:
+                out |= live_in[successor.index]
+                out |= phi_uses[successor.index].get(block.index, set())
+            live_out[block.index] = out
+            new_in = upward[block.index] | (out - killed[block.index])
+            if new_in != live_in[block.index]:
+                live_in[block.index] = new_in
+                for predecessor in block.predecessors:
+                    if not queued[predecessor.index]:
+                        queued[predecessor.index] = True
+                        pending.append(predecessor)
+        return live_in, live_out
+
+    def interference(self, live_out=None):
+        """
+        Pares de nombres de una misma variable que están vivos a la vez: nombre -> nombres
+        con los que se superpone (uno está vivo donde se define el otro).
+        """
+        if live_out is None:
+            live_out = self.liveness()[1]
+        edges = {}
+
+        def conflict(name, live):
+            for other in live.get(self.variable(name), ()):
+                if other != name:
+                    edges.setdefault(name, set()).add(other)
+                    edges.setdefault(other, set()).add(name)
+
+        for block in self.cfg:
+            live = {}  # Variable -> sus nombres vivos en este punto
+            for name in live_out[block.index]:
+                live.setdefault(self.variable(name), set()).add(name)
+            phi_results = []
+            for quad in reversed(block.quads):
+                name = defines(quad)
+                if quad[1] == 'phi':
+                    phi_results.append(name)
+                    continue
+                if name is not None:
+                    conflict(name, live)
+                    live.get(self.variable(name), set()).discard(name)
+                if quad[1] == 'exit':
+                    continue
+                for used in reads(quad):
+                    live.setdefault(self.variable(used), set()).add(used)
+            # Las phi de un bloque se asignan a la vez, al entrar
+            for name in phi_results:
+                live.setdefault(self.variable(name), set()).add(name)
+            for name in phi_results:
+                conflict(name, live)
+        return edges
+
+
+class SSABuilder:
+    """Construye la forma SSA de una lista de cuádruplas (ver to_ssa)."""
+
+    def __init__(self, quads):
+        self.cfg = ControlFlowGraph(list(quads))
+        self.versions = {}  # Versión -> variable
+        self.counters = {}  # Variable -> última versión
+        self.stacks = {}  # Variable -> versiones vigentes en el recorrido del árbol de dominadores
+        self.variables = []  # Variables (no temporales), que se observan en cada 'exit'
+        self.free = {}  # Función -> variables que puede leer, que se observan en cada 'use'
+        self.writes = {}  # Función -> variables que puede asignar, con una 'def' después de cada 'call'
+        self.phis = []
+        self.phi_results = []
+        self.phi_args = []
+        self.main = True  # Si se está renombrando el programa principal
+
+    def build(self):
+        cfg = self.cfg
+        blocks = cfg.blocks
+        reachable = [cfg.reachable(block.index) for block in blocks]
+
+        # Bloques que definen cada nombre (una llamada define lo que asigna la función), y
+        # nombres leídos en un bloque antes de definirse ahí
+        self.free, self.writes = self.function_effects()
+        defsites = {}
+        crossing = set()
+        for block in blocks:
+            if not reachable[block.index]:
+                continue
+            assigned = set()
+            for quad in block.quads:
+                crossing.update(name for name in reads(quad) if name not in assigned)
+                names = [defines(quad)]
+                if quad[1] == 'call':
+                    names += self.writes.get(quad[2], ())
+                for name in names:
+                    if name is not None:
+                        assigned.add(name)
+                        defsites.setdefault(name, set()).add(block.index)
+        for name in defsites:
+            self.stacks[name] = []
+        # Las variables también se leen en cada 'exit'
+        self.variables = [name for name in defsites if not TEMP_NAME.match(name)]
+        crossing.update(self.variables)
+
+        # Phi en la frontera de dominancia iterada de las definiciones
+        frontiers = cfg.dominance_frontiers()
+        self.phis = [[] for _ in blocks]  # Variables con phi en cada bloque
+        for name, sites in defsites.items():
+            if name not in crossing:
+                continue
+            placed = set()
+            pending = sorted(sites)
+            while pending:
+                for frontier in sorted(frontiers[pending.pop()]):
+                    if frontier not in placed:
+                        placed.add(frontier)
+                        self.phis[frontier].append(name)
+                        if frontier not in sites:
+                            pending.append(frontier)
+
+        # Renombrado: cada raíz del árbol de dominadores por separado
+        self.phi_results = [{} for _ in blocks]
+        self.phi_args = [{} for _ in blocks]  # Variable -> {predecesor: versión}
+        children = cfg.dominator_tree()
+        renamed = [None] * len(blocks)
+        for root in cfg.roots():
+            # En el programa principal una variable sin asignar no tiene valor; en una función
+            # vale lo que tenía en el programa que la llamó
+            self.main = root.index == 0
+            stack = [(root.index, None)]
+            while stack:
+                index, pushed = stack.pop()
+                if pushed is not None:
+                    for name in pushed:
+                        self.stacks[name].pop()
+                    continue
+                pushed = []
+                renamed[index] = self.rename_block(blocks[index], pushed)
+                stack.append((index, pushed))
+                stack.extend((child, None) for child in reversed(children[index]))
+
+        for block in blocks:
+            if renamed[block.index] is None:
+                continue  # Inalcanzable: queda igual
+            labels = block.quads[:len(block.labels)]
+            phis = [
+                (self.phi_results[block.index][name], 'phi',
+                 tuple((p.index, self.phi_args[block.index][name].get(p.index)) for p in block.predecessors),
+                 None)
+                for name in self.phis[block.index]
+            ]
+            block.quads = labels + phis + renamed[block.index]
+        return SSAForm(cfg, self.versions)
+
+    def new_version(self, name, pushed):
+        number = self.counters.get(name, 0) + 1
+        self.counters[name] = number
+        version = f"{name}{SEPARATOR}{number}"
+        self.versions[version] = name
+        self.stacks[name].append(version)
+        pushed.append(name)
+        return version
+
+    def current(self, name):
+        """Versión vigente de `name`; None si en el programa principal todavía no se asignó."""
+        stack = self.stacks.get(name)
+        if stack:
+            return stack[-1]
+        return None if self.main and stack is not None else name
+
+    def function_effects(self):
+        """
+        Variables que puede leer cada función y las que puede asignar, en su código o en el de
+        las que llama. Las de su 'frame' no cuentan como asignadas: la VM las restaura. Las
+        asignadas también cuentan como leídas: por un camino que no las asigna, la variable
+        sigue con el valor que tenía antes de la llamada.
+        """
+        direct, assigned, frames, callees = {}, {}, {}, {}
+        for entry in self.cfg.entries:
+            if entry.index == 0:
+                continue
+            names, written, frame, called = set(), set(), set(), set()
+            seen = {entry.index}
+            pending = [entry]
+            while pending:
+                block = pending.pop()
+                for quad in block.quads:
+                    names.update(name for name in reads(quad) if not TEMP_NAME.match(name))
+                    name = defines(quad)
+                    if name is not None and not TEMP_NAME.match(name):
+                        written.add(name)
+                    if quad[1] == 'call':
+                        called.add(quad[2])
+                    elif quad[1] == 'frame':
+                        frame.update(quad[2])
+                for successor in block.successors:
+                    if successor.index not in seen:
+                        seen.add(successor.index)
+                        pending.append(successor)
+            for label in entry.labels:
+                direct[label] = names
+                assigned[label] = written - frame
+                frames[label] = frame
+                callees[label] = called
+
+        changed = True
+        while changed:
+            changed = False
+            for label, names in direct.items():
+                for callee in callees[label]:
+                    missing = direct.get(callee, set()) - names
+                    if missing:
+                        names |= missing
+                        changed = True
+                    missing = assigned.get(callee, set()) - assigned[label] - frames[label]
+                    if missing:
+                        assigned[label] |= missing
+                        changed = True
+        return ({label: sorted(names | assigned[label]) for label, names in direct.items()},
+                {label: sorted(names) for label, names in assigned.items()})
+
+    def observe(self, op, names):
+        """Cuádrupla 'use' o 'exit' con las versiones vigentes de `names`."""
+        versions = tuple(self.stacks[name][-1] for name in names if self.stacks.get(name))
+        return (None, op, versions, None)
+
+    def rename_block(self, block, pushed):
+        """Cuádruplas del bloque (sin etiquetas) con sus nombres renombrados."""
+        for name in self.phis[block.index]:
+            self.phi_results[block.index][name] = self.new_version(name, pushed)
+
+        result = []
+        for quad in block.quads[len(block.labels):]:
+            dest, op, arg1, arg2 = quad
+            args = [arg1, arg2]
+            for position in operand_positions(quad):
+                name = args[position - 2]
+                if is_variable(name):
+                    args[position - 2] = self.current(name) or name
+            if op == 'call':
+                # Antes de los param: una copia entre ellos y el call dejaría su valor en la pila
+                start = len(result)
+                while start and result[start - 1][1] == 'param':
+                    start -= 1
+                result.insert(start, self.observe('use', self.free.get(arg1, ())))
+            elif self.main and op in ('return', 'halt'):
+                result.append(self.observe('exit', self.variables))
+            if defines(quad) is not None:
+                dest = self.new_version(dest, pushed)
+            result.append((dest, op, args[0], args[1]))
+            if op == 'call':
+                # Lo que la función asignó queda en el nombre de cada variable
+                result.extend((self.new_version(name, pushed), 'def', None, None)
+                              for name in self.writes.get(arg1, ()))
+        if self.main and not block.successors and (not result or result[-1][1] not in ('return', 'halt')):
+            result.append(self.observe('exit', self.variables))  # Fin del programa
+
+        for successor in block.successors:
+            for name in self.phis[successor.index]:
+                self.phi_args[successor.index].setdefault(name, {})[block.index] = self.current(name)
+        return result
+
+
+def to_ssa(quads):
+    """
+    Construye la forma SSA.
+
+    Args:
+        quads: Cuádruplas del CodeGenerator (o de un pase que conserve su formato)
+
+    Returns:
+        SSAForm: Grafo de flujo de control con las cuádruplas en forma SSA
+    """
+    return SSABuilder(quads).build()
+
+
+def from_ssa(ssa):
+    """
+    Vuelve de la forma SSA a cuádruplas comunes para CodeGeneratorob.
+
+    Args:
+        ssa: SSAForm de to_ssa (con los cambios de los pases que la usaron)
+
+    Returns:
+        list: Cuádruplas sin 'phi', 'use', 'def' ni 'exit'
+    """
+    cfg = ssa.cfg
+    live_out = ssa.liveness()[1]
+    interference = ssa.interference(live_out)
+
+    # Cada 'use' y cada 'def' (donde el programa lee o la llamada asigna la variable por su
+    # nombre) con los nombres que siguen vivos después
+    observations = []
+    for block in cfg:
+        if not any(quad[1] in ('use', 'def') for quad in block.quads):
+            continue
+        live = set(live_out[block.index])
+        for quad in reversed(block.quads):
+            if quad[1] == 'use':
+                observations.append((quad[2], set(live)))
+            elif quad[1] == 'def':
+                observations.append(((quad[0],), set(live)))
+            name = defines(quad)
+            if name is not None:
+                live.discard(name)
+            if quad[1] != 'exit':
+                live.update(reads(quad))
+    observed = {version for block in cfg for quad in block.quads if quad[1] in ('use', 'exit')
+                for version in quad[2]}
+    observed.update(quad[0] for block in cfg for quad in block.quads if quad[1] == 'def')
+
+    # Las versiones de cada variable que no se superponen vuelven a su nombre; primero las
+    # que se observan, que lo necesitan
+    by_variable = {}
+    for version, name in ssa.versions.items():
+        by_variable.setdefault(name, []).append(version)
+    groups = {}  # Variable -> versiones que vuelven a su nombre
+    for name, versions in by_variable.items():
+        group = groups[name] = {name}
+        for version in sorted(versions, key=lambda version: version not in observed):
+            if interference.get(version, set()).isdisjoint(group):
+                group.add(version)
+
+    # Una versión observada que no quedó con el nombre de su variable se copia a ese nombre
+    # en la 'use' (o desde ese nombre en la 'def'); las versiones del grupo que siguen vivas
+    # ahí salen del grupo
+    changed = True
+    while changed:
+        changed = False
+        for versions, live in observations:
+            for version in versions:
+                name = ssa.variable(version)
+                if version in groups[name]:
+                    continue
+                clobbered = (groups[name] & live) - {version}
+                if name in clobbered:
+                    raise ValueError(f"La versión '{version}' se superpone con el valor de '{name}' "
+                                     f"al entrar donde el programa usa '{name}' por su nombre")
+                if clobbered:
+                    groups[name] -= clobbered
+                    changed = True
+    names = {version: name for name, group in groups.items() for version in group}
+
+    def final(arg):
+        return names.get(arg, arg) if is_variable(arg) else arg
+
+    # Los nombres que quedan para las versiones de las variables de un 'frame' también son
+    # propios de la función
+    separated = {}
+    for version, name in ssa.versions.items():
+        if final(version) != name:
+            separated.setdefault(name, set()).add(final(version))
+
+    # Copias de cada phi por arista (predecesor, bloque)
+    edge_copies = {}
+    for block in cfg:
+        for quad in block.quads:
+            if quad[1] != 'phi':
+                continue
+            dest = final(quad[0])
+            for predecessor, value in quad[2]:
+                if value is not None and final(value) != dest:
+                    edge_copies.setdefault((predecessor, block.index), []).append((dest, final(value)))
+
+    copies = [0]
+
+    def fresh(src):
+        copies[0] += 1
+        return f"{src}{SEPARATOR}c{copies[0]}"
+
+    result = []
+    split = []  # Bloques nuevos para las aristas de salto de un if_false
+    for block in cfg:
+        body = []
+        for dest, op, arg1, arg2 in block.quads:
+            if op in ('use', 'exit'):
+                body += [(ssa.variable(version), '=', final(version), None)
+                         for version in arg1 if final(version) != ssa.variable(version)]
+            elif op == 'def':
+                if final(dest) != ssa.variable(dest):
+                    body.append((final(dest), '=', ssa.variable(dest), None))
+            elif op == 'frame':
+                extra = sorted(set().union(*(separated.get(name, ()) for name in arg1)) - set(arg1))
+                body.append((dest, op, arg1 + tuple(extra), arg2))
+            elif op != 'phi':
+                body.append((final(dest), op, final(arg1), final(arg2)))
+        after = []
+        for successor in block.successors:
+            moves = edge_copies.get((block.index, successor.index))
+            if not moves:
+                continue
+            moves = sequentialize(moves, fresh)
+            last = body[-1]
+            if last[1] == 'if_false':
+                if block.jump_target is successor:
+                    label = f"{successor.labels[0]}{SEPARATOR}{block.index}"
+                    split += [(label, 'label', None, None)] + moves + [(None, 'goto', successor.labels[0], None)]
+                    body[-1] = (None, 'if_false', last[2], label)
+                if block.fallthrough is successor:
+                    after += moves
+            elif last[1] == 'goto':
+                body[-1:] = moves + [last]
+            else:
+                body += moves
+        result += body
+        result += after
+
+    if split:
+        if result and result[-1][1] not in UNCONDITIONAL:
+            result.append((None, 'halt', None, None))
+        result += split
+    return result
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Numeración de valores del código intermedio (eliminación de subexpresiones comunes)
+
+Una operación sin efectos (aritmética, comparación, '!' o cast) que repite una ya calculada
+con los mismos operandos se quita, y sus usos leen el temporal que la calculó primero:
+
+    int a = x * y + 1; int b = x * y - 2;    ->    un solo (t1, *, x, y)
+
+Trabaja sobre la forma SSA: cada asignación a una variable es una versión nueva, así que una
+operación sobre `x` deja de coincidir con las anteriores en cuanto `x` se reasigna, sin llevar
+la cuenta de qué variables lee cada operación. La tabla de operaciones calculadas se recorre
+por el árbol de dominadores: lo que calculó un bloque vale en todos los que domina (el mismo
+bloque, lo que sigue a un if, el cuerpo de un while) y se olvida al salir de ellos. Las copias
+cuentan como el mismo valor: después de `c = x`, `c * y` es `x * y`.
+"""
+
+from src.generador.optimizer import TEMP_NAME, PURE_OPS, operand_positions
+from src.generador.ssa import to_ssa, from_ssa, variable_of
+from src.sintactico.ast_nodes import is_variable
+
+# Operaciones en las que el orden de los operandos no cambia el resultado ('+' también
+# concatena strings)
+COMMUTATIVE = {'*', '==', '!='}
+
+
+class ValueNumbering:
+    """
+    Numeración de valores sobre una SSAForm. Cuenta en `reused` las operaciones que se
+    reemplazaron por un valor ya calculado.
+    """
+
+    def __init__(self):
+        self.reused = 0
+
+    def run(self, ssa):
+        """
+        Quita las operaciones repetidas de los bloques de `ssa` (la modifica).
+
+        Args:
+            ssa: SSAForm de to_ssa
+
+        Returns:
+            SSAForm: La misma forma SSA
+        """
+        cfg = ssa.cfg
+        children = cfg.dominator_tree()
+        values = {}  # Nombre -> valor que tiene (el nombre que lo calculó primero, o un literal)
+        replaced = {}  # Temporal quitado -> temporal con su valor
+        table = {}  # (op, valor, valor) -> nombre con el resultado, en el camino del árbol
+
+        for root in cfg.roots():
+            stack = [(root.index, None)]
+            while stack:
+                index, added = stack.pop()
+                if added is not None:
+                    for key, previous in reversed(added):
+                        if previous is None:
+                            del table[key]
+                        else:
+                            table[key] = previous
+                    continue
+                added = []
+                self.number_block(cfg.blocks[index], values, replaced, table, added)
+                stack.append((index, added))
+                stack.extend((child, None) for child in reversed(children[index]))
+
+        # Los usos de los temporales quitados leen el que quedó (también en las phi)
+        if replaced:
+            for block in cfg:
+                block.quads = [self.rewrite(quad, replaced) for quad in block.quads]
+        return ssa
+
+    @staticmethod
+    def value(arg, values):
+        """Valor de un operando: el de su nombre, o el literal con su tipo (1, 1.0 y True difieren)."""
+        if is_variable(arg):
+            return values.get(arg, arg)
+        return (type(arg).__name__, arg)
+
+    def number_block(self, block, values, replaced, table, added):
+        kept = []
+        for quad in block.quads:
+            dest, op, arg1, arg2 = quad
+            if op == '=' and dest is not None:
+                values[dest] = self.value(arg1, values)
+            elif op in PURE_OPS:
+                key = (op, self.value(arg1, values), self.value(arg2, values) if arg2 is not None else None)
+                if op in COMMUTATIVE and repr(key[2]) < repr(key[1]):
+                    key = (op, key[2], key[1])
+                holder = table.get(key)
+                if holder is None:
+                    added.append((key, None))
+                    table[key] = dest
+                else:
+                    self.reused += 1
+                    values[dest] = holder
+                    if TEMP_NAME.match(variable_of(dest)):
+                        replaced[dest] = holder
+                        continue
+                    quad = (dest, '=', holder, None)
+            kept.append(quad)
+        block.quads = kept
+
+    @staticmethod
+    def rewrite(quad, replaced):
+        dest, op, arg1, arg2 = quad
+        if op == 'phi':
+            return (dest, op, tuple((predecessor, replaced.get(value, value) if is_variable(value) else value)
+                                    for predecessor, value in arg1), arg2)
+        args = [arg1, arg2]
+        for position in operand_positions(quad):
+            if is_variable(args[position - 2]):
+                args[position - 2] = replaced.get(args[position - 2], args[position - 2])
+        return (dest, op, args[0], args[1])
+
+
+def number_values(quads):
+    """
+    Función principal para eliminar subexpresiones comunes.
+
+    Args:
+        quads: Lista de cuádruplas del CodeGenerator
+
+    Returns:
+        list: Lista de cuádruplas sin las operaciones repetidas
+    """
+    return from_ssa(ValueNumbering().run(to_ssa(quads)))
@@ -0,0 +1,93 @@
+"""
+Análisis léxico incremental para códigos fuente editados.
+
+relex() recibe el TokenStream del código anterior y una edición (desplazamiento, cantidad
+de caracteres borrados y texto insertado) y solo vuelve a recorrer la zona dañada: empieza
+en el último token que la edición no puede alterar y se detiene en cuanto un token nuevo
+empieza, pasada la edición, en el mismo lugar que un token del flujo anterior. Desde ahí el
+texto es el mismo y el lexer no guarda estado entre tokens, así que el resto del flujo es
+el anterior corrido en desplazamiento y líneas; ese corrimiento queda pendiente en el
+TokenStream (ver TokenStream.splice) en vez de recorrer la cola.
+"""
+
+from bisect import bisect_left
+
+from .lexer import TokenStream, master_regex, group_kinds, kind_codes, keywords, skipped_kinds, multiline_kinds
+
+# Caracteres que un patrón puede mirar más allá del fin de su token: el siguiente carácter
+# (para saber dónde termina un identificador, número o espacio) y uno más en un número
+# como '3.x', donde `\d+\.\d+` revisa lo que sigue al punto antes de quedarse con '3'.
+LOOKAHEAD = 2
+
+
+def relex(tokens, offset, deleted, inserted):
+    """
+    Aplica una edición al código de `tokens` (borra `deleted` caracteres desde `offset` e
+    inserta `inserted`) y devuelve el TokenStream del código nuevo, igual al que daría
+    lexer() sobre el código completo (o el mismo error léxico). El trabajo depende del
+    tamaño de la zona que cambia, no del largo del archivo.
+    """
+    source_code = tokens.source_code
+    new_source = source_code[:offset] + inserted + source_code[offset + deleted:]
+    offset_delta = len(inserted) - deleted
+    edit_end = offset + len(inserted)  # Fin de la edición en el código nuevo
+    count = len(tokens)
+
+    # Primer token que la edición puede alterar: los anteriores terminan al menos
+    # LOOKAHEAD caracteres antes y su recorrido no llegó a ver el texto editado
+    first = bisect_left(range(count), offset - LOOKAHEAD + 1, key=tokens.end)
+    if first:
+        position = tokens.end(first - 1)
+        line = tokens.line(first - 1) + source_code.count('\n', tokens.start(first - 1), position)
+    else:
+        position = 0
+        line = 1
+
+    middle = TokenStream(new_source)
+    kinds_append = middle.kinds.append
+    starts_append = middle.starts.append
+    ends_append = middle.ends.append
+    lines_append = middle.lines.append
+    match_at = master_regex.match
+    identifier_kind = kind_codes['IDENTIFIER']
+    keyword_kind = kind_codes['KEYWORD']
+    end = len(new_source)
+    old_index = first  # Primer token anterior que todavía puede sincronizar
+    line_delta = 0
+
+    while position < end:
+        # Pasada la edición, si un token anterior empieza en el mismo lugar, el resto coincide
+        if position >= edit_end:
+            old_position = position - offset_delta
+            while old_index < count and tokens.start(old_index) < old_position:
+                old_index += 1
+            if old_index < count and tokens.start(old_index) == old_position:
+                line_delta = line - tokens.line(old_index)
+                break
+
+        match = match_at(new_source, position)
+
+        if not match:
+            char_error = new_source[position]
+            line, col = middle.line_index.position(position)
+            raise SyntaxError(f"Token no reconocido '{char_error}' en línea {line}, columna {col}")
+
+        kind = group_kinds[match.lastindex]
+        token_end = match.end()
+
+        if kind not in skipped_kinds:
+            if kind == identifier_kind and new_source[position:token_end] in keywords:
+                kind = keyword_kind
+            kinds_append(kind)
+            starts_append(position)
+            ends_append(token_end)
+            lines_append(line)
+
+        if kind in multiline_kinds:
+            line += new_source.count('\n', position, token_end)
+
+        position = token_end
+    else:
+        old_index = count  # Se llegó al final sin sincronizar: no queda cola del flujo anterior
+
+    return tokens.splice(first, old_index, middle, offset_delta, line_delta)
@@ -1,3 +1,8 @@
+from array import array  # Arreglos compactos para el flujo de tokens
+from bisect import bisect_right  # Búsqueda binaria sobre la tabla de inicios de línea
+from itertools import repeat
+from operator import add
+import mmap  # Archivos mapeados en memoria para lexer_file
 import re  # Importamos la librería de expresiones regulares para facilitar la búsqueda de patrones en el código fuente
 
 # Palabras clave
@@ -30,57 +35,504 @@ token_definitions = [
 # Compilamos todas las expresiones regulares para cada tipo de token
 token_regex_compiled = [(ttype, re.compile(pattern)) for ttype, pattern in token_definitions]
 
+# Patrón maestro: une todas las definiciones en una sola alternancia con grupos con nombre.
+# La alternancia de `re` se prueba en orden, así que la prioridad es la misma que la de
+# recorrer token_regex_compiled uno por uno, pero con un único `match` por token.
+master_regex = re.compile('|'.join(f'(?P<{ttype}>{pattern})' for ttype, pattern in token_definitions))
+
+# Códigos enteros de los tipos de token: el código es la posición en esta tupla.
+# 'KEYWORD' no tiene patrón propio; sale de un IDENTIFIER que está en `keywords`.
+token_kinds = tuple(ttype for ttype, _ in token_definitions) + ('KEYWORD',)
+kind_codes = {ttype: code for code, ttype in enumerate(token_kinds)}
+
+# Código de tipo por número de grupo del patrón maestro (se indexa con match.lastindex)
+group_kinds = [None] * (master_regex.groups + 1)
+for _ttype, _group in master_regex.groupindex.items():
+    group_kinds[_group] = kind_codes[_ttype]
+
+# Tokens que no llegan a la lista final
+skipped_tokens = frozenset(('WHITESPACE', 'COMMENT'))
+skipped_kinds = frozenset(kind_codes[ttype] for ttype in skipped_tokens)
+
+# Únicos tipos de token que pueden contener saltos de línea
+multiline_kinds = frozenset(kind_codes[ttype] for ttype in ('WHITESPACE', 'STRING', 'CHAR'))
+
+
+class LineIndex:
+    """
+    Tabla de inicios de línea de un código fuente.
+    Se construye una sola vez, la primera vez que alguien necesita una posición
+    (un diagnóstico o la vista de depuración), y traduce desplazamientos a
+    (línea, columna) con búsqueda binaria.
+    """
+
+    def __init__(self, source_code):
+        self.source_code = source_code
+        self._line_starts = None
+
+    def line_starts(self):
+        """Devuelve (y construye si hace falta) la lista de desplazamientos donde empieza cada línea."""
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in re.finditer('\n', self.source_code)]
+        return self._line_starts
+
+    def position(self, offset):
+        """Convierte un desplazamiento en el código fuente a (línea, columna), ambas desde 1."""
+        starts = self.line_starts()
+        line = bisect_right(starts, offset)
+        return line, offset - starts[line - 1] + 1
+
+
+class TokenStream:
+    """
+    Flujo de tokens como estructura de arreglos: por cada token guarda su código de tipo
+    (array 'B'), sus desplazamientos de inicio y fin en el código fuente (array 'q') y su
+    línea (array 'i'). El valor de un token no se guarda: se corta del código fuente solo
+    cuando alguien lo pide.
+
+    Para los consumidores existentes, indexar o recorrer el flujo devuelve la vista
+    compatible (tipo, valor, desplazamiento), y with_positions() genera las tuplas
+    (tipo, valor, línea, columna).
+
+    Un flujo producido por splice() (ver relex) puede tener corrimientos pendientes: sus
+    arreglos de posiciones se corrigen la primera vez que alguien los lee, y hasta entonces
+    start(i), end(i) y line(i) dan las posiciones correctas sin tocar los arreglos.
+    """
+
+    def __init__(self, source_code, line_index=None):
+        self.source_code = source_code
+        self.line_index = line_index if line_index is not None else LineIndex(source_code)
+        self.kinds = array('B')
+        self._starts = array('q')
+        self._ends = array('q')
+        self._lines = array('i')
+        # Corrimientos pendientes (índice, delta de desplazamiento, delta de línea): cada uno
+        # se suma a todos los tokens desde su índice en adelante
+        self._shifts = []
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def starts(self):
+        if self._shifts:
+            self._apply_shifts()
+        return self._starts
+
+    @property
+    def ends(self):
+        if self._shifts:
+            self._apply_shifts()
+        return self._ends
+
+    @property
+    def lines(self):
+        if self._shifts:
+            self._apply_shifts()
+        return self._lines
+
+    def _apply_shifts(self):
+        """Aplica los corrimientos pendientes a los arreglos de posiciones, tramo por tramo."""
+        shifts = self._shifts
+        bounds = [index for index, _, _ in shifts[1:]] + [len(self.kinds)]
+        offset_delta = line_delta = 0
+        for (index, offset_step, line_step), stop in zip(shifts, bounds):
+            offset_delta += offset_step
+            line_delta += line_step
+            if offset_delta:
+                for positions in (self._starts, self._ends):
+                    positions[index:stop] = array('q', map(add, positions[index:stop], repeat(offset_delta)))
+            if line_delta:
+                self._lines[index:stop] = array('i', map(add, self._lines[index:stop], repeat(line_delta)))
+        self._shifts = []
+
+    def shift_at(self, i):
+        """(delta de desplazamiento, delta de línea) pendientes para el token i."""
+        offset_delta = line_delta = 0
+        for index, offset_step, line_step in self._shifts:
+            if index > i:
+                break
+            offset_delta += offset_step
+            line_delta += line_step
+        return offset_delta, line_delta
+
+    def start(self, i):
+        """Desplazamiento de inicio del token i, sin aplicar los corrimientos pendientes."""
+        return self._starts[i] + self.shift_at(i)[0]
+
+    def end(self, i):
+        """Desplazamiento de fin del token i, sin aplicar los corrimientos pendientes."""
+        return self._ends[i] + self.shift_at(i)[0]
+
+    def line(self, i):
+        """Línea del token i, sin aplicar los corrimientos pendientes."""
+        return self._lines[i] + self.shift_at(i)[1]
+
+    def append(self, kind, start, end, line):
+        """Agrega un token al final del flujo."""
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+
+    def type(self, i):
+        """Nombre del tipo del token i."""
+        return token_kinds[self.kinds[i]]
+
+    def text(self, start, end):
+        """Texto del código fuente entre dos desplazamientos."""
+        return self.source_code[start:end]
+
+    def value(self, i):
+        """Texto del token i, cortado del código fuente en este momento."""
+        return self.text(self.starts[i], self.ends[i])
+
+    def token_position(self, i):
+        """(línea, columna) del token i; la columna se calcula a partir de su línea."""
+        line = self.lines[i]
+        return line, self.starts[i] - self.line_index.line_starts()[line - 1] + 1
+
+    def position(self, token):
+        """(línea, columna) de un token de la vista compatible."""
+        return self.line_index.position(token[2])
+
+    # --- Vista compatible ---
+
+    def __getitem__(self, i):
+        kind = self.kinds[i]
+        if self._shifts:
+            # Con corrimientos pendientes se corrige solo este token (ver start y end)
+            if i < 0:
+                i += len(self.kinds)
+            start, end = self.start(i), self.end(i)
+        else:
+            start, end = self.starts[i], self.ends[i]
+        return (token_kinds[kind], self.text(start, end), start)
+
+    def __iter__(self):
+        text = self.text
+        for kind, start, end in zip(self.kinds, self.starts, self.ends):
+            yield (token_kinds[kind], text(start, end), start)
+
+    def copy(self):
+        """Lista de tuplas (tipo, valor, desplazamiento) con los valores ya materializados."""
+        return list(self)
+
+    def with_positions(self):
+        """Vista compatible: genera las tuplas (tipo, valor, línea, columna)."""
+        for i, (token_type, token_value, _) in enumerate(self):
+            yield (token_type, token_value, *self.token_position(i))
+
+    def splice(self, start, stop, middle, offset_delta, line_delta):
+        """
+        Nuevo flujo sobre el código de `middle`: los tokens [0, start) de este flujo, luego los
+        de `middle` (con posiciones ya absolutas) y después los tokens [stop, len) de este
+        flujo corridos offset_delta caracteres y line_delta líneas. El corrimiento queda
+        pendiente en vez de recorrer la cola token por token.
+        """
+        spliced = TokenStream(middle.source_code, middle.line_index)
+        spliced.kinds = self.kinds[:start] + middle.kinds + self.kinds[stop:]
+        spliced._starts = self._starts[:start] + middle.starts + self._starts[stop:]
+        spliced._ends = self._ends[:start] + middle.ends + self._ends[stop:]
+        spliced._lines = self._lines[:start] + middle.lines + self._lines[stop:]
+
+        # Los corrimientos anteriores a `start` siguen valiendo para todo lo que viene después,
+        # así que se compensan en el tramo de `middle` y se restituyen (con los del tramo
+        # reemplazado y el de la edición) al comenzar la cola.
+        shifts = [shift for shift in self._shifts if shift[0] < start]
+        before_offset, before_line = self.shift_at(start - 1) if start else (0, 0)
+        if before_offset or before_line:
+            shifts.append((start, -before_offset, -before_line))
+        tail = start + len(middle)
+        if stop < len(self):
+            tail_offset, tail_line = self.shift_at(stop - 1) if stop else (0, 0)
+            shifts.append((tail, tail_offset + offset_delta, tail_line + line_delta))
+            gap = tail - stop
+            shifts.extend((index + gap, offset_step, line_step)
+                          for index, offset_step, line_step in self._shifts if index >= stop)
+        spliced._shifts = [shift for shift in shifts if shift[1] or shift[2]]
+        return spliced
+
+
 def lexer(source_code):
     """
-    Función principal que convierte el código fuente en una lista de tokens.
-    La función recorre el código, encuentra coincidencias con las expresiones regulares definidas 
-    y las convierte en tokens. También maneja la información de las líneas y columnas.
-    """
-    position = 0  # Índice actual del código fuente
-    found_tokens = []  # Lista de tokens encontrados
-    line = 1  # Número de la línea actual
-    col = 1  # Columna actual
-
-    # Mientras no lleguemos al final del código
-    while position < len(source_code):
-        match = None  # Variable para almacenar la coincidencia con el patrón
-
-        # Intentamos hacer coincidir cada uno de los patrones definidos en token_definitions
-        for token_type, regex in token_regex_compiled:
-            match = regex.match(source_code, position)
-            if match:
-                # Si encontramos una coincidencia, obtenemos el valor del token
-                token_value = match.group(0)
-                start_line = line  # Línea en la que comienza el token
-                start_col = col  # Columna en la que comienza el token
-
-                # Actualizamos las líneas y columnas en caso de que el token ocupe varias líneas
-                lines = token_value.split('\n')
-                if len(lines) > 1:
-                    line += len(lines) - 1
-                    col = len(lines[-1]) + 1
-                else:
-                    col += len(token_value)
+    Función principal que convierte el código fuente en un flujo de tokens.
+    La función recorre el código con el patrón maestro, usa el grupo que coincidió
+    para saber el tipo de token y lo agrega al TokenStream como (código de tipo,
+    inicio, fin, línea). Las columnas no se calculan aquí: el TokenStream las obtiene
+    bajo demanda con su LineIndex.
+    """
+    found_tokens = TokenStream(source_code)  # Flujo de tokens encontrados
+    lex_range(found_tokens, source_code, 0, len(source_code), 1)
+    return found_tokens  # Devuelve el flujo de tokens encontrados
 
-                # Ignoramos los espacios y los comentarios
-                if token_type not in ('WHITESPACE', 'COMMENT'):
-                    # Si el token es un identificador y se encuentra en las palabras clave, lo cambiamos a 'KEYWORD'
-                    if token_type == 'IDENTIFIER' and token_value in keywords:
-                        token_type = 'KEYWORD'
-                    # Añadimos el token a la lista de tokens encontrados
-                    found_tokens.append((token_type, token_value, start_line, start_col))
+def lex_range(found_tokens, source_code, position, end, line):
+    """
+    Recorre source_code[position:end], que comienza en la línea `line`, y agrega sus tokens
+    a found_tokens con desplazamientos y líneas absolutos. Ningún token pasa de `end`.
+    """
+    kinds_append = found_tokens.kinds.append
+    starts_append = found_tokens.starts.append
+    ends_append = found_tokens.ends.append
+    lines_append = found_tokens.lines.append
+    match_at = master_regex.match  # Evita la búsqueda del atributo en cada iteración
+    identifier_kind = kind_codes['IDENTIFIER']
+    keyword_kind = kind_codes['KEYWORD']
 
-                # Avanzamos la posición del código fuente hasta donde termina la coincidencia
-                position = match.end()
-                break  # Salimos del ciclo de intentos de coincidencia, ya que encontramos un token válido
+    # Mientras no lleguemos al final del rango
+    while position < end:
+        match = match_at(source_code, position, end)
 
         # Si no encontramos ninguna coincidencia, significa que tenemos un error en el código
         if not match:
             char_error = source_code[position]  # Obtenemos el carácter donde ocurrió el error
+            line, col = found_tokens.line_index.position(position)
             raise SyntaxError(f"Token no reconocido '{char_error}' en línea {line}, columna {col}")  # Lanza un error
 
-    return found_tokens  # Devuelve la lista de tokens encontrados
+        kind = group_kinds[match.lastindex]  # Código del tipo de token que coincidió
+        token_end = match.end()
+
+        # Ignoramos los espacios y los comentarios
+        if kind not in skipped_kinds:
+            # Si el token es un identificador y se encuentra en las palabras clave, lo cambiamos a 'KEYWORD'
+            if kind == identifier_kind and source_code[position:token_end] in keywords:
+                kind = keyword_kind
+            # Añadimos el token al flujo
+            kinds_append(kind)
+            starts_append(position)
+            ends_append(token_end)
+            lines_append(line)
+
+        # Solo los espacios, cadenas y caracteres pueden ocupar varias líneas
+        if kind in multiline_kinds:
+            line += source_code.count('\n', position, token_end)
+
+        # Avanzamos la posición del código fuente hasta donde termina la coincidencia
+        position = token_end
+
+    return line
+
+# Versiones en bytes de token_definitions, para recorrer un archivo mapeado sin decodificarlo.
+# En bytes, \s, \w y \d solo reconocen ASCII: un byte no ASCII fuera de una cadena o
+# comentario no coincide con nada y lexer_file vuelve al lexer de texto (ver más abajo).
+master_regex_bytes = re.compile(b'|'.join(
+    b'(?P<' + ttype.encode() + b'>' + pattern.encode() + b')' for ttype, pattern in token_definitions
+))
+keywords_bytes = frozenset(keyword.encode() for keyword in keywords)
+
+
+class BytesLineIndex(LineIndex):
+    """
+    Índice de líneas sobre un código fuente en bytes UTF-8. Los desplazamientos son de
+    bytes; la columna se cuenta en caracteres decodificando solo el inicio de la línea.
+    """
+
+    def line_starts(self):
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in re.finditer(b'\n', self.source_code)]
+        return self._line_starts
+
+    def position(self, offset):
+        starts = self.line_starts()
+        line = bisect_right(starts, offset)
+        line_start = starts[line - 1]
+        return line, len(self.source_code[line_start:offset].decode('utf-8')) + 1
+
+
+class MappedTokenStream(TokenStream):
+    """
+    TokenStream sobre un archivo mapeado en memoria (mmap). Los desplazamientos son de
+    bytes y los valores se decodifican de UTF-8 solo cuando alguien los pide.
+    """
+
+    def __init__(self, source_code, mapping=None):
+        super().__init__(source_code, BytesLineIndex(source_code))
+        self.mapping = mapping  # mmap que respalda source_code (None si el archivo está vacío)
+
+    def text(self, start, end):
+        return self.source_code[start:end].decode('utf-8')
+
+    def token_position(self, i):
+        return self.line_index.position(self.starts[i])
+
+    def close(self):
+        """Libera el mapeo del archivo; los tokens ya no pueden materializarse después."""
+        if self.mapping is not None:
+            self.source_code = b''
+            self.mapping.close()
+            self.mapping = None
+
+
+def lexer_file(path):
+    """
+    Entrada del lexer para archivos grandes: mapea el archivo con mmap y recorre los bytes
+    directamente con las versiones en bytes de token_definitions, sin copiar el archivo a un
+    str ni decodificarlo. Devuelve un MappedTokenStream (mismos tipos y posiciones que lexer())
+    cuyos identificadores y literales se decodifican solo cuando se pide su valor.
+
+    Si el archivo tiene caracteres no ASCII fuera de cadenas y comentarios (que el patrón en
+    bytes no reconoce), se decodifica y se usa lexer() para dar exactamente el mismo
+    resultado o el mismo error.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Un archivo vacío no se puede mapear
+            return MappedTokenStream(b'')
+
+    found_tokens = MappedTokenStream(mapping, mapping)
+    kinds_append = found_tokens.kinds.append
+    starts_append = found_tokens.starts.append
+    ends_append = found_tokens.ends.append
+    lines_append = found_tokens.lines.append
+    match_at = master_regex_bytes.match
+    identifier_kind = kind_codes['IDENTIFIER']
+    keyword_kind = kind_codes['KEYWORD']
+    position = 0
+    line = 1
+    end = len(mapping)
+
+    while position < end:
+        match = match_at(mapping, position)
+
+        if not match:
+            # Byte no ASCII o error léxico: el lexer de texto da el resultado exacto
+            found_tokens.close()
+            with open(path, encoding='utf-8') as f:
+                return lexer(f.read())
+
+        kind = group_kinds[match.lastindex]
+        token_end = match.end()
+
+        if kind not in skipped_kinds:
+            if kind == identifier_kind and mapping[position:token_end] in keywords_bytes:
+                kind = keyword_kind
+            kinds_append(kind)
+            starts_append(position)
+            ends_append(token_end)
+            lines_append(line)
+
+        if kind in multiline_kinds:
+            line += match.group().count(b'\n')
+
+        position = token_end
+
+    return found_tokens
+
+
+class StreamLineIndex(LineIndex):
+    """
+    Índice de líneas para código que se lee por bloques: no guarda el texto, solo los
+    inicios de línea (un entero de 8 bytes por línea) a medida que llegan los bloques.
+    """
+
+    def __init__(self):
+        super().__init__(None)
+        self._line_starts = array('q', [0])
+
+    def add_text(self, text, base):
+        """Registra los saltos de línea de `text`, que comienza en el desplazamiento `base`."""
+        starts = self._line_starts
+        for m in re.finditer('\n', text):
+            starts.append(base + m.end())
+
+
+# Tamaño por defecto de los bloques que lee iter_tokens
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class TokenReader:
+    """
+    Iterador perezoso de tokens (tipo, valor, desplazamiento) sobre un archivo leído por
+    bloques. Solo mantiene en memoria el bloque actual y la parte de token que quedó
+    pendiente al final del bloque anterior.
+
+    Un token que termina en el último carácter del bloque (o en el penúltimo, por
+    números como '3.' + '14') puede continuar en el siguiente, así que se deja
+    pendiente hasta leer más: eso cubre identificadores, números, espacios, comentarios
+    y operadores de dos caracteres como '<='. Una cadena o carácter sin cerrar no
+    coincide con ningún patrón; si empieza con comillas también se espera al siguiente
+    bloque antes de reportar el error.
+    """
+
+    def __init__(self, fileobj, chunk_size=DEFAULT_CHUNK_SIZE, on_token=None):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.on_token = on_token  # Se llama con (tipo, valor, línea, columna) por cada token producido
+        self.line_index = StreamLineIndex()
+        self._tokens = self._scan()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._tokens)
+
+    def _scan(self):
+        read = self.fileobj.read
+        chunk_size = self.chunk_size
+        line_index = self.line_index
+        on_token = self.on_token
+        match_at = master_regex.match
+        identifier_kind = kind_codes['IDENTIFIER']
+        buffer = ''  # Texto pendiente más el último bloque leído
+        base = 0  # Desplazamiento absoluto de buffer[0] en el código fuente
+        position = 0  # Índice actual dentro de buffer
+        eof = False
+
+        while True:
+            if not eof:
+                chunk = read(chunk_size)
+                if chunk:
+                    buffer = buffer[position:] + chunk
+                    base += position
+                    position = 0
+                    line_index.add_text(chunk, base + len(buffer) - len(chunk))
+                else:
+                    eof = True
+
+            end = len(buffer)
+            while position < end:
+                match = match_at(buffer, position)
+
+                if not match:
+                    # Una cadena o carácter puede cerrarse en el siguiente bloque
+                    if not eof and buffer[position] in '"\'':
+                        break
+                    line, col = line_index.position(base + position)
+                    raise SyntaxError(f"Token no reconocido '{buffer[position]}' en línea {line}, columna {col}")
+
+                token_end = match.end()
+                # El token puede continuar en el siguiente bloque
+                if not eof and token_end >= end - 1:
+                    break
+
+                kind = group_kinds[match.lastindex]
+                if kind not in skipped_kinds:
+                    token_value = match.group()
+                    if kind == identifier_kind and token_value in keywords:
+                        kind = kind_codes['KEYWORD']
+                    token = (token_kinds[kind], token_value, base + position)
+                    if on_token is not None:
+                        on_token((token[0], token_value, *line_index.position(token[2])))
+                    yield token
+
+                position = token_end
+
+            if eof:
+                return
+
+
+def iter_tokens(fileobj, chunk_size=DEFAULT_CHUNK_SIZE, on_token=None):
+    """
+    Modo por flujo del lexer: lee `fileobj` en bloques de `chunk_size` caracteres y
+    genera los mismos tokens (tipo, valor, desplazamiento) que lexer(), sin cargar el
+    programa completo en memoria. El TokenReader devuelto tiene un `line_index` para
+    que el analizador sintáctico pueda reportar líneas y columnas.
+    """
+    return TokenReader(fileobj, chunk_size, on_token)
 
-code_line = 'bool activo = !false;'
-tokens = lexer(code_line)  # la función que usas para tokenizar
-print(tokens)
\ No newline at end of file
+if __name__ == "__main__":
+    code_line = 'bool activo = !false;'
+    tokens = lexer(code_line)  # la función que usas para tokenizar
+    print(list(tokens.with_positions()))
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Análisis léxico en paralelo para códigos fuente grandes.
+
+El código se parte en saltos de línea seguros (que no caen dentro de una cadena "..."
+ni de un carácter 'c', los únicos tokens que pueden contener un salto de línea sin ser
+espacio en blanco), cada trozo se lexea en un proceso de un ProcessPoolExecutor y los
+arreglos resultantes se concatenan. Como cada trozo se recorre con lex_range sobre el
+mismo código fuente, los desplazamientos y líneas ya salen absolutos y el resultado es
+idéntico al de lexer().
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from .lexer import TokenStream, lexer, lex_range, token_definitions
+
+# Por debajo de este tamaño (en caracteres) crear procesos cuesta más que lexear
+MIN_PARALLEL_SIZE = 1 << 20
+
+# Trozos por proceso: más de uno reparte mejor la carga si los trozos no cuestan lo mismo
+CHUNKS_PER_WORKER = 2
+
+# Cadenas, caracteres y comentarios en el mismo orden de prioridad que en token_definitions.
+# Los comentarios se incluyen para que unas comillas dentro de un comentario no abran una cadena.
+literal_regex = re.compile('|'.join(
+    pattern for ttype, pattern in token_definitions if ttype in ('STRING', 'CHAR', 'COMMENT')
+))
+
+# Código fuente del proceso trabajador (se hereda al crear el proceso, no viaja en cada tarea)
+_worker_source = None
+
+
+def _init_worker(source_code):
+    global _worker_source
+    _worker_source = source_code
+
+
+def _lex_chunk(bounds):
+    """Lexea un trozo en el proceso trabajador y devuelve sus arreglos en bytes (None si hay error)."""
+    start, end, line = bounds
+    chunk_tokens = TokenStream(_worker_source)
+    try:
+        lex_range(chunk_tokens, _worker_source, start, end, line)
+    except SyntaxError:
+        return None
+    return (chunk_tokens.kinds.tobytes(), chunk_tokens.starts.tobytes(),
+            chunk_tokens.ends.tobytes(), chunk_tokens.lines.tobytes())
+
+
+def split_points(source_code, parts):
+    """
+    Devuelve hasta parts - 1 desplazamientos crecientes donde se puede partir el código:
+    cada uno está justo después de un salto de línea que no pertenece a una cadena ni a
+    un carácter.
+    """
+    size = len(source_code)
+    points = []
+    literals = literal_regex.finditer(source_code)
+    literal = next(literals, None)
+
+    for k in range(1, parts):
+        target = max(size * k // parts, points[-1] if points else 0)
+        cut = source_code.find('\n', target)
+        while cut != -1:
+            # Avanzamos hasta el primer literal que termina después del salto de línea
+            while literal is not None and literal.end() <= cut:
+                literal = next(literals, None)
+            if literal is None or literal.start() > cut:
+                break
+            # El salto de línea está dentro del literal: probamos el siguiente después de él
+            cut = source_code.find('\n', literal.end())
+        if cut == -1:
+            break
+        if not points or cut + 1 > points[-1]:
+            points.append(cut + 1)
+
+    return points
+
+
+def parallel_lexer(source_code, workers=None, min_size=MIN_PARALLEL_SIZE):
+    """
+    Versión paralela de lexer(): devuelve un TokenStream idéntico (mismos códigos, desplazamientos
+    y líneas) o lanza el mismo SyntaxError. Si el código es menor que `min_size` o hay un solo
+    proceso, usa lexer() directamente.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(source_code) < min_size:
+        return lexer(source_code)
+
+    bounds = [0] + split_points(source_code, workers * CHUNKS_PER_WORKER) + [len(source_code)]
+    tasks = []
+    line = 1
+    for start, end in zip(bounds, bounds[1:]):
+        tasks.append((start, end, line))
+        line += source_code.count('\n', start, end)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(source_code,)) as pool:
+        results = list(pool.map(_lex_chunk, tasks))
+
+    # Si algún trozo falló, el lexer secuencial reporta el primer error con su posición exacta
+    if any(result is None for result in results):
+        return lexer(source_code)
+
+    found_tokens = TokenStream(source_code)
+    for kinds, starts, ends, lines in results:
+        found_tokens.kinds.frombytes(kinds)
+        found_tokens.starts.frombytes(starts)
+        found_tokens.ends.frombytes(ends)
+        found_tokens.lines.frombytes(lines)
+    return found_tokens
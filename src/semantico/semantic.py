@@ -1,140 +1,287 @@
-#Evalua el tipo de expresión
-def evaluate_expression(expr, symbol_table):
+from src.sintactico.ast_nodes import (
+    Node, format_ast, literal_type, DECLARATION, ASSIGNMENT, IF, IF_ELSE, WHILE, RETURN, FUNC_DECL,
+    FUNC_CALL, BLOCK_ENTER, BLOCK_EXIT, BINARY, NOT, CAST,
+)
+from src.diagnostics import WARNING
+
+# Pasos pendientes de check_expression: evaluar una subexpresión, revisar el uso de una
+# variable o combinar los tipos ya evaluados
+EVAL, USE, CAST_STEP, NOT_STEP, ARG_STEP, CALL_STEP, BINARY_STEP, STORE_STEP = range(8)
+
+# Qué errores informa check_expression y en qué orden, como cuando los tipos y los usos se
+# revisaban en dos recorridos: primero los usos (variables no declaradas o sin inicializar y
+# cuerpos de las funciones llamadas) y después los tipos, al revés, o solo los tipos
+USES_FIRST, TYPES_FIRST, TYPES_ONLY = range(3)
+
+# Usos pendientes de un chequeo con TYPES_FIRST (ver check_uses)
+USE_ERROR, USE_CALL, USE_VAR = range(3)
+
+#Revisa una expresión y evalúa su tipo
+def check_expression(expr, symbols, pool=None, order=TYPES_ONLY, check_body=None, uses=None):
     """
-    Evalúa recursivamente el tipo de una expresión:
-      - Literales numéricos (int o float)
-      - Variables (busca en symbol_table)
-      - Operaciones binarias (tupla (op, left, right))
-    Retorna el tipo ('int' o 'float') o lanza SyntaxError si hay un problema.
+    Revisa una expresión en un solo recorrido y retorna su tipo:
+      - Literales: su tipo ('int', 'float', 'bool', 'string' o 'char')
+      - Variables: se buscan en la SymbolTable `symbols`; salvo con TYPES_ONLY se marcan como
+        usadas y tienen que estar inicializadas
+      - Operaciones binarias, negaciones, casts y llamadas: el tipo que resulta de sus
+        operandos, que queda anotado en el campo `type` del nodo
+      - Llamadas: la función tiene que estar declarada y recibir sus argumentos; salvo con
+        TYPES_ONLY, check_body(nombre) revisa su cuerpo
+    La expresión se recorre con una pila explícita en postorden (primero los operandos, después
+    el operador que los combina), así que su profundidad no depende del límite de recursión.
+    Con el ExpressionPool de un AST con subexpresiones compartidas, un nodo ya evaluado con
+    los mismos tipos de variables no se vuelve a recorrer (solo se revisan sus variables).
+
+    Lanza SyntaxError con el primer error según `order`. Con USES_FIRST un error de uso se lanza
+    en cuanto aparece y uno de tipos al terminar. Con TYPES_FIRST los de tipos se lanzan en
+    cuanto aparecen y los usos quedan en la lista `uses` para que check_uses() los termine de
+    revisar después (los cuerpos de las funciones llamadas, por ejemplo, se revisan recién
+    entonces).
     """
-   # Literal numérico entero o flotante
-    if isinstance(expr, bool):
-        return 'bool'
-    if isinstance(expr, int):
-        return 'int'
-    elif isinstance(expr, float):
-        return 'float'
+    checks_uses = order != TYPES_ONLY
+    deferred = False  # Con TYPES_FIRST, ya se difirió una llamada: los usos siguientes también
+    type_error = None  # Con USES_FIRST, primer error de tipos (los tipos dejan de calcularse)
+    pending = [(EVAL, expr)]  # Pasos por hacer (el último es el siguiente)
+    types = []  # Tipos de las subexpresiones ya evaluadas
+
+    while pending:
+        step = pending.pop()
+        kind = step[0]
+
+        if kind == EVAL:
+            expr = step[1]
+            symbols.visits += 1
+            if pool is not None:
+                pool.type_evals += 1
+
+            # Literal: número, booleano, string o char
+            expr_type = literal_type(expr)
+            if expr_type is not None:
+                types.append(expr_type)
+                continue
 
-    # Literal string o char (simulado)
-    if isinstance(expr, str):
-        if expr.startswith('"') and expr.endswith('"'):
-            return 'string'
-        elif expr.startswith("'") and expr.endswith("'") and len(expr) == 3:
-            return 'char'
-        elif expr == 'true' or expr == 'false':
-            return 'bool'
-        else:
-            # Buscar la variable en los ámbitos
-            try:
-                var_info = lookup_variable(expr)
-                return var_info['type']
-            except SyntaxError:
-                raise SyntaxError(f"Variable '{expr}' no declarada antes de usarse")
-
-
-     # Operación binaria: ('+', left, right), etc.
-    if isinstance(expr, tuple) and len(expr) == 3 and expr[0] == 'CAST':
-        _, cast_type, inner_expr = expr
-        inner_type = evaluate_expression(inner_expr, symbol_table)
-
-        # Verifica si el cast es válido
-        if cast_type == 'int' and inner_type in ('string', 'float', 'char'):
-            return 'int'
-        elif cast_type == 'float' and inner_type in ('string', 'int', 'char'):
-            return 'float'
-        elif cast_type == 'string' and inner_type in ('int', 'float', 'char'):
-            return 'string'
-        elif cast_type == 'bool' and inner_type in ('int', 'float', 'string'):
-            return 'bool'
-        else:
-            raise SyntaxError(f"Conversión inválida: no se puede convertir {inner_type} a {cast_type}")
-        
-    # Operador unario: negación lógica
-    if isinstance(expr, tuple) and len(expr) == 2 and expr[0] == 'NOT':
-        _, sub_expr = expr
-        sub_type = evaluate_expression(sub_expr, symbol_table)
+            # Variable: se busca en los ámbitos
+            if isinstance(expr, str):
+                visible = symbols.bindings.get(expr)
+                if not visible:
+                    if order == USES_FIRST:
+                        raise SyntaxError(f"Variable '{expr}' no declarada")
+                    raise SyntaxError(f"Variable '{expr}' no declarada antes de usarse")
+                var_info = visible[-1]
+                types.append(var_info['type'])
+                if checks_uses:
+                    pending.append((USE, expr, var_info))
+                continue
 
-        if sub_type != 'bool':
-            raise SyntaxError(f"Uso inválido del operador '!': se esperaba 'bool' pero se obtuvo '{sub_type}'")
-        return 'bool'
-    
-    if isinstance(expr, tuple) and len(expr) == 2 and expr[0] == 'NOT':
-        _, sub_expr = expr
-        sub_type = evaluate_expression(sub_expr, symbol_table)
+            node_kind = expr.kind if isinstance(expr, Node) else None
+
+            # Nodo compartido: su tipo guardado sirve si sus variables tienen los mismos tipos
+            if node_kind is not None and pool is not None:
+                free = getattr(expr, 'free_vars', None)
+                if free is not None:
+                    var_types = symbols.variable_types(free)
+                    cached = expr.checked
+                    if cached is not None and cached[0] == var_types:
+                        pool.type_hits += 1
+                        expr.type = cached[1]
+                        types.append(cached[1])
+                        if checks_uses:
+                            # Basta revisar sus variables, en orden
+                            pending.extend((USE, name, symbols.lookup(name)) for name in reversed(free))
+                        continue
+                    if var_types is not None:
+                        pending.append((STORE_STEP, expr, var_types))
+
+            # Conversión de tipo: Cast(tipo, expr)
+            if node_kind == CAST:
+                pending.append((CAST_STEP, expr))
+                pending.append((EVAL, expr.expr))
+                continue
 
-        if sub_type != 'bool':
-            raise SyntaxError(f"Uso inválido del operador '!': se esperaba 'bool' pero se obtuvo '{sub_type}'")
-        return 'bool'
+            # Operador unario: negación lógica
+            if node_kind == NOT:
+                pending.append((NOT_STEP, expr))
+                pending.append((EVAL, expr.operand))
+                continue
 
-    # Llamada a función como expresión: ('FUNC_CALL', nombre, [args])
-    if isinstance(expr, tuple) and len(expr) == 3 and expr[0] == 'FUNC_CALL':
-        _, name, arg_exprs = expr
+            # Llamada a función como expresión: FuncCall(nombre, [args])
+            if node_kind == FUNC_CALL:
+                name, arg_exprs = expr.name, expr.args
 
-        if 'functions' not in symbol_table or name not in symbol_table['functions']:
-            raise SyntaxError(f"Función '{name}' no declarada")
+                if name not in symbols.functions:
+                    raise SyntaxError(f"Función '{name}' no declarada")
 
-        expected_params = symbol_table['functions'][name]['params']
-        if len(arg_exprs) != len(expected_params):
-            raise SyntaxError(f"Número incorrecto de argumentos para función '{name}'")
+                expected_params = symbols.functions[name]['params']
+                if len(arg_exprs) != len(expected_params):
+                    raise SyntaxError(f"Número incorrecto de argumentos para función '{name}'")
 
-        for i, (arg_expr, expected_type) in enumerate(zip(arg_exprs, expected_params)):
-            actual_type = evaluate_expression(arg_expr, symbol_table)
-            if actual_type != expected_type:
-                raise SyntaxError(
-                    f"Tipo erróneo en argumento {i+1} de '{name}': se esperaba '{expected_type}' pero se obtuvo '{actual_type}'"
-                )
+                if order == USES_FIRST:
+                    check_body(name)
+                elif order == TYPES_FIRST:
+                    deferred = True
+                    if not uses or uses[-1][0] != USE_ERROR:
+                        uses.append((USE_CALL, name))
+
+                # Cada argumento se evalúa y se compara con su parámetro antes de pasar al siguiente
+                pending.append((CALL_STEP, expr))
+                for i in range(len(arg_exprs) - 1, -1, -1):
+                    pending.append((ARG_STEP, name, i, expected_params[i]))
+                    pending.append((EVAL, arg_exprs[i]))
+                continue
 
-        return symbol_table['functions'][name]['return']
+            # Operación binaria: Binary('+', left, right), etc.
+            if node_kind == BINARY:
+                pending.append((BINARY_STEP, expr))
+                pending.append((EVAL, expr.right))
+                pending.append((EVAL, expr.left))
+                continue
 
+            # Cualquier otro formato no es válido
+            error = SyntaxError(f"Expresión semánticamente inválida: {expr}")
+            if order != USES_FIRST:
+                raise error
+            type_error = type_error or error
+
+        elif kind == USE:
+            # Uso de una variable: queda marcada como usada y tiene que estar inicializada
+            _, name, var_info = step
+            var_info['used'] = True
+            if deferred:
+                if uses[-1][0] != USE_ERROR:
+                    uses.append((USE_VAR, name, var_info))
+            elif not var_info['initialized']:
+                error = SyntaxError(f"Variable '{name}' usada antes de ser inicializada")
+                if order == USES_FIRST:
+                    raise error
+                if not uses or uses[-1][0] != USE_ERROR:
+                    uses.append((USE_ERROR, error))
+
+        elif type_error is not None:
+            continue  # Después de un error de tipos solo se revisan los usos
 
-        # Compatibilidad de tipos para operaciones comunes
-    if isinstance(expr, tuple) and len(expr) == 3:
-        op, left, right = expr
-        left_type  = evaluate_expression(left, symbol_table)
-        right_type = evaluate_expression(right, symbol_table)
+        else:
+            try:
+                if kind == BINARY_STEP:
+                    right_type = types.pop()
+                    left_type = types.pop()
+                    node = step[1]
+                    node.type = binary_type(node.op, left_type, right_type)
+                    types.append(node.type)
+
+                elif kind == CAST_STEP:
+                    node = step[1]
+                    node.type = cast_type_of(node.cast_type, types.pop())
+                    types.append(node.type)
+
+                elif kind == NOT_STEP:
+                    sub_type = types.pop()
+                    if sub_type != 'bool':
+                        raise SyntaxError(f"Uso inválido del operador '!': se esperaba 'bool' pero se obtuvo '{sub_type}'")
+                    step[1].type = 'bool'
+                    types.append('bool')
+
+                elif kind == ARG_STEP:
+                    _, name, i, expected_type = step
+                    actual_type = types.pop()
+                    if actual_type != expected_type:
+                        raise SyntaxError(
+                            f"Tipo erróneo en argumento {i+1} de '{name}': se esperaba '{expected_type}' pero se obtuvo '{actual_type}'"
+                        )
 
-        if op == '+':
-            # Permitir suma numérica y concatenación string-string
-            if left_type == right_type:
-                if left_type in ('int', 'float', 'string'):
-                    return left_type
-                else:
-                    raise SyntaxError(f"Operación '+' no soportada para tipo '{left_type}'")
-            else:
-                # Detectar concatenación inválida entre string y numérico
-                if ('string' in (left_type, right_type)) and ('int' in (left_type, right_type) or 'float' in (left_type, right_type)):
-                    raise SyntaxError(
-                        f"Error semántico: concatenación inválida entre {left_type} y {right_type}"
-                    )
-                else:
-                    raise SyntaxError(
-                        f"Tipos incompatibles en operación '+': {left_type} vs {right_type}"
-                    )
-        elif op in ('-', '*', '/'):
-            if left_type == right_type and left_type in ('int', 'float'):
+                elif kind == CALL_STEP:
+                    node = step[1]
+                    node.type = symbols.functions[node.name]['return']
+                    types.append(node.type)
+
+                else:  # STORE_STEP
+                    step[1].checked = (step[2], types[-1])
+
+            except SyntaxError as error:
+                if order != USES_FIRST:
+                    raise
+                type_error = error
+
+    if type_error is not None:
+        raise type_error
+    return types.pop()
+
+def check_uses(uses, check_body):
+    """
+    Termina de revisar los usos que dejó pendientes check_expression con TYPES_FIRST: lanza el
+    primer error de uso, revisando en orden los cuerpos de las funciones llamadas y si están
+    inicializadas las variables que se leen después de cada llamada.
+    """
+    for use in uses:
+        if use[0] == USE_ERROR:
+            raise use[1]
+        if use[0] == USE_CALL:
+            check_body(use[1])
+        elif not use[2]['initialized']:
+            raise SyntaxError(f"Variable '{use[1]}' usada antes de ser inicializada")
+
+def evaluate_expression(expr, symbols, pool=None):
+    """
+    Evalúa el tipo de una expresión sin revisar los usos de sus variables (ver
+    check_expression). Retorna el tipo o lanza SyntaxError si hay un problema.
+    """
+    return check_expression(expr, symbols, pool)
+
+def cast_type_of(cast_type, inner_type):
+    """Tipo de ('CAST', cast_type, expr) cuando expr es de tipo inner_type."""
+    # Verifica si el cast es válido
+    if cast_type == 'int' and inner_type in ('string', 'float', 'char'):
+        return 'int'
+    elif cast_type == 'float' and inner_type in ('string', 'int', 'char'):
+        return 'float'
+    elif cast_type == 'string' and inner_type in ('int', 'float', 'char'):
+        return 'string'
+    elif cast_type == 'bool' and inner_type in ('int', 'float', 'string'):
+        return 'bool'
+    else:
+        raise SyntaxError(f"Conversión inválida: no se puede convertir {inner_type} a {cast_type}")
+
+def binary_type(op, left_type, right_type):
+    """Tipo de (op, left, right) con operandos de tipos left_type y right_type."""
+    # Compatibilidad de tipos para operaciones comunes
+    if op == '+':
+        # Permitir suma numérica y concatenación string-string
+        if left_type == right_type:
+            if left_type in ('int', 'float', 'string'):
                 return left_type
             else:
+                raise SyntaxError(f"Operación '+' no soportada para tipo '{left_type}'")
+        else:
+            # Detectar concatenación inválida entre string y numérico
+            if ('string' in (left_type, right_type)) and ('int' in (left_type, right_type) or 'float' in (left_type, right_type)):
                 raise SyntaxError(
-                    f"Tipos incompatibles en operación '{op}': {left_type} vs {right_type}"
+                    f"Error semántico: concatenación inválida entre {left_type} y {right_type}"
                 )
-            
-        # comparaciones relacionales
-        elif op in ('==', '!='):
-            if left_type != right_type:
-                raise SyntaxError(f"Comparación inválida con '{op}': tipos incompatibles {left_type} y {right_type}")
-            return 'bool'
-
-        elif op in ('<', '<=', '>', '>='):
-            if left_type in ('int', 'float') and right_type in ('int', 'float'):
-                return 'bool'
             else:
-                raise SyntaxError(f"Comparación inválida con '{op}': se esperaba 'int' o 'float', pero se obtuvo {left_type} y {right_type}")
-    
+                raise SyntaxError(
+                    f"Tipos incompatibles en operación '+': {left_type} vs {right_type}"
+                )
+    elif op in ('-', '*', '/'):
+        if left_type == right_type and left_type in ('int', 'float'):
+            return left_type
+        else:
+            raise SyntaxError(
+                f"Tipos incompatibles en operación '{op}': {left_type} vs {right_type}"
+            )
+        
+    # comparaciones relacionales
+    elif op in ('==', '!='):
+        if left_type != right_type:
+            raise SyntaxError(f"Comparación inválida con '{op}': tipos incompatibles {left_type} y {right_type}")
+        return 'bool'
+
+    elif op in ('<', '<=', '>', '>='):
+        if left_type in ('int', 'float') and right_type in ('int', 'float'):
+            return 'bool'
         else:
-            raise SyntaxError(f"Operador '{op}' no soportado")
+            raise SyntaxError(f"Comparación inválida con '{op}': se esperaba 'int' o 'float', pero se obtuvo {left_type} y {right_type}")
 
-    # Cualquier otro formato no es válido
-    raise SyntaxError(f"Expresión semánticamente inválida: {expr}")
+    else:
+        raise SyntaxError(f"Operador '{op}' no soportado")
 
 def is_valid_identifier(name):
     # Debe ser identificador válido y no comenzar con número
@@ -166,271 +313,350 @@ def check_function_call(name, arg_types, symbol_table):
             )
     return sig["return"]
 
-# Estructuras globales para gestión de ámbitos
-scope_stack = []  # Pila para rastrear los ámbitos activos
-symbol_table = {}  # Tabla de símbolos por ámbito y funciones
-scope_counter = 0  # Contador para generar nombres únicos de ámbitos
-
-# Funciones para manejar ámbitos
-def enter_scope(name):
-    """Entra en un nuevo ámbito: push y crea entrada en symbol_table."""
-    global scope_counter
-    if name.startswith("block_"):
-        scope_counter += 1
-        unique_name = f"block_{scope_counter}"
-    else:
-        unique_name = name
-    scope_stack.append(unique_name)
-    if unique_name not in symbol_table:
-        symbol_table[unique_name] = {}
-
-def exit_scope():
-    """Sale del ámbito actual."""
-    scope_stack.pop()
-
-def current_scope():
-    """Devuelve el nombre del ámbito actual."""
-    return scope_stack[-1]
-
-def lookup_variable(name):
-    """Busca una variable remontando ámbitos desde el más interno al global."""
-    for scope in reversed(scope_stack):
-        if name in symbol_table.get(scope, {}):
-            return symbol_table[scope][name]
-    raise SyntaxError(f"Variable '{name}' no declarada en ningún ámbito accesible")
-
-# Declaración de funciones (permanentes en symbol_table['functions'])
-def declare_function(name, param_types, return_type):
-    funcs = symbol_table['functions']
-    if name in funcs:
-        raise SemanticError(f"Función '{name}' ya declarada")
-    funcs[name] = {'params': param_types, 'return': return_type}
+class SymbolTable:
+    """
+    Tabla de símbolos por ámbitos de un análisis semántico.
+
+    `table` es la tabla que devuelve semantic(): nombre de ámbito -> {variable: info}, más
+    'functions' con las firmas declaradas; guarda todos los ámbitos, también los que ya
+    terminaron. Para buscar una variable sin remontar los ámbitos activos, cada nombre tiene
+    además su pila de declaraciones visibles (la última es la del ámbito más interno): entrar
+    a un ámbito y declarar en él agrega a esas pilas, y salir del ámbito saca lo que agregó.
+    Buscar una variable cuesta lo mismo sin importar cuántos ámbitos haya abiertos.
+    Cada declaración recibe además su propio slot (un entero denso, en orden de declaración)
+    que se guarda en su info como 'slot': es su posición en la memoria de la VM. Como las
+    cuádruplas no distinguen ámbitos, al terminar el análisis assign_storage() le da a cada
+    declaración el nombre con que aparece en ellas ('storage' en su info): una variable que
+    oculta a otra del mismo nombre no escribe en el slot de la otra.
+    Con `diagnostics` (un Diagnostics) reporta las variables que ocultan a otra de un ámbito
+    exterior (en una función, una global); declarar dos veces en el mismo ámbito es un error.
+    El desplazamiento de la declaración en el código fuente (si se conoce) queda en su info
+    como 'offset', para ubicar los diagnósticos.
+    """
+
+    def __init__(self, diagnostics=None):
+        self.diagnostics = diagnostics
+        self.table = {'functions': {}}
+        self.functions = self.table['functions']
+        self.scopes = []  # Ámbitos activos, del global al actual
+        self.bindings = {}  # Variable -> infos visibles con ese nombre, la última es la actual
+        self.counter = 0  # Contador para generar nombres únicos de ámbitos
+        self.declarations = []  # (nombre, info, profundidad de ámbitos) de cada declaración; su slot es su posición
+        self.visits = 0  # Subexpresiones visitadas por check_expression
+
+    def enter_scope(self, name):
+        """Entra en un nuevo ámbito: push y crea su entrada en la tabla."""
+        if name.startswith("block_"):
+            self.counter += 1
+            name = f"block_{self.counter}"
+        self.scopes.append(name)
+        variables = self.table.setdefault(name, {})
+        for var_name, info in variables.items():
+            self.bindings.setdefault(var_name, []).append(info)
+
+    def exit_scope(self):
+        """Sale del ámbito actual; sus variables dejan de verse."""
+        bindings = self.bindings
+        for var_name in self.table[self.scopes.pop()]:
+            bindings[var_name].pop()
+
+    def current_scope(self):
+        """Devuelve el nombre del ámbito actual."""
+        return self.scopes[-1]
+
+    def suspend(self):
+        """
+        Cierra los ámbitos activos salvo el global (para revisar el cuerpo de una función, que
+        no ve los ámbitos de quien la llama) y devuelve sus nombres para resume().
+        """
+        saved = self.scopes[1:]
+        while len(self.scopes) > 1:
+            self.exit_scope()
+        return saved
+
+    def resume(self, saved):
+        """Cierra los ámbitos abiertos después de suspend() y vuelve a abrir los `saved`."""
+        while len(self.scopes) > 1:
+            self.exit_scope()
+        for name in saved:
+            self.scopes.append(name)
+            for var_name, info in self.table[name].items():
+                self.bindings.setdefault(var_name, []).append(info)
+
+    def lookup(self, name):
+        """Info de la variable `name` en el ámbito más interno que la declara."""
+        visible = self.bindings.get(name)
+        if not visible:
+            raise SyntaxError(f"Variable '{name}' no declarada en ningún ámbito accesible")
+        return visible[-1]
+
+    def variable_types(self, names):
+        """Tipos de las variables en los ámbitos actuales, o None si alguna no está declarada."""
+        types = []
+        for name in names:
+            visible = self.bindings.get(name)
+            if not visible:
+                return None
+            types.append(visible[-1]['type'])
+        return tuple(types)
+
+    # Declaración de funciones (permanentes en table['functions'])
+    def declare_function(self, name, param_types, return_type):
+        if name in self.functions:
+            raise SemanticError(f"Función '{name}' ya declarada")
+        self.functions[name] = {'params': param_types, 'return': return_type}
+
+    # Declaración de variables en ámbito actual
+    def declare_variable(self, name, vtype, is_const=False, offset=None):
+        scope = self.current_scope()
+        table = self.table[scope]
+        if name in table:
+            raise SyntaxError(f"Variable '{name}' ya declarada en ámbito '{scope}'")
+        visible = self.bindings.setdefault(name, [])
+        if visible and self.diagnostics is not None:
+            self.diagnostics.report(WARNING, 'shadowed-variable',
+                                    f"'{name}' oculta una variable de un ámbito exterior", 'semántico', scope,
+                                    offset)
+        info = table[name] = {'type': vtype, 'const': is_const, 'used': False, 'initialized': False,
+                              'slot': len(self.declarations), 'offset': offset}
+        self.declarations.append((name, info, len(self.scopes)))
+        visible.append(info)
+        return info
+
+    def assign_storage(self):
+        """
+        Da a cada declaración su nombre en las cuádruplas ('storage' en su info): la más externa
+        de cada nombre (la primera entre las del ámbito menos anidado) conserva el nombre, así
+        que es la que se ve con ese nombre en la memoria de la VM, y las demás se llaman
+        nombre.2, nombre.3, ... en orden de declaración (un identificador no lleva punto).
+        """
+        outermost = {}
+        for name, info, depth in self.declarations:
+            if name not in outermost or depth < outermost[name][1]:
+                outermost[name] = (info, depth)
+        counts = {}
+        for name, info, depth in self.declarations:
+            if info is outermost[name][0]:
+                info['storage'] = name
+            else:
+                counts[name] = counts.get(name, 1) + 1
+                info['storage'] = f"{name}.{counts[name]}"
 
-# Declaración de variables en ámbito actual
-def declare_variable(name, vtype, is_const=False):
-    scope = current_scope()
-    table = symbol_table[scope]
-    if name in table:
-        print(f"Warning: '{name}' shadows a variable en ámbito '{scope}'")
-    table[name] = {'type': vtype, 'const': is_const, 'initialized': False, 'used': False}
+def variable_slots(symbol_table):
+    """
+    Variable -> slot de la VM, a partir de la tabla que devuelve semantic(): cada declaración
+    con el nombre que lleva en las cuádruplas (ver SymbolTable.assign_storage).
+    """
+    return {info['storage']: info['slot'] for scope_name, variables in symbol_table.items()
+            if scope_name != 'functions' for info in variables.values()}
+
+def slot_types(symbol_table):
+    """
+    Variable -> tipo de su slot, a partir de la tabla que devuelve semantic(): cada declaración
+    con el nombre que lleva en las cuádruplas, como en variable_slots.
+    """
+    return {info['storage']: info['type'] for scope_name, variables in symbol_table.items()
+            if scope_name != 'functions' for info in variables.values()}
 
 #Función principal del analizador sintáctico 
-def semantic(ast):
-    print(ast)
+def semantic(ast, pool=None, diagnostics=None):
     """
     Realiza el análisis semántico del AST:
       1. Mantiene una tabla de símbolos (name -> tipo).
       2. Verifica que las variables se declaren antes de usarse.
       3. Verifica compatibilidad de tipos en declaraciones y asignaciones.
       4. Verifica identificadores válidos.
-      5. Advierte si hay variables no utilizadas.
+      5. Advierte si hay variables no utilizadas (en `diagnostics`, si se pasa un Diagnostics;
+         con tracing también deja el AST analizado como traza).
+    Cada expresión se revisa en un solo recorrido (check_expression), que deja anotado el
+    tipo de cada uno de sus nodos para el generador de código.
+    Con `pool` (el ExpressionPool con que el parser compartió las subexpresiones) reutiliza
+    los tipos ya calculados de los nodos compartidos.
     Retorna la tabla de símbolos final o lanza SyntaxError si detecta errores.
     """
 
-    # Inicialización global
-    global scope_counter
-    symbol_table.clear()
-    symbol_table["functions"] = {}
-    scope_stack.clear()
-    scope_counter = 0  # Reiniciar contador de ámbitos
-    enter_scope("global")
-
-    def mark_used(var_name):
-        # Busca la variable en los ámbitos y la marca como usada
-        for scope in reversed(scope_stack):
-            if scope in symbol_table and var_name in symbol_table[scope]:
-                symbol_table[scope][var_name]['used'] = True
-                return
-    
-    def mark_initialized(var_name):
-        # Busca la variable en los ámbitos y la marca como inicializada
-        for scope in reversed(scope_stack):
-            if scope in symbol_table and var_name in symbol_table[scope]:
-                symbol_table[scope][var_name]['initialized'] = True
-                return
-
-    def evaluate_expression_with_usage(expr, symbol_table):
-        # Literales (int, float, string, etc.) — no hacen nada
-        if isinstance(expr, (int, float, bool)):
+    if diagnostics is not None and diagnostics.tracing:
+        diagnostics.trace('ast', format_ast(ast), 'semántico')
+
+    # Tabla de símbolos de este análisis
+    symbols = SymbolTable(diagnostics)
+    symbol_table = symbols.table
+    symbols.enter_scope("global")
+
+    # Cuerpos de las funciones declaradas (FunctionBody) y funciones ya revisadas: un cuerpo se
+    # analiza y se revisa la primera vez que se llama, y una sola vez
+    function_bodies = {}
+    checked_functions = set()
+    # Declaraciones (nodo, info) y parámetros (cuerpo, infos) revisados, para anotarles al
+    # final el nombre que llevan en las cuádruplas
+    declared = []
+    declared_params = []
+
+    def check_function_body(name):
+        # Revisa el cuerpo de una función en su propio ámbito, que solo ve el ámbito global y
+        # los parámetros (ya inicializados), no los ámbitos de quien la llama
+        body = function_bodies.get(name)
+        if body is None or name in checked_functions:
             return
+        checked_functions.add(name)  # Antes de revisar: una llamada recursiva no vuelve a entrar
+
+        saved_scopes = symbols.suspend()
+        symbols.enter_scope(f"function_{name}")
+        table = symbol_table[symbols.current_scope()]
+        param_infos = []
+        for param_name, param_type, offset in zip(body.param_names, symbols.functions[name]['params'],
+                                                  body.param_offsets):
+            if param_name in table:
+                raise SyntaxError(f"Parámetro '{param_name}' repetido en la función '{name}'")
+            info = symbols.declare_variable(param_name, param_type, offset=offset)
+            info['initialized'] = True
+            param_infos.append(info)
+        declared_params.append((body, param_infos))
+        process_block(body.statements(), name)
+        symbols.resume(saved_scopes)
+
+    def process_block(block, function=None):
+        # `function` es el nombre de la función cuyo cuerpo se recorre (None en el programa)
+        # Los bloques anidados (if, else, while) se recorren con una pila de iteradores en vez
+        # de recursión: el bloque de arriba de la pila es el que se está recorriendo
+        blocks = [iter(block)]
+        while blocks:
+            node = next(blocks[-1], None)
+            if node is None:
+                blocks.pop()  # Bloque terminado: sigue el bloque que lo contiene
+                continue
+            node_type = node.kind
 
-        # Identificadores (variables)
-        if isinstance(expr, str):
-            # intento resolver en ámbitos
-            try:
-                var_info = lookup_variable(expr)
-            except SyntaxError:
-                # si no es variable, lo dejamos pasar si es literal string/char/bool
-                if (expr.startswith('"') and expr.endswith('"')) or \
-                (expr.startswith("'") and expr.endswith("'") and len(expr) == 3) or \
-                expr in ('true', 'false'):
-                    return
-                else:
-                    raise SyntaxError(f"Variable '{expr}' no declarada")
-            # si llegó aquí, es variable: marco uso y chequeo inicialización
-            mark_used(expr)
-            if not var_info.get('initialized', False):
-                raise SyntaxError(f"Variable '{expr}' usada antes de ser inicializada")
-            return
-
-    # Tuplas (expresiones compuestas)
-        elif isinstance(expr, tuple):
-            if len(expr) == 3 and expr[0] == 'FUNC_CALL':
-                _, name, args = expr
-
-                if 'functions' not in symbol_table or name not in symbol_table['functions']:
-                    raise SyntaxError(f"Función '{name}' no declarada")
-
-                expected_params = symbol_table['functions'][name]['params']
-                if len(args) != len(expected_params):
-                    raise SyntaxError(f"Número incorrecto de argumentos para función '{name}'")
-
-                for arg_expr in args:
-                    evaluate_expression_with_usage(arg_expr, symbol_table)
-
-            elif len(expr) == 3 and expr[0] == 'CAST':
-                _, _, subexpr = expr
-                evaluate_expression_with_usage(subexpr, symbol_table)
-
-            elif len(expr) == 2 and expr[0] == 'NOT':
-                _, subexpr = expr
-                evaluate_expression_with_usage(subexpr, symbol_table)
-
-            else:
-                # Operaciones binarias (op, left, right)
-                for subexpr in expr[1:]:
-                    evaluate_expression_with_usage(subexpr, symbol_table)
-
-    def process_block(block):
-        for node in block:
-            node_type = node[0]
-
-            if node_type == 'DECLARATION':
-                if node[1] == 'const':
-                    _, _, var_type, var_name, *rest = node
-                    is_const = True
-                else:
-                    _, var_type, var_name, *rest = node
-                    is_const = False
+            if node_type == DECLARATION:
+                var_type, var_name, is_const = node.var_type, node.name, node.const
 
                 if not is_valid_identifier(var_name):
                     raise SyntaxError(f"Nombre de variable inválido: '{var_name}'")
 
-                # Verifica que no esté ya en el ámbito actual
-                current = current_scope()
-                if var_name in symbol_table[current]:
-                    raise SyntaxError(f"Variable '{var_name}' ya declarada en ámbito '{current}'")
-                symbol_table[current][var_name] = {
-                    'type': var_type,
-                    'const': is_const,
-                    'used': False,
-                    'initialized': False
-                }
-
-                if rest:
-                    expr = rest[0]
-                    # IMPORTANTE: evaluar uso ANTES de marcar como inicializada
-                    evaluate_expression_with_usage(expr, symbol_table)
-                    
-                    expr_type = evaluate_expression(expr, symbol_table)
+                # Falla si ya está en el ámbito actual
+                var_info = symbols.declare_variable(var_name, var_type, is_const, node.offset)
+                declared.append((node, var_info))
+
+                if node.init is not None:
+                    expr = node.init
+                    # IMPORTANTE: revisar los usos ANTES de marcar como inicializada
+                    expr_type = check_expression(expr, symbols, pool, USES_FIRST, check_function_body)
                     if expr_type != var_type:
                         raise SyntaxError(
                             f"Asignación incompatible para '{var_name}': "
                             f"esperado {var_type}, obtenido {expr_type}"
                         )
                     # Ahora sí marcar como inicializada
-                    symbol_table[current][var_name]['used'] = True
-                    symbol_table[current][var_name]['initialized'] = True
+                    var_info['used'] = True
+                    var_info['initialized'] = True
                         
-            elif node_type == 'ASSIGNMENT':
-                _, var_name, expr = node
+            elif node_type == ASSIGNMENT:
+                var_name, expr = node.name, node.expr
 
                 # **AQUÍ**: busca en ámbitos
-                var_info = lookup_variable(var_name)
+                var_info = symbols.lookup(var_name)
 
                 if var_info['const']:
                     raise SyntaxError(f"No se puede modificar la constante '{var_name}'")
 
                 # **MARCAR** como inicializada ANTES de evaluar la expresión:
-                for scope in reversed(scope_stack):
-                    if var_name in symbol_table[scope]:
-                        symbol_table[scope][var_name]['initialized'] = True
-                        symbol_table[scope][var_name]['used'] = True
-                        break
+                var_info['initialized'] = True
+                var_info['used'] = True
 
-                expr_type = evaluate_expression(expr, symbol_table)
+                uses = []
+                expr_type = check_expression(expr, symbols, pool, TYPES_FIRST, check_function_body, uses)
                 if expr_type != var_info['type']:
                     raise SyntaxError(
                         f"Asignación incompatible para '{var_name}': "
                         f"esperado {var_info['type']}, obtenido {expr_type}"
                     )
 
-                evaluate_expression_with_usage(expr, symbol_table)
+                check_uses(uses, check_function_body)
 
-            elif node_type == 'IF':
-                _, cond_expr, then_block, *else_block = node
-                cond_type = evaluate_expression(cond_expr, symbol_table)
-                evaluate_expression_with_usage(cond_expr, symbol_table)
+            elif node_type == IF:
+                cond_expr, then_block = node.cond, node.then_block
+                uses = []
+                cond_type = check_expression(cond_expr, symbols, pool, TYPES_FIRST, check_function_body, uses)
+                check_uses(uses, check_function_body)
                 if cond_type != 'bool':
                     raise SyntaxError(
                         f"Condición inválida en 'if': se esperaba 'bool' pero se obtuvo '{cond_type}'"
                     )
-                process_block(then_block)
-                if else_block:
-                    process_block(else_block[0])
+                # El bloque then se recorre antes que el resto del bloque actual
+                blocks.append(iter(then_block))
                     
-            elif node_type == 'IF_ELSE':
-                _, cond_expr, then_block, else_block = node
-                cond_type = evaluate_expression(cond_expr, symbol_table)
-                evaluate_expression_with_usage(cond_expr, symbol_table)
+            elif node_type == IF_ELSE:
+                cond_expr, then_block, else_block = node.cond, node.then_block, node.else_block
+                uses = []
+                cond_type = check_expression(cond_expr, symbols, pool, TYPES_FIRST, check_function_body, uses)
+                check_uses(uses, check_function_body)
                 if cond_type != 'bool':
                     raise SyntaxError(
                         f"Condición inválida en 'if-else': se esperaba 'bool' pero se obtuvo '{cond_type}'"
                     )
-                process_block(then_block)
-                process_block(else_block)
-
-            elif node_type == 'WHILE':
-                _, cond_expr, body = node
-                cond_type = evaluate_expression(cond_expr, symbol_table)
-                evaluate_expression_with_usage(cond_expr, symbol_table)
+                # El bloque then se recorre antes que el else, y ambos antes que el resto del bloque actual
+                blocks.append(iter(else_block))
+                blocks.append(iter(then_block))
+
+            elif node_type == WHILE:
+                cond_expr, body = node.cond, node.body
+                uses = []
+                cond_type = check_expression(cond_expr, symbols, pool, TYPES_FIRST, check_function_body, uses)
+                check_uses(uses, check_function_body)
                 if cond_type != 'bool':
                     raise SyntaxError(
                         f"Condición inválida en 'while': se esperaba 'bool' pero se obtuvo '{cond_type}'"
                     )
-                process_block(body)
-            elif node_type == 'FUNC_DECL':
-                _, name, param_types, return_type = node
-                declare_function(name, param_types, return_type, symbol_table)
-
-            elif node_type == 'FUNC_CALL':
-                _, name, arg_exprs = node
-                arg_types = [evaluate_expression(expr, {k: v['type'] for k, v in symbol_table.items() if k != 'functions'})
-                             for expr in arg_exprs]
+                blocks.append(iter(body))
+            elif node_type == FUNC_DECL:
+                name = node.name
+                symbols.declare_function(name, node.param_types, node.return_type)
+                if node.body is not None:
+                    function_bodies[name] = node.body
+
+            elif node_type == FUNC_CALL:
+                name, arg_exprs = node.name, node.args
+                arg_types = [check_expression(expr, symbols, pool) for expr in arg_exprs]
                 check_function_call(name, arg_types, symbol_table)
+                check_function_body(name)
+
+            elif node_type == RETURN and function is not None:
+                expr = node.expr
+                expr_type = check_expression(expr, symbols, pool, USES_FIRST, check_function_body)
+                expected_type = symbols.functions[function]['return']
+                if expr_type != expected_type:
+                    raise SyntaxError(
+                        f"Retorno incompatible en la función '{function}': "
+                        f"esperado {expected_type}, obtenido {expr_type}"
+                    )
 
             #Control de stack
-            elif node_type == 'BLOCK_ENTER':
-                enter_scope(f"block_{len(scope_stack)}")
-            elif node_type == 'BLOCK_EXIT':
-                exit_scope()
+            elif node_type == BLOCK_ENTER:
+                symbols.enter_scope(f"block_{len(symbols.scopes)}")
+            elif node_type == BLOCK_EXIT:
+                symbols.exit_scope()
             else:
 
                 continue
 
     process_block(ast)
 
-    # h) Advertencia de variables no usadas
-    unused = []
-    for scope_name, tbl in symbol_table.items():
-        if scope_name == "functions":
-            continue
-        for name, info in tbl.items():
-            if not info['used']:
-                unused.append(name)
+    # Cada declaración (y cada parámetro) queda con el nombre que lleva en las cuádruplas
+    symbols.assign_storage()
+    for node, info in declared:
+        node.storage = info['storage']
+    for body, param_infos in declared_params:
+        body.param_storage = [info['storage'] for info in param_infos]
 
-    if unused:
-        print(f"Advertencia: variables no utilizadas: {', '.join(unused)}")
+    # h) Advertencia de variables no usadas
+    if diagnostics is not None:
+        for scope_name, tbl in symbol_table.items():
+            if scope_name == "functions":
+                continue
+            for name, info in tbl.items():
+                if not info['used']:
+                    diagnostics.report(WARNING, 'unused-variable', f"Variable '{name}' no utilizada",
+                                       'semántico', scope_name, info['offset'])
 
     # i) Error si alguna variable usada no fue inicializada
     for scope_name, tbl in symbol_table.items():
@@ -0,0 +1,503 @@
+"""
+Nodos del AST.
+
+Cada sentencia y cada expresión compuesta es un objeto de una clase con __slots__ (sin
+__dict__ por instancia) con un código de tipo entero en `kind` y campos con nombre, así que
+los consumidores despachan por `node.kind` en vez de revisar largo y primer elemento de una
+tupla. Las hojas de las expresiones siguen siendo valores de Python: números, True/False,
+nombres de variables y literales string o char, que son un StringLiteral o CharLiteral (el
+texto con sus comillas, con el tipo que registró el parser); literal_type() da el tipo de
+una hoja literal. Los nodos de expresión (Binary, Not, Cast y FuncCall) tienen además el campo `type`,
+None hasta que el semántico anota en él el tipo que resolvió para ese nodo.
+
+Las tuplas que producía el parser antes siguen disponibles con to_tuple() (y from_tuple()
+arma nodos a partir de ellas, por ejemplo para un AST escrito a mano en una prueba). repr()
+de un nodo es el de su tupla, así que lo que se imprime del AST no cambia.
+
+Con un ExpressionPool el parser comparte las subexpresiones: dos subárboles iguales son el
+mismo nodo, y el semántico y el generador de código guardan en el pool lo que calcularon
+para ese nodo (ver ExpressionPool).
+"""
+
+# Códigos de tipo de los nodos
+(DECLARATION, ASSIGNMENT, IF, IF_ELSE, WHILE, RETURN, FUNC_DECL, FUNC_CALL,
+ BLOCK_ENTER, BLOCK_EXIT, BINARY, NOT, CAST) = range(13)
+
+
+class Node:
+    """
+    Base de los nodos: `kind` (código de tipo) es un atributo de cada clase, y cada clase da
+    con as_tuple() su tupla equivalente, con los hijos todavía como nodos.
+    """
+    __slots__ = ()
+    kind = None
+
+    def __repr__(self):
+        return format_ast(self)
+
+
+class Declaration(Node):
+    """
+    int x;  int x = expr;  const int x = expr;  (`init` es None si no hay inicialización).
+    `offset` es el desplazamiento del nombre en el código fuente, para los diagnósticos (None
+    si el nodo no viene del parser), y `storage` el nombre de la variable en las cuádruplas,
+    que anota el semántico (None hasta entonces: se usa `name`); ninguno forma parte de la tupla.
+    """
+    __slots__ = ('var_type', 'name', 'init', 'const', 'offset', 'storage')
+    kind = DECLARATION
+
+    def __init__(self, var_type, name, init=None, const=False, offset=None):
+        self.var_type = var_type
+        self.name = name
+        self.init = init
+        self.const = const
+        self.offset = offset
+        self.storage = None
+
+    def as_tuple(self):
+        if self.const:
+            return ('DECLARATION', 'const', self.var_type, self.name, self.init)
+        if self.init is None:
+            return ('DECLARATION', self.var_type, self.name)
+        return ('DECLARATION', self.var_type, self.name, self.init)
+
+
+class Assignment(Node):
+    __slots__ = ('name', 'expr')
+    kind = ASSIGNMENT
+
+    def __init__(self, name, expr):
+        self.name = name
+        self.expr = expr
+
+    def as_tuple(self):
+        return ('ASSIGNMENT', self.name, self.expr)
+
+
+class If(Node):
+    __slots__ = ('cond', 'then_block')
+    kind = IF
+
+    def __init__(self, cond, then_block):
+        self.cond = cond
+        self.then_block = then_block
+
+    def as_tuple(self):
+        return ('IF', self.cond, self.then_block)
+
+
+class IfElse(Node):
+    __slots__ = ('cond', 'then_block', 'else_block')
+    kind = IF_ELSE
+
+    def __init__(self, cond, then_block, else_block):
+        self.cond = cond
+        self.then_block = then_block
+        self.else_block = else_block
+
+    def as_tuple(self):
+        return ('IF_ELSE', self.cond, self.then_block, self.else_block)
+
+
+class While(Node):
+    __slots__ = ('cond', 'body')
+    kind = WHILE
+
+    def __init__(self, cond, body):
+        self.cond = cond
+        self.body = body
+
+    def as_tuple(self):
+        return ('WHILE', self.cond, self.body)
+
+
+class Return(Node):
+    __slots__ = ('expr',)
+    kind = RETURN
+
+    def __init__(self, expr):
+        self.expr = expr
+
+    def as_tuple(self):
+        return ('RETURN', self.expr)
+
+
+class FuncDecl(Node):
+    """Declaración de función; `body` es el FunctionBody del parser (None si no tiene cuerpo)."""
+    __slots__ = ('name', 'param_types', 'return_type', 'body')
+    kind = FUNC_DECL
+
+    def __init__(self, name, param_types, return_type, body=None):
+        self.name = name
+        self.param_types = param_types
+        self.return_type = return_type
+        self.body = body
+
+    def as_tuple(self):
+        if self.body is None:
+            return ('FUNC_DECL', self.name, self.param_types, self.return_type)
+        return ('FUNC_DECL', self.name, self.param_types, self.return_type, self.body)
+
+
+class FuncCall(Node):
+    """Llamada a función, como expresión o como sentencia."""
+    __slots__ = ('name', 'args', 'type')
+    kind = FUNC_CALL
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.type = None
+
+    def as_tuple(self):
+        return ('FUNC_CALL', self.name, self.args)
+
+
+class BlockEnter(Node):
+    __slots__ = ()
+    kind = BLOCK_ENTER
+
+    def as_tuple(self):
+        return ('BLOCK_ENTER',)
+
+
+class BlockExit(Node):
+    __slots__ = ()
+    kind = BLOCK_EXIT
+
+    def as_tuple(self):
+        return ('BLOCK_EXIT',)
+
+
+class Binary(Node):
+    __slots__ = ('op', 'left', 'right', 'type')
+    kind = BINARY
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.type = None
+
+    def as_tuple(self):
+        return (self.op, self.left, self.right)
+
+
+class Not(Node):
+    __slots__ = ('operand', 'type')
+    kind = NOT
+
+    def __init__(self, operand):
+        self.operand = operand
+        self.type = None
+
+    def as_tuple(self):
+        return ('NOT', self.operand)
+
+
+class Cast(Node):
+    __slots__ = ('cast_type', 'expr', 'type')
+    kind = CAST
+
+    def __init__(self, cast_type, expr):
+        self.cast_type = cast_type
+        self.expr = expr
+        self.type = None
+
+    def as_tuple(self):
+        return ('CAST', self.cast_type, self.expr)
+
+
+# Los marcadores de bloque no tienen campos: todos los bloques comparten los mismos
+BLOCK_ENTER_NODE = BlockEnter()
+BLOCK_EXIT_NODE = BlockExit()
+
+
+class Literal(str):
+    """
+    Hoja de un literal string o char: el texto con sus comillas, como lo dio el lexer, y su
+    tipo en `type`. Es un str, así que se compara, se imprime y va en las cuádruplas igual
+    que su texto.
+    """
+    __slots__ = ()
+    type = None
+
+
+class StringLiteral(Literal):
+    __slots__ = ()
+    type = 'string'
+
+
+class CharLiteral(Literal):
+    __slots__ = ()
+    type = 'char'
+
+
+def literal_leaf(item):
+    """
+    Hoja de un AST escrito como tuplas: un string entre comillas es un literal (el único lugar
+    donde se miran las comillas, como el lexer al separar los tokens); cualquier otro valor
+    queda igual. Un char es lo que acepta el token CHAR del lexer: un carácter que no es
+    comilla ni barra, o una barra y el carácter escapado ('\\n').
+    """
+    if type(item) is str and len(item) >= 2 and item[0] == item[-1]:
+        if item[0] == '"':
+            return StringLiteral(item)
+        if item[0] == "'" and (len(item) == 3 and item[1] not in "'\\"
+                               or len(item) == 4 and item[1] == '\\'):
+            return CharLiteral(item)
+    return item
+
+
+class _Text(str):
+    """Texto ya formateado dentro de la pila de format_ast (no es un valor del AST)."""
+
+
+def format_ast(ast):
+    """
+    Texto del AST igual al de repr() de sus tuplas, armado con una pila explícita para que un
+    AST muy profundo no exceda el límite de recursión al imprimirlo.
+    """
+    parts = []
+    pending = [ast]
+    while pending:
+        node = pending.pop()
+        if type(node) is _Text:
+            parts.append(node)
+            continue
+        if isinstance(node, Node):
+            node = node.as_tuple()
+        if isinstance(node, (list, tuple)):
+            if isinstance(node, list):
+                parts.append('[')
+                pending.append(_Text(']'))
+            else:
+                parts.append('(')
+                pending.append(_Text(',)' if len(node) == 1 else ')'))
+            # Los elementos se apilan al revés para salir en orden, separados por ', '
+            for i in range(len(node) - 1, -1, -1):
+                pending.append(node[i])
+                if i:
+                    pending.append(_Text(', '))
+        else:
+            parts.append(repr(node))
+    return ''.join(parts)
+
+
+def _rebuild(ast, build, leaf=None):
+    """
+    Copia de un AST (o de una parte) con una pila explícita: listas y tuplas se copian con sus
+    elementos ya copiados, cada nodo se recorre como su tupla, y `build` arma el resultado de
+    cada tupla a partir de sus elementos copiados (`leaf`, si se da, convierte los demás).
+    """
+    root = []
+    frames = [(list, iter((ast,)), root)]  # (armar, elementos por copiar, elementos copiados)
+    while frames:
+        make, items, done = frames[-1]
+        for item in items:
+            if isinstance(item, Node):
+                item = item.as_tuple()
+            if type(item) is list:
+                frames.append((list, iter(item), []))
+                break
+            if type(item) is tuple:
+                frames.append((build, iter(item), []))
+                break
+            done.append(item if leaf is None else leaf(item))
+        else:
+            frames.pop()
+            if frames:
+                frames[-1][2].append(make(done))
+    return root[0]
+
+
+def to_tuple(ast):
+    """AST (o nodo) con tuplas en vez de nodos, como lo producía el parser antes."""
+    return _rebuild(ast, tuple)
+
+
+def _node_from_items(items):
+    tag = items[0]
+    if tag == 'DECLARATION':
+        if items[1] == 'const':
+            return Declaration(items[2], items[3], items[4], True)
+        return Declaration(items[1], items[2], items[3] if len(items) == 4 else None)
+    if tag == 'ASSIGNMENT':
+        return Assignment(items[1], items[2])
+    if tag == 'IF':
+        return If(items[1], items[2])
+    if tag == 'IF_ELSE':
+        return IfElse(items[1], items[2], items[3])
+    if tag == 'WHILE':
+        return While(items[1], items[2])
+    if tag == 'RETURN':
+        return Return(items[1])
+    if tag == 'FUNC_DECL':
+        return FuncDecl(*items[1:])
+    if tag == 'FUNC_CALL':
+        return FuncCall(items[1], items[2])
+    if tag == 'BLOCK_ENTER':
+        return BLOCK_ENTER_NODE
+    if tag == 'BLOCK_EXIT':
+        return BLOCK_EXIT_NODE
+    if tag == 'NOT':
+        return Not(items[1])
+    if tag == 'CAST':
+        return Cast(items[1], items[2])
+    if len(items) == 3:
+        return Binary(*items)
+    raise ValueError(f"Tupla del AST no reconocida: {tuple(items)}")
+
+
+def from_tuple(ast):
+    """AST (o nodo) de nodos a partir de las tuplas del formato anterior."""
+    return _rebuild(ast, _node_from_items, literal_leaf)
+
+
+def literal_type(leaf):
+    """
+    Tipo de una hoja de expresión literal ('int', 'float', 'bool', 'string' o 'char'), o None
+    si no es un literal (un str que no es un Literal es un nombre de variable). El de un string
+    o char es el registrado en la hoja; el de un número o booleano, su tipo de Python.
+    """
+    if isinstance(leaf, str):
+        return leaf.type if isinstance(leaf, Literal) else None
+    if isinstance(leaf, bool):
+        return 'bool'
+    if isinstance(leaf, int):
+        return 'int'
+    if isinstance(leaf, float):
+        return 'float'
+    return None
+
+
+def is_variable(leaf):
+    """True si una hoja de expresión es un nombre de variable (no un número ni un literal)."""
+    return isinstance(leaf, str) and literal_type(leaf) is None
+
+
+# Nodos compartidos por un ExpressionPool. Agregan dos campos:
+#   - free_vars: variables de la expresión en el orden en que se leen, sin repetir, o None si
+#     tiene llamadas a función (su tipo depende de la función y el generador no reutiliza su
+#     resultado, así que no se guarda nada para ese nodo).
+#   - checked: (tipos de free_vars, tipo de la expresión) del último chequeo del semántico, o
+#     None; el nodo aparece en ámbitos distintos, así que el tipo sirve solo mientras sus
+#     variables tengan los mismos tipos.
+class SharedBinary(Binary):
+    __slots__ = ('free_vars', 'checked')
+
+
+class SharedNot(Not):
+    __slots__ = ('free_vars', 'checked')
+
+
+class SharedCast(Cast):
+    __slots__ = ('free_vars', 'checked')
+
+
+class ExpressionPool:
+    """
+    Tabla de expresiones compartidas (hash-consing). intern(expr) devuelve la expresión con
+    cada subárbol reemplazado por el nodo único de su estructura, así que una subexpresión que
+    se repite en el programa es un solo nodo. Los nodos sin llamadas a función se comparten
+    como SharedBinary, SharedNot o SharedCast, que llevan lo que el semántico calculó para
+    ellos; los temporales los guarda el propio CodeGenerator, que sabe cuándo dejan de valer.
+    """
+
+    def __init__(self):
+        self.nodes = {}  # Estructura -> nodo único
+        self.var_lists = {}  # Tuplas de free_vars, una por cada lista de variables distinta
+        self.interned = 0  # Nodos que pasaron por intern()
+        self.shared = 0  # Nodos distintos que quedaron compartidos
+        self.type_evals = 0  # Subexpresiones evaluadas por el semántico con este pool
+        self.type_hits = 0  # Subexpresiones cuyo tipo salió de `checked`
+
+    def release(self):
+        """
+        Suelta la tabla de estructuras cuando ya no se esperan expresiones nuevas. Los nodos
+        compartidos conservan sus campos; una expresión analizada después (el cuerpo de una
+        función que se analiza al llamarla) solo se comparte con las que lleguen después.
+        """
+        self.nodes = {}
+        self.var_lists = {}
+
+    def intern(self, expr):
+        """Expresión equivalente con los subárboles compartidos (recorrido en postorden)."""
+        nodes = self.nodes
+        results = []  # Subexpresiones ya compartidas
+        pending = [expr]  # Subexpresiones por recorrer, y (nodo,) por armar con sus hijos
+        while pending:
+            item = pending.pop()
+            if isinstance(item, Node):
+                pending.append((item,))
+                kind = item.kind
+                if kind == BINARY:
+                    pending.append(item.right)
+                    pending.append(item.left)
+                elif kind == FUNC_CALL:
+                    pending.extend(reversed(item.args))
+                elif kind == NOT:
+                    pending.append(item.operand)
+                else:  # CAST
+                    pending.append(item.expr)
+                continue
+            if type(item) is not tuple:
+                results.append(item)  # Hoja: número, booleano o string
+                continue
+
+            # Los hijos ya están en `results`: la llave lleva cada hijo (los nodos se comparan
+            # por identidad) con su tipo, para no confundir 1, 1.0 y True
+            node = item[0]
+            self.interned += 1
+            kind = node.kind
+            if kind == BINARY:
+                right = results.pop()
+                left = results.pop()
+                key = (node.op, left, type(left), right, type(right))
+                shared = nodes.get(key)
+                if shared is None:
+                    nodes[key] = shared = self.share(SharedBinary(node.op, left, right), (left, right))
+            elif kind == NOT:
+                operand = results.pop()
+                key = (kind, operand, type(operand))
+                shared = nodes.get(key)
+                if shared is None:
+                    nodes[key] = shared = self.share(SharedNot(operand), (operand,))
+            elif kind == CAST:
+                inner = results.pop()
+                key = (kind, node.cast_type, inner, type(inner))
+                shared = nodes.get(key)
+                if shared is None:
+                    nodes[key] = shared = self.share(SharedCast(node.cast_type, inner), (inner,))
+            else:  # FUNC_CALL
+                count = len(node.args)
+                args = results[len(results) - count:]
+                del results[len(results) - count:]
+                key = (kind, node.name, *args, *map(type, args))
+                shared = nodes.get(key)
+                if shared is None:
+                    node.args = args
+                    nodes[key] = shared = node
+                    self.shared += 1
+            results.append(shared)
+        return results.pop()
+
+    def share(self, node, children):
+        """Completa un nodo compartido nuevo: sus variables (o None si tiene llamadas)."""
+        self.shared += 1
+        names = []
+        for child in children:
+            if isinstance(child, Node):
+                child_vars = getattr(child, 'free_vars', None)
+                if child_vars is None:
+                    node.free_vars = None
+                    node.checked = None
+                    return node
+                names.extend(name for name in child_vars if name not in names)
+            elif is_variable(child) and child not in names:
+                names.append(child)
+        # Las tuplas iguales se comparten: muchos nodos leen las mismas variables
+        names = tuple(names)
+        node.free_vars = self.var_lists.setdefault(names, names)
+        node.checked = None
+        return node
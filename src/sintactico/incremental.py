@@ -0,0 +1,283 @@
+"""
+Análisis sintáctico incremental para códigos fuente editados.
+
+IncrementalParser recuerda el último análisis: el AST, el primer token de cada sentencia de
+primer nivel y una caché de sentencias con su texto como llave (el diccionario guarda el
+hash del texto). Al recibir el flujo de tokens del código editado (por ejemplo, el que
+devuelve relex()) busca el tramo de texto que cambió y vuelve a analizar solo las sentencias
+de primer nivel que lo tocan; un 'if' de primer nivel se analiza entero si se editó algo
+dentro de sus bloques. Las sentencias anteriores y posteriores a la edición se reutilizan
+sin mirarlas, y dentro del tramo editado se reutiliza cualquier sentencia cuyo texto ya
+esté en la caché.
+
+Las sentencias del tramo editado se cortan sin analizarlas: cada una termina en un ';' o en
+la '}' que cierra su bloque, ambos fuera de cualquier bloque (un 'else' después de la '}'
+continúa el 'if'). El tramo termina en cuanto un corte cae, pasada la edición, donde
+empezaba una sentencia del análisis anterior: desde ahí el texto es el mismo, y también lo
+son los tokens y las sentencias. Si alguna sentencia nueva no se puede analizar por sí sola
+(un error de sintaxis, o un corte que no coincide con el del parser), se analiza el programa
+completo con parser(), que da el mismo AST o el mismo error que sin caché.
+
+Una sentencia con una función declarada adentro (por ejemplo, dentro de un 'if') no entra
+en la caché y se vuelve a analizar si queda después de la edición, porque el cuerpo de esa
+función guarda posiciones de tokens que se corren con la edición. Las declaraciones
+reutilizadas conservan también el desplazamiento (`offset`) del análisis que las creó: el AST
+es el mismo que el de parser(), pero para ubicar diagnósticos hay que analizar de nuevo.
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+from operator import add
+
+from src.lexico.lexer import kind_codes
+from src.lexico.incremental import LOOKAHEAD
+from .parser import parser, parse_range, FunctionBody
+from .ast_nodes import FuncDecl, FUNC_DECL
+
+LBRACE = kind_codes['LBRACE']
+RBRACE = kind_codes['RBRACE']
+KEYWORD = kind_codes['KEYWORD']
+
+# Tokens que pueden cerrar una sentencia o cambiar la profundidad de bloques. Se buscan con
+# una expresión regular sobre el arreglo de tipos, así que el corte no recorre en Python los
+# tokens que no son ';', '{' ni '}'.
+structure_regex = re.compile(b'[' + re.escape(bytes(
+    [kind_codes['SEMICOLON'], LBRACE, RBRACE])) + b']')
+
+# Tamaño de los tramos en que se compara el código anterior con el nuevo
+COMPARE_CHUNK = 1 << 16
+
+
+def statement_ends(tokens, position):
+    """
+    Genera el índice siguiente al último token de cada sentencia de primer nivel desde el
+    token `position` (que debe empezar una sentencia). Una sentencia sin terminar al final
+    del flujo termina en len(tokens).
+    """
+    kinds = tokens.kinds
+    count = len(kinds)
+    depth = 0
+
+    for match in structure_regex.finditer(kinds, position):
+        i = match.start()
+        kind = kinds[i]
+        if kind == LBRACE:
+            depth += 1
+            continue
+        if kind == RBRACE:
+            depth -= 1
+            if depth or (i + 1 < count and kinds[i + 1] == KEYWORD and tokens[i + 1][1] == 'else'):
+                continue
+        elif depth:
+            continue
+        yield i + 1
+        position = i + 1
+
+    if position < count:
+        yield count
+
+
+def parse_one(tokens, start, stop):
+    """
+    (nodo, tiene funciones adentro) de la sentencia en los tokens [start, stop), o None si
+    el rango no es exactamente una sentencia válida.
+    """
+    spans = []
+    try:
+        statements = parse_range(tokens, start, stop, tokens.line_index, spans=spans)
+    except (SyntaxError, IndexError):
+        return None
+    if len(statements) != 1:
+        return None
+    node = statements[0]
+    return node, node.kind != FUNC_DECL and spans[0][2] != 0
+
+
+def common_prefix(a, b):
+    """Largo del prefijo común de dos textos, comparando por tramos."""
+    size = min(len(a), len(b))
+    low = 0
+    while low < size:
+        high = min(low + COMPARE_CHUNK, size)
+        if a[low:high] != b[low:high]:
+            # La diferencia está en este tramo: búsqueda binaria (a[:low] coincide, a[:high] no)
+            while high - low > 1:
+                middle = (low + high) // 2
+                if a[low:middle] == b[low:middle]:
+                    low = middle
+                else:
+                    high = middle
+            return low
+        low = high
+    return size
+
+
+def common_suffix(a, b, limit):
+    """Largo del sufijo común de dos textos, sin pasar de `limit` caracteres."""
+    len_a, len_b = len(a), len(b)
+    low = 0
+    while low < limit:
+        high = min(low + COMPARE_CHUNK, limit)
+        if a[len_a - high:len_a - low] != b[len_b - high:len_b - low]:
+            while high - low > 1:
+                middle = (low + high) // 2
+                if a[len_a - middle:len_a - low] == b[len_b - middle:len_b - low]:
+                    low = middle
+                else:
+                    high = middle
+            return low
+        low = high
+    return limit
+
+
+class IncrementalParser:
+    """
+    Parser que reutiliza las sentencias del análisis anterior. parse(tokens) devuelve el AST
+    (igual al de parser(tokens)) y el conjunto de índices de las sentencias que cambiaron;
+    las demás no cambiaron respecto del análisis anterior (antes y después de la edición son
+    los mismos nodos, salvo las declaraciones de función, que se copian para que su cuerpo
+    apunte al flujo nuevo), así que las fases siguientes pueden limitarse a las cambiadas.
+    """
+
+    def __init__(self):
+        self.tokens = None  # Flujo del último análisis exitoso
+        self.ast = []
+        self.starts = array('q')  # Primer token de cada sentencia, y len(tokens) al final
+        self.nested = set()  # Sentencias (índices) con funciones declaradas adentro
+        # Texto de una sentencia -> [nodo, inicio del cuerpo respecto de la sentencia (solo en
+        # declaraciones de función), cantidad de sentencias con ese texto]
+        self.cache = {}
+
+    def parse(self, tokens):
+        old = self.tokens
+        if old is None:
+            return self.parse_all(tokens)  # Primer análisis: nada que reutilizar
+
+        # Tramo de texto que cambió: [prefix, len - suffix) en cada versión
+        old_source, source = old.source_code, tokens.source_code
+        prefix = common_prefix(old_source, source)
+        suffix = common_suffix(old_source, source, min(len(old_source), len(source)) - prefix)
+        edit_end = len(source) - suffix
+        offset_delta = len(source) - len(old_source)
+
+        old_ast, starts, count = self.ast, self.starts, len(self.ast)
+
+        # Primera sentencia a revisar: la anterior a la primera que termina cerca de la
+        # edición (un 'else' agregado justo después de un 'if' lo continuaría)
+        first = bisect_left(range(count), prefix - LOOKAHEAD + 1, key=lambda k: old.end(starts[k + 1] - 1))
+        first = max(first - 1, 0)
+
+        # Cortar sentencias nuevas hasta sincronizar con el inicio de una sentencia anterior
+        spans = []
+        position = starts[first]
+        sync = count  # Primera sentencia anterior que se reutiliza al final
+        token_delta = 0
+        for end in statement_ends(tokens, position):
+            spans.append((position, end))
+            position = end
+            if end < len(tokens) and tokens.start(end) >= edit_end:
+                old_offset = tokens.start(end) - offset_delta
+                j = bisect_left(range(count), old_offset, lo=first, key=lambda k: old.start(starts[k]))
+                if j < count and old.start(starts[j]) == old_offset:
+                    sync = j
+                    token_delta = end - starts[j]
+                    break
+
+        # Sentencias del tramo: de la caché o analizadas una por una
+        cache = self.cache
+        old_texts = [old.text(old.start(starts[k]), old.end(starts[k + 1] - 1)) for k in range(first, sync)]
+        middle = []
+        texts = []
+        changed = set()
+        nested = {k for k in self.nested if k < first}
+        for i, (start, stop) in enumerate(spans):
+            text = tokens.text(tokens.start(start), tokens.end(stop - 1))
+            entry = cache.get(text)
+            if entry is not None:
+                node = entry[0]
+                if node.kind == FUNC_DECL:
+                    node = self.move_function(node, tokens, start + entry[1])
+            else:
+                parsed = parse_one(tokens, start, stop)
+                if parsed is None:
+                    return self.parse_all(tokens)
+                node, has_functions = parsed
+                if has_functions:
+                    nested.add(first + i)
+                    text = None  # No entra en la caché
+            if i >= len(old_texts) or text != old_texts[i]:
+                changed.add(first + i)
+            middle.append(node)
+            texts.append(text)
+
+        # Sentencias posteriores a la edición: las mismas, con las funciones que declaran
+        # apuntando al flujo nuevo
+        suffix_nodes = [self.move_function(node, tokens, node.body.start + token_delta)
+                        if node.kind == FUNC_DECL else node for node in old_ast[sync:]]
+        index_delta = first + len(middle) - sync
+        for k in self.nested:
+            if k >= sync:
+                parsed = parse_one(tokens, starts[k] + token_delta, starts[k + 1] + token_delta)
+                suffix_nodes[k - sync] = parsed[0]
+                nested.add(k + index_delta)
+
+        # Caché: salen las sentencias reemplazadas y entran las nuevas
+        for text in old_texts:
+            entry = cache.get(text)
+            if entry is not None:
+                entry[2] -= 1
+                if not entry[2]:
+                    del cache[text]
+        for text, node, (start, _) in zip(texts, middle, spans):
+            if text is not None:
+                self.remember(text, node, start)
+
+        self.ast = old_ast[:first] + middle + suffix_nodes
+        self.starts = (starts[:first] + array('q', [start for start, _ in spans]) +
+                       array('q', map(add, starts[sync:], repeat(token_delta))))
+        self.starts[-1] = len(tokens)
+        self.nested = nested
+        self.tokens = tokens
+        return self.ast, changed
+
+    def parse_all(self, tokens):
+        """
+        Análisis completo (o su error), la primera vez o cuando el corte en sentencias no
+        sirve; la caché se arma con los rangos de sentencia que da el propio parser.
+        """
+        spans = []
+        ast = parser(tokens, spans)
+        self.cache = {}
+        self.nested = set()
+        for i, (node, (start, stop, functions)) in enumerate(zip(ast, spans)):
+            if functions and node.kind != FUNC_DECL:
+                self.nested.add(i)
+            else:
+                self.remember(tokens.text(tokens.start(start), tokens.end(stop - 1)), node, start)
+        self.ast = ast
+        self.starts = array('q', [start for start, _, _ in spans] + [len(tokens)])
+        self.tokens = tokens
+        return ast, set(range(len(ast)))
+
+    def remember(self, text, node, start):
+        """Agrega a la caché una sentencia que empieza en el token `start`."""
+        entry = self.cache.get(text)
+        if entry is None:
+            body_start = node.body.start - start if node.kind == FUNC_DECL else None
+            self.cache[text] = [node, body_start, 1]
+        else:
+            entry[2] += 1
+
+    @staticmethod
+    def move_function(node, tokens, body_start):
+        """
+        Declaración de función reutilizada: su cuerpo apunta al flujo nuevo, desde el token
+        `body_start`, y conserva las sentencias si ya se habían analizado.
+        """
+        body = node.body
+        moved = FunctionBody(tokens, body_start, body_start + body.stop - body.start,
+                             body.param_names, tokens.line_index, body.pool)
+        moved._statements = body._statements
+        return FuncDecl(node.name, node.param_types, node.return_type, moved)
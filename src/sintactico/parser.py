@@ -4,93 +4,189 @@
 # Desarrollado por: Ing. Jonathan Torres, Ph.D.
 # -------------------------------------------------------------
 
-
-# Variable global para la última línea procesada
-last_token_line = None
-
-# Función principal que maneja el análisis sintáctico
-def parser(tokens):
-    global last_token_line
-
-    tokens = tokens.copy()
+from .ast_nodes import (
+    Declaration, Assignment, If, IfElse, Return, FuncDecl, FuncCall, Binary, Not, Cast,
+    StringLiteral, CharLiteral, BLOCK_ENTER_NODE, BLOCK_EXIT_NODE,
+)
+
+
+# Cursor sobre los tokens que consume el analizador: peek() mira el token actual, advance() lo
+# consume y su valor de verdad indica si quedan tokens. Avanzar no mueve ni copia los tokens
+# restantes, así que analizar es lineal en la cantidad de tokens. Sirve igual para un
+# TokenStream (o una lista) que para un flujo perezoso (iter_tokens). Con `start` y `stop`
+# recorre solo los tokens [start, stop) de un TokenStream o lista.
+# El cursor lleva también el estado del análisis en curso (índice de líneas, último token
+# procesado, pool de expresiones, funciones declaradas): las funciones del parser lo reciben
+# como `tokens` y no hay estado global, así que dos análisis (en el mismo hilo, como el cuerpo
+# de una función que se analiza en medio del semántico, o en hilos distintos) no se mezclan.
+class TokenCursor:
+    def __init__(self, tokens, start=0, stop=None, line_index=None, pool=None):
+        # Tokens indexables (TokenStream o lista) a los que se puede volver por posición
+        self.source = tokens if hasattr(tokens, '__getitem__') else None
+        if stop is None:
+            self.tokens = iter(tokens)
+        else:
+            self.tokens = map(tokens.__getitem__, range(start, stop))
+        self.index = start  # Posición del token actual en `tokens` (tokens consumidos)
+        self.last_offset = None  # Desplazamiento del último token leído
+        self.current = None  # Token actual (None al final)
+        # Índice de líneas del código fuente (para los mensajes de error)
+        self.line_index = line_index if line_index is not None else getattr(tokens, 'line_index', None)
+        # Desplazamiento del último token procesado (su línea se calcula al reportar errores)
+        self.last_token_offset = None
+        self.pool = pool  # Pool de expresiones compartidas (ExpressionPool), o None
+        # Cantidad de declaraciones de función analizadas (el parser incremental la usa para
+        # saber qué sentencias tienen funciones declaradas adentro)
+        self.functions = 0
+        self.fill()
+
+    def fill(self):
+        self.current = next(self.tokens, None)
+        if self.current is not None:
+            self.last_offset = self.current[2]
+
+    def __bool__(self):
+        return self.current is not None
+
+    def peek(self):
+        if self.current is None:
+            raise IndexError("list index out of range")  # Mismo error que una lista vacía
+        return self.current
+
+    def advance(self):
+        token = self.current
+        if token is None:
+            raise IndexError("list index out of range")
+        self.index += 1
+        self.fill()
+        return token
+
+# Cuerpo de una función guardado como un rango de tokens [start, stop) sin las llaves: el parser
+# solo cuenta llaves para saltarlo y las sentencias se analizan la primera vez que alguien las
+# pide (statements()), cuando el semántico o el generador encuentran una llamada a la función.
+# Un programa que declara muchas funciones y llama pocas solo analiza los cuerpos que usa.
+class FunctionBody:
+    def __init__(self, tokens, start, stop, param_names, line_index, pool=None, param_offsets=None):
+        self.tokens = tokens  # TokenStream, lista, o solo los tokens del cuerpo si venían de un flujo
+        self.start = start
+        self.stop = stop
+        self.param_names = param_names
+        # Desplazamiento del nombre de cada parámetro en el código fuente (para los diagnósticos)
+        self.param_offsets = param_offsets if param_offsets is not None else [None] * len(param_names)
+        self.param_storage = None  # Nombres de los parámetros en las cuádruplas (los anota el semántico)
+        self.line_index = line_index
+        self.pool = pool  # ExpressionPool del programa (las expresiones del cuerpo también se comparten)
+        self._statements = None  # Sentencias ya analizadas (None hasta la primera llamada)
+
+    def __repr__(self):
+        return f"FunctionBody({self.start}, {self.stop})"
+
+    def statements(self):
+        """Sentencias del cuerpo; se analizan una sola vez y quedan guardadas."""
+        if self._statements is None:
+            self._statements = parse_range(self.tokens, self.start, self.stop, self.line_index, self.pool)
+        return self._statements
+
+# Analiza las sentencias de los tokens [start, stop) (un cuerpo de función guardado, o una
+# sentencia en el parser incremental) con su propio cursor, así que puede ocurrir en medio de
+# otra fase o de otro análisis. `spans` funciona como en parser().
+def parse_range(tokens, start, stop, lines, pool=None, spans=None):
+    cursor = TokenCursor(tokens, start, stop, lines, pool)
+    # Un error de fin de entrada se reporta en el último token del rango (o en el anterior,
+    # la '{' de un cuerpo vacío)
+    cursor.last_token_offset = tokens[max(stop, start) - 1][2]
+    statements = []
+    while cursor:
+        start = cursor.index
+        functions = cursor.functions
+        statements.append(parse_statement(cursor))
+        if spans is not None:
+            spans.append((start, cursor.index, cursor.functions - functions))
+    return statements
+
+# Función principal que maneja el análisis sintáctico. Si se pasa `spans`, se le agrega por
+# cada sentencia el rango [inicio, fin) de sus tokens y cuántas funciones declara (lo usa el
+# parser incremental). Con un `pool` (ExpressionPool) las subexpresiones iguales del programa
+# son un mismo nodo.
+def parser(tokens, spans=None, pool=None):
     ast = []
 
-    last_token = tokens[-1]
-    last_token_line = last_token[2]
+    if hasattr(tokens, '__len__'):
+        last_token = tokens[-1]
+        last_token_offset = last_token[2]
+    else:
+        # Flujo perezoso: el último token solo se conoce al llegar al final (ver line_of)
+        last_token_offset = None
+    tokens = TokenCursor(tokens, pool=pool)
+    tokens.last_token_offset = last_token_offset
 
     while tokens:
         # Salta tokens de espacios o saltos de línea si los hubiera (opcional)
-        if tokens[0][0] in ('WHITESPACE', 'NEWLINE'):
-            tokens.pop(0)
+        if tokens.peek()[0] in ('WHITESPACE', 'NEWLINE'):
+            tokens.advance()
             continue
+        start = tokens.index
+        functions = tokens.functions
         try:
             ast.append(parse_statement(tokens))
         except SyntaxError as e:
             raise SyntaxError(str(e))
+        if spans is not None:
+            spans.append((start, tokens.index, tokens.functions - functions))
     return ast # Retorna el árbol de sintaxis abstracta (AST)
 
-# Función para procesar una sentencia del código
+# Función para procesar una sentencia del código: el primer token decide qué función la procesa
+# (ver statement_parsers al final de las funciones de sentencias)
 def parse_statement(tokens):
-    # Sentencia return
-    if match_keyword(tokens, 'return'):
-        tokens.pop(0)  # Consume 'return'
-        expr = parse_expression(tokens)  # Puede ser una constante, una variable, etc.
-        parse_semi(tokens)  # Asegura que haya punto y coma
-        return ('RETURN', expr)
-    
-    # Acepta declaraciones con o sin 'const'
-    if match_keyword(tokens, 'const') or \
-       match_keyword(tokens, 'int') or \
-       match_keyword(tokens, 'float') or \
-       match_keyword(tokens, 'string') or \
-       match_keyword(tokens, 'bool') or \
-       match_keyword(tokens, 'char'):
-        return parse_declaration(tokens)
-
-    # Si el primer token es 'if', procesamos una estructura condicional
-    elif match_keyword(tokens, 'if'):
-        return parse_if(tokens)
-
-    # Si el primer token es un identificador, procesamos una asignación
-    elif match(tokens, 'IDENTIFIER'):
-        return parse_assignment(tokens)
-
-    # Si no es ninguno de los anteriores, es un error de sintaxis
-    else:
-        tipo, val, line, col = tokens[0]
-        raise SyntaxError(f"Error en línea {line}, columna {col}: sentencia inválida, token inesperado '{val}'")
+    tk_type, tk_val, offset = tokens.peek()
+    handler = statement_parsers.get(tk_val if tk_type == 'KEYWORD' else tk_type)
+    if handler is not None:
+        return handler(tokens)
+
+    # Si no es ninguna sentencia conocida, es un error de sintaxis
+    line, col = tokens.line_index.position(offset)
+    raise SyntaxError(f"Error en línea {line}, columna {col}: sentencia inválida, token inesperado '{tk_val}'")
+
+# Función para procesar una sentencia return
+def parse_return(tokens):
+    tokens.advance()  # Consume 'return'
+    expr = parse_expression(tokens)  # Puede ser una constante, una variable, etc.
+    parse_semi(tokens)  # Asegura que haya punto y coma
+    return Return(expr)
 
 # Función para procesar una declaración (ejemplo: int a = 5;)
 def parse_declaration(tokens):
     # Soporta declaraciones con 'const <tipo> <ident> = <expr>;'
     if match_keyword(tokens, 'const'):
-        tokens.pop(0)  # Consume 'const'
+        tokens.advance()  # Consume 'const'
         # Ahora debe venir el tipo
         tipo = parse_type(tokens)
         # Ahora debe venir el identificador
         ident = parse_id(tokens)
+        offset = tokens.last_token_offset  # Desplazamiento del nombre, para los diagnósticos
         # Solo se permite declaración de constante con inicialización obligatoria
         if match(tokens, 'SEMICOLON'):
-            tokens.pop(0)
+            tokens.advance()
             raise SyntaxError("Una constante debe ser inicializada al declararse")
         parse_equals(tokens)
         expr = parse_expression(tokens)
         parse_semi(tokens)
-        return ('DECLARATION', 'const', tipo, ident, expr)
+        return Declaration(tipo, ident, expr, const=True, offset=offset)
     else:
         tipo = parse_type(tokens)
         ident = parse_id(tokens)
         if match(tokens, 'LPAREN'):
             return parse_function_declaration(tipo, ident, tokens)
+        offset = tokens.last_token_offset
 
         if match(tokens, 'SEMICOLON'):
-            tokens.pop(0)
-            return ('DECLARATION', tipo, ident)
+            tokens.advance()
+            return Declaration(tipo, ident, offset=offset)
         
         parse_equals(tokens)
         expr = parse_expression(tokens)
         parse_semi(tokens)
-        return ('DECLARATION', tipo, ident, expr)
+        return Declaration(tipo, ident, expr, offset=offset)
     
 # Función para procesar una asignación, por ejemplo: 'a = 5'
 def parse_assignment(tokens):
@@ -107,15 +203,65 @@ def parse_assignment(tokens):
     parse_semi(tokens)
     
     # Retornar la estructura de la asignación
-    return ('ASSIGNMENT', ident, expr)
+    return Assignment(ident, expr)
 
-# Función para procesar una estructura condicional 'if' con soporte para 'else'
+# Función para procesar una estructura condicional 'if' con soporte para 'else'.
+# Los 'if' anidados no se procesan con recursión: cada 'if' abierto se guarda en una pila y
+# recibe las sentencias de su bloque hasta encontrar su '}', así que la profundidad de
+# anidamiento no depende del límite de recursión de Python.
 def parse_if(tokens):
+    open_ifs = []  # 'if' externos cuyo bloque sigue abierto
+    frame = parse_if_header(tokens)
+
+    while True:
+        if_offset, cond, then_block, else_block = frame
+        block = then_block if else_block is None else else_block
+
+        # Procesar sentencias dentro del bloque actual
+        if tokens and not match(tokens, 'RBRACE'):
+            if match_keyword(tokens, 'if'):
+                open_ifs.append(frame)
+                frame = parse_if_header(tokens)
+            else:
+                block.append(parse_statement(tokens))
+            continue
+        block.append(BLOCK_EXIT_NODE)  # Marcar salida del bloque
+
+        # Si no hemos encontrado la llave de cierre 'RBRACE' y ya no quedan tokens, lanzar error
+        if not match(tokens, 'RBRACE'):
+            if_line, if_col = tokens.line_index.position(if_offset)
+            block_name = 'if' if else_block is None else 'else'
+            raise SyntaxError(f"Error en línea {if_line}, columna {if_col}: falta '}}' de cierre en el bloque '{block_name}'")
+
+        # Consumir la llave de cierre 'RBRACE'
+        tokens.advance()
+
+        # Verificar si hay un 'else' después del bloque then
+        if else_block is None and tokens and match_keyword(tokens, 'else'):
+            tokens.advance()  # Consume 'else'
+            expect(tokens, 'LBRACE')  # Espera la llave de apertura '{'
+            frame[3] = [BLOCK_ENTER_NODE]  # Marcar entrada al bloque else
+            continue
+
+        # Estructura del bloque 'if' con su condición, bloque then y bloque else (si existe)
+        if else_block is not None:
+            node = IfElse(cond, then_block, else_block)
+        else:
+            node = If(cond, then_block)
+
+        if not open_ifs:
+            return node
+        # El 'if' terminado es una sentencia del bloque del 'if' que lo contiene
+        frame = open_ifs.pop()
+        (frame[2] if frame[3] is None else frame[3]).append(node)
+
+# Procesa 'if (condición) {' y devuelve el 'if' abierto: [posición, condición, bloque then, bloque else]
+def parse_if_header(tokens):
     # Verificamos si el primer token es la palabra clave 'if'
     expect_keyword(tokens, 'if')
 
-    # Guardamos la información de la línea y columna del 'if' para mostrarla en caso de error
-    if_line, if_col = tokens[0][2], tokens[0][3]
+    # Guardamos la posición del 'if' para mostrar su línea y columna en caso de error
+    if_offset = tokens.peek()[2]
 
     # Espera el paréntesis de apertura '('
     expect(tokens, 'LPAREN')
@@ -129,330 +275,351 @@ def parse_if(tokens):
     # Espera la llave de apertura '{'
     expect(tokens, 'LBRACE')
 
-    then_block = [('BLOCK_ENTER',)]  # Marcar entrada al bloque then
-    # Procesar sentencias dentro del bloque if
-    while tokens and not match(tokens, 'RBRACE'):
-        then_block.append(parse_statement(tokens))
-    then_block.append(('BLOCK_EXIT',))  # Marcar salida del bloque then
-
-    # Si no hemos encontrado la llave de cierre 'RBRACE' y ya no quedan tokens, lanzar error
-    if not match(tokens, 'RBRACE'):
-        raise SyntaxError(f"Error en línea {if_line}, columna {if_col}: falta '}}' de cierre en el bloque 'if'")
-
-    # Consumir la llave de cierre 'RBRACE'
-    tokens.pop(0)
-
-    # Verificar si hay un 'else'
-    else_block = None
-    if tokens and match_keyword(tokens, 'else'):
-        tokens.pop(0)  # Consume 'else'
-        
-        # Espera la llave de apertura '{'
-        expect(tokens, 'LBRACE')
-        
-        else_block = [('BLOCK_ENTER',)]  # Marcar entrada al bloque else
-        # Procesar sentencias dentro del bloque else
-        while tokens and not match(tokens, 'RBRACE'):
-            else_block.append(parse_statement(tokens))
-        else_block.append(('BLOCK_EXIT',))  # Marcar salida del bloque else
-        
-        # Si no hemos encontrado la llave de cierre 'RBRACE' y ya no quedan tokens, lanzar error
-        if not match(tokens, 'RBRACE'):
-            raise SyntaxError(f"Error en línea {if_line}, columna {if_col}: falta '}}' de cierre en el bloque 'else'")
-        
-        # Consumir la llave de cierre 'RBRACE'
-        tokens.pop(0)
+    return [if_offset, cond, [BLOCK_ENTER_NODE], None]  # Marcar entrada al bloque then
+
+# Tabla de despacho de sentencias: palabra clave (o tipo de token, si no es palabra clave) del
+# primer token -> función que procesa la sentencia. Acepta declaraciones con o sin 'const'.
+statement_parsers = {
+    'return': parse_return,
+    'const': parse_declaration,
+    'int': parse_declaration,
+    'float': parse_declaration,
+    'string': parse_declaration,
+    'bool': parse_declaration,
+    'char': parse_declaration,
+    'if': parse_if,
+    'IDENTIFIER': parse_assignment,
+}
+
+# Tabla de operadores binarios: valor del operador -> precedencia (mayor precedencia, se agrupa primero).
+# Todos asocian por la izquierda. Los valores no chocan con otros tokens: cadenas y caracteres
+# conservan sus comillas. Agregar un operador es agregar una entrada aquí.
+binary_operators = {
+    '==': 1, '!=': 1, '<': 1, '>': 1, '<=': 1, '>=': 1,  # Comparaciones
+    '+': 2, '-': 2,  # Adición y sustracción
+    '*': 3, '/': 3,  # Multiplicación y división
+}
+
+# Agrupaciones de una expresión: el primario que abre una agrupación (paréntesis, cast o
+# llamada a función) deja su contenido como una expresión anidada en la pila del analizador.
+GROUP_TOP = 0  # La expresión completa
+GROUP_PAREN = 1  # ( expr )
+GROUP_CAST = 2  # int( expr ), float( expr ), string( expr )
+GROUP_CALL = 3  # nombre( expr, expr, ... )
+
+# Función para procesar expresiones por precedencia sin recursión: los operandos y los operadores
+# binarios pendientes de cada agrupación se guardan en pilas; antes de apilar un operador se
+# reducen los pendientes de precedencia mayor o igual (asociatividad por la izquierda). Las
+# agrupaciones abiertas también van en una pila, así que ni las cadenas largas de operadores ni
+# los paréntesis o '!' anidados dependen del límite de recursión de Python. Produce los mismos
+# nodos Binary(op, izquierda, derecha) que el análisis por precedencia recursivo.
+def parse_expression(tokens):
+    operators = binary_operators
+    groups = []  # Agrupaciones externas: (tipo, dato, negaciones, operandos, operadores)
+    group_kind, group_data, group_nots = GROUP_TOP, None, 0
+    operands = []  # Operandos de la agrupación actual
+    pending = []  # Operadores pendientes de la agrupación actual: (op, precedencia)
+
+    while True:
+        # Operando: cero o más '!' seguidos de un primario
+        nots = 0
+        token = tokens.current
+        while token is not None and token[0] == 'OPERATOR' and token[1] == '!':
+            tokens.advance()  # consumimos '!'
+            nots += 1
+            token = tokens.current
+        kind, value = parse_primary(tokens)
+        if kind is not None:
+            # El primario abre una agrupación: su contenido es una expresión nueva
+            groups.append((group_kind, group_data, group_nots, operands, pending))
+            group_kind, group_data, group_nots = kind, value, nots
+            operands = []
+            pending = []
+            continue
 
-    # Retorna la estructura del bloque 'if' con su condición, bloque then y bloque else (si existe)
-    if else_block is not None:
-        return ('IF_ELSE', cond, then_block, else_block)
-    else:
-        return ('IF', cond, then_block)
+        while True:
+            for _ in range(nots):
+                value = Not(value)
+            operands.append(value)
+
+            # Después de un operando puede venir un operador binario
+            token = tokens.current
+            precedence = operators.get(token[1]) if token is not None else None
+            if precedence is not None:
+                while pending and pending[-1][1] >= precedence:
+                    op, _ = pending.pop()
+                    right = operands.pop()
+                    operands[-1] = Binary(op, operands[-1], right)
+                tokens.advance()  # Consumimos el operador
+                pending.append((token[1], precedence))
+                break  # Sigue el operando de la derecha
+
+            # Si no, termina la expresión de la agrupación actual
+            while pending:
+                op, _ = pending.pop()
+                right = operands.pop()
+                operands[-1] = Binary(op, operands[-1], right)
+            expr = operands[0]
+
+            if group_kind == GROUP_TOP:
+                return expr if tokens.pool is None else tokens.pool.intern(expr)
+
+            if group_kind == GROUP_CALL:
+                name, args = group_data
+                args.append(expr)
+                if match(tokens, 'COMMA'):
+                    tokens.advance()
+                    operands = []  # Sigue el próximo argumento en la misma agrupación
+                    break
+                if not match(tokens, 'RPAREN'):
+                    tipo, val, offset = tokens.peek()
+                    line, col = tokens.line_index.position(offset)
+                    raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba ')' al final de llamada a función")
+                tokens.advance()  # Consumir ')'
+                value = FuncCall(name, args)
+
+            elif group_kind == GROUP_CAST:
+                if not match(tokens, 'RPAREN'):
+                    tipo, val, offset = tokens.peek()
+                    line, col = tokens.line_index.position(offset)
+                    raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba ')' al cerrar cast a {group_data}")
+                tokens.advance()  # Consumimos ')'
+                value = Cast(group_data, expr)
 
-# Función para procesar expresiones, que son comparaciones o operaciones
-def parse_expression(tokens):
-    return parse_comparison(tokens)
-
-# Función para procesar expresiones de comparación (ejemplo: 'x > 5', 'y == 3')
-def parse_comparison(tokens):
-    # Primero procesamos las operaciones de adición y sustracción
-    left = parse_add_sub(tokens)
-
-    # Mientras encontremos un operador de comparación ('>', '<', '==', '>=', '<=')
-    while match(tokens, 'GREATER') or match(tokens, 'LESS') or match(tokens, 'EQUALS') or match(tokens, 'GREATEREQUAL') or match(tokens, 'LESSEQUAL'):
-        _, op, _, _ = tokens.pop(0)  # Consumimos el operador de comparación
-        # Procesamos la expresión de la derecha de la comparación
-        right = parse_add_sub(tokens)
-        # Retornamos la comparación estructurada
-        left = (op, left, right)
-
-    return left
-
-# Función para procesar operaciones de adición y sustracción
-def parse_add_sub(tokens):
-    # Primero procesamos las multiplicaciones y divisiones
-    left = parse_mul_div(tokens)
-    # Mientras encontremos un operador de adición o sustracción
-    while match(tokens, 'OPERATOR', '+') or match(tokens, 'OPERATOR', '-'):
-        _, op, _, _ = tokens.pop(0)  # Consumimos el operador
-        # Procesamos la expresión de la derecha
-        right = parse_mul_div(tokens)
-        # Retornamos la expresión con el operador aplicado
-        left = (op, left, right)
-    return left
-
-# Función para procesar operaciones de multiplicación y división
-def parse_mul_div(tokens):
-    # Procesamos el primer operando
-    left = parse_unary(tokens)
-    # Mientras encontremos un operador de multiplicación o división
-    while match(tokens, 'OPERATOR', '*') or match(tokens, 'OPERATOR', '/'):
-        _, op, _, _ = tokens.pop(0)  # Consumimos el operador
-        # Procesamos el operando de la derecha
-        right = parse_unary(tokens)
-        # Retornamos la expresión con el operador aplicado
-        left = (op, left, right)
-
-    return left
-
-# Función para procesar los operandos primarios (números, identificadores o paréntesis)
+            else:
+                # Verificamos que haya un paréntesis de cierre correspondiente
+                if not match(tokens, 'RPAREN'):
+                    tipo, val, offset = tokens.peek()
+                    line, col = tokens.line_index.position(offset)
+                    raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba RPAREN ')' pero se encontró '{val}'")
+                tokens.advance()  # Consumimos 'RPAREN'
+                value = expr
+
+            # La agrupación cerrada es un operando de la agrupación que la contiene
+            nots = group_nots
+            group_kind, group_data, group_nots, operands, pending = groups.pop()
+
+# Función para procesar los operandos primarios (números, identificadores o paréntesis).
+# Devuelve (None, valor) para un primario completo, o (tipo de agrupación, dato) si el primario
+# abre una agrupación cuyo contenido procesa parse_expression.
 def parse_primary(tokens):
-    # Si encontramos un paréntesis de apertura, procesamos la expresión entre paréntesis
-    if match(tokens, 'LPAREN'):
-        tokens.pop(0)
-        expr = parse_expression(tokens)
-        # Verificamos que haya un paréntesis de cierre correspondiente
-        if not match(tokens, 'RPAREN'):
-            tipo, val, line, col = tokens[0]
-            raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba RPAREN ')' pero se encontró '{val}'")
-        tokens.pop(0)  # Consumimos 'RPAREN'
-        return expr
+    # El token actual se mira una sola vez; las ramas comparan su tipo y valor
+    token = tokens.current
+    tk_type, tk_val, _ = token if token is not None else (None, None, None)
+
+    # Si encontramos un paréntesis de apertura, sigue la expresión entre paréntesis
+    if tk_type == 'LPAREN':
+        tokens.advance()
+        return GROUP_PAREN, None
 
     # Si encontramos un número, lo procesamos
-    elif match(tokens, 'NUMBER'):
-        return parse_num(tokens)
+    elif tk_type == 'NUMBER':
+        return None, parse_num(tokens)
     
         # Si encontramos una cadena, la procesamos
-    elif match(tokens, 'STRING'):
-        return parse_string(tokens)
+    elif tk_type == 'STRING':
+        return None, parse_string(tokens)
 
     # Si encontramos un carácter, lo procesamos
-    elif match(tokens, 'CHAR'):
-        return parse_char(tokens)
+    elif tk_type == 'CHAR':
+        return None, parse_char(tokens)
 
         # Soporte para cast explícito como int("5") o float("3.14")
-    elif match_keyword(tokens, 'int') or match_keyword(tokens, 'float') or match_keyword(tokens, 'string'):
-        cast_type = tokens.pop(0)[1]  # Extrae 'int', 'float' o 'string'
+    elif tk_type == 'KEYWORD' and tk_val in ('int', 'float', 'string'):
+        cast_type = tokens.advance()[1]  # Extrae 'int', 'float' o 'string'
 
         # Verifica que lo siguiente sea un paréntesis de apertura
         if not match(tokens, 'LPAREN'):
-            tipo, val, line, col = tokens[0]
+            tipo, val, offset = tokens.peek()
+            line, col = tokens.line_index.position(offset)
             raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba '(' después de cast a {cast_type}")
         
-        tokens.pop(0)  # Consumimos '('
-        expr = parse_expression(tokens)  # Parseamos la expresión interna
-
-        if not match(tokens, 'RPAREN'):
-            tipo, val, line, col = tokens[0]
-            raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba ')' al cerrar cast a {cast_type}")
-        
-        tokens.pop(0)  # Consumimos ')'
-
-        return ('CAST', cast_type, expr)
+        tokens.advance()  # Consumimos '('
+        return GROUP_CAST, cast_type  # Sigue la expresión interna
 
     # Si encontramos un identificador, lo procesamos
-    elif match(tokens, 'IDENTIFIER'):
+    elif tk_type == 'IDENTIFIER':
         name = parse_id(tokens)
         if match(tokens, 'LPAREN'):
-            tokens.pop(0)  # Consumir '('
-            args = []
+            tokens.advance()  # Consumir '('
             if not match(tokens, 'RPAREN'):
-                while True:
-                    arg = parse_expression(tokens)
-                    args.append(arg)
-                    if match(tokens, 'COMMA'):
-                        tokens.pop(0)
-                    else:
-                        break
-            if not match(tokens, 'RPAREN'):
-                tipo, val, line, col = tokens[0]
-                raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba ')' al final de llamada a función")
-            tokens.pop(0)  # Consumir ')'
-            return ('FUNC_CALL', name, args)
+                return GROUP_CALL, (name, [])  # Siguen los argumentos
+            tokens.advance()  # Consumir ')'
+            return None, FuncCall(name, [])
         else:
-            return name
+            return None, name
 
     # Si encontramos un operador de comparación '==', lanzamos un error
-    elif match(tokens, 'OPERATOR') and tokens[0][1] == '==':
-        _, val, line, col = tokens[0]
+    elif tk_type == 'OPERATOR' and tk_val == '==':
+        _, val, offset = tokens.peek()
+        line, col = tokens.line_index.position(offset)
         raise SyntaxError(f"Error en línea {line}, columna {col}: expresión no puede comenzar con '=='")
     
-    elif match_keyword(tokens, 'false'):
-        tokens.pop(0)
-        return False  # O ('bool', False) si quieres mantener consistencia
+    elif tk_type == 'KEYWORD' and tk_val == 'false':
+        tokens.advance()
+        return None, False  # O ('bool', False) si quieres mantener consistencia
     
-    elif match_keyword(tokens, 'true'):
-        tokens.pop(0)
-        return True
+    elif tk_type == 'KEYWORD' and tk_val == 'true':
+        tokens.advance()
+        return None, True
 
     # Si no encontramos un token esperado, lanzamos un error
     else:
-        tipo, val, line, col = tokens[0]
+        tipo, val, offset = tokens.peek()
+        line, col = tokens.line_index.position(offset)
         raise SyntaxError(f"Error en línea {line}, columna {col}: token inesperado '{val}' en expresión")
 
 
 # === FUNCIONES AUXILIARES ===
 
-# Variable global para almacenar la última línea procesada en el analizador.
-last_token_line = None
+# Devuelve la línea del último token procesado (solo se usa al reportar errores). Sin
+# desplazamiento, en un flujo perezoso ya agotado, usa el último token del flujo.
+def line_of(tokens):
+    offset = tokens.last_token_offset
+    if offset is None:
+        offset = tokens.last_offset
+    return tokens.line_index.position(offset)[0]
 
 # Función para procesar un tipo de dato (int, float)
 def parse_type(tokens):
-    global last_token_line  # Accede a la variable global para la última línea procesada.
-
     # Si no hay más tokens, lanza un error especificando la última línea conocida.
     if not tokens:
-        raise SyntaxError(f"Error en línea {last_token_line}: se esperaba tipo, pero no se encontró más tokens.")
+        raise SyntaxError(f"Error en línea {line_of(tokens)}: se esperaba tipo, pero no se encontró más tokens.")
     
-    tipo, val, line, col = tokens.pop(0)  # Extrae el primer token de la lista.
-    last_token_line = line  # Actualiza la última línea procesada con la línea actual.
+    tipo, val, offset = tokens.advance()  # Consume el token actual.
+    tokens.last_token_offset = offset  # Actualiza el último token procesado.
 
     # Verifica si el tipo de token es válido en este contexto.
     if tipo == 'KEYWORD' and val in ('int', 'float', 'string', 'bool', 'char'):
         return val
     
     # Si no es un tipo válido, lanza un error especificando la línea y columna.
+    line, col = tokens.line_index.position(offset)
     raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba un tipo válido, pero se encontró '{val}'")
 
 # Función para procesar un identificador (como variables o nombres de funciones)
 def parse_id(tokens):
-    global last_token_line  # Accede a la variable global de la última línea procesada.
-
     # Si no hay tokens disponibles, lanza un error especificando la última línea conocida.
     if not tokens:
-        raise SyntaxError(f"Error en línea {last_token_line}: se esperaba identificador, pero no se encontró más tokens.")
+        raise SyntaxError(f"Error en línea {line_of(tokens)}: se esperaba identificador, pero no se encontró más tokens.")
     
-    tipo, val, line, col = tokens.pop(0)  # Extrae el primer token de la lista.
-    last_token_line = line  # Actualiza la última línea procesada con la línea actual.
+    tipo, val, offset = tokens.advance()  # Consume el token actual.
+    tokens.last_token_offset = offset  # Actualiza el último token procesado.
 
     # Verifica si el token es un identificador válido.
     if tipo == 'IDENTIFIER':
         return val
     
     # Si el token no es un identificador válido, lanza un error con la línea y columna.
+    line, col = tokens.line_index.position(offset)
     raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba identificador, pero se encontró '{val}'")
 
 # Función para procesar números (entero o decimal)
 def parse_num(tokens):
-    global last_token_line  # Accede a la variable global de la última línea procesada.
-
     # Si no hay más tokens, lanza un error especificando la última línea conocida.
     if not tokens:
-        raise SyntaxError(f"Error en línea {last_token_line}: se esperaba número, pero no se encontró más tokens.")
+        raise SyntaxError(f"Error en línea {line_of(tokens)}: se esperaba número, pero no se encontró más tokens.")
     
-    tipo, val, line, col = tokens.pop(0)  # Extrae el primer token de la lista.
-    last_token_line = line  # Actualiza la última línea procesada con la línea actual.
+    tipo, val, offset = tokens.advance()  # Consume el token actual.
+    tokens.last_token_offset = offset  # Actualiza el último token procesado.
 
     # Si el token es un número, lo procesa como entero o decimal según corresponda.
     if tipo == 'NUMBER':
         return float(val) if '.' in val else int(val)
     
     # Si el token no es un número válido, lanza un error con la línea y columna.
+    line, col = tokens.line_index.position(offset)
     raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba un número válido, pero se encontró '{val}'")
 
 # Función para procesar el operador de asignación '='
 def parse_equals(tokens):
-    global last_token_line  # Accede a la variable global de la última línea procesada.
-
     # Si no hay más tokens, lanza un error especificando la última línea conocida.
     if not tokens:
-        raise SyntaxError(f"Error en línea {last_token_line}: se esperaba '=', pero no se encontró más tokens.")
+        raise SyntaxError(f"Error en línea {line_of(tokens)}: se esperaba '=', pero no se encontró más tokens.")
     
-    tipo, val, line, col = tokens[0]  # Obtiene el tipo y valor del primer token.
-    last_token_line = line  # Actualiza la última línea procesada con la línea actual.
+    tipo, val, offset = tokens.peek()  # Obtiene el tipo y valor del token actual.
+    tokens.last_token_offset = offset  # Actualiza el último token procesado.
 
     # Verifica que el token sea un operador '='.
     if tipo != 'OPERATOR' or val != '=':
+        line, col = tokens.line_index.position(offset)
         raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba '=', pero se encontró '{val}'.")
     
-    tokens.pop(0)  # Consume el operador '='.
+    tokens.advance()  # Consume el operador '='.
 
 # Función para procesar el punto y coma ';' al final de las instrucciones
 def parse_semi(tokens):
-    global last_token_line  # Accede a la variable global de la última línea procesada.
-
     # Si no hay más tokens, lanza un error especificando la última línea conocida.
     if not tokens:
-        raise SyntaxError(f"Error en línea {last_token_line}: se esperaba ';', pero no se encontró más tokens.")
+        raise SyntaxError(f"Error en línea {line_of(tokens)}: se esperaba ';', pero no se encontró más tokens.")
     
-    tipo, val, line, col = tokens[0]  # Obtiene el tipo y valor del primer token.
-    last_token_line = line  # Actualiza la última línea procesada con la línea actual.
+    tipo, val, offset = tokens.peek()  # Obtiene el tipo y valor del token actual.
+    tokens.last_token_offset = offset  # Actualiza el último token procesado.
 
     # Verifica que el token sea un punto y coma ';'.
     if tipo != 'SEMICOLON':
+        line, col = tokens.line_index.position(offset)
         raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba ';', pero se encontró '{val}'.")
     
-    tokens.pop(0)  # Consume el punto y coma ';'.
+    tokens.advance()  # Consume el punto y coma ';'.
 
 
 # Función para procesar cadenas de texto
 def parse_string(tokens):
-    tipo, val, line, col = tokens.pop(0)
+    tipo, val, offset = tokens.advance()
     # Asegurarse que la cadena esté entre comillas dobles
     if tipo == 'STRING':
-        return val  # Retorna el valor de la cadena
+        return StringLiteral(val)  # Retorna el valor de la cadena, con su tipo
+    line, col = tokens.line_index.position(offset)
     raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba una cadena pero se encontró '{val}'")
 
 # Función para procesar caracteres
 def parse_char(tokens):
-    tipo, val, line, col = tokens.pop(0)
+    tipo, val, offset = tokens.advance()
     # Asegurarse que el carácter esté entre comillas simples
     if tipo == 'CHAR':
-        return val  # Retorna el valor del carácter
+        return CharLiteral(val)  # Retorna el valor del carácter, con su tipo
+    line, col = tokens.line_index.position(offset)
     raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba un carácter pero se encontró '{val}'")
 
 # Función para hacer coincidir un tipo de token y valor específico
 def match(tokens, type_, value=None):
-    if not tokens:
+    token = tokens.current
+    if token is None:
         return False
-    tk_type, tk_val, *_ = tokens[0]  # Obtiene el tipo y valor del primer token
+    tk_type, tk_val, _ = token  # Obtiene el tipo y valor del token actual
     return tk_type == type_ and (value is None or tk_val == value)
 
 # Función para verificar si el token actual es una palabra clave
 def match_keyword(tokens, keyword):
-    if not tokens:
+    token = tokens.current
+    if token is None:
         return False
-    tk_type, tk_val, *_ = tokens[0]  # Obtiene el tipo y valor del primer token
+    tk_type, tk_val, _ = token  # Obtiene el tipo y valor del token actual
     return tk_type == 'KEYWORD' and tk_val == keyword
 
 # Función para esperar un token específico
 def expect(tokens, type_, value=None):
     if not match(tokens, type_, value):
         if tokens:
-            tipo, val, line, col = tokens[0]  # Obtiene el tipo y valor del primer token
+            tipo, val, offset = tokens.peek()  # Obtiene el tipo y valor del token actual
+            line, col = tokens.line_index.position(offset)
             raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba {type_} '{value}' pero se encontró '{val}'")
         else:
             raise SyntaxError(f"Error: se esperaba {type_} '{value}' pero se encontró EOF")
-    tokens.pop(0)  # Consume el token esperado
+    tokens.advance()  # Consume el token esperado
 
 # Función para esperar una palabra clave específica
 def expect_keyword(tokens, keyword):
     if not match_keyword(tokens, keyword):
         if tokens:
-            tipo, val, line, col = tokens[0]  # Obtiene el tipo y valor del primer token
+            tipo, val, offset = tokens.peek()  # Obtiene el tipo y valor del token actual
+            line, col = tokens.line_index.position(offset)
             raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba palabra clave '{keyword}' pero se encontró '{val}'")
         else:
             raise SyntaxError(f"Error: se esperaba palabra clave '{keyword}' pero se encontró EOF")
-    tokens.pop(0)  # Consume la palabra clave esperada
+    tokens.advance()  # Consume la palabra clave esperada
 
-def parse_unary(tokens):
-    if match(tokens, 'OPERATOR') and tokens[0][1] == '!':
-        _, val, line, col = tokens.pop(0)  # consumimos '!'
-        operand = parse_unary(tokens)  # recursivo por si hay múltiples '!'
-        return ('NOT', operand)
-    else:
-        return parse_primary(tokens)
-    
 def parse_function_definition(tokens):
     tipo = parse_type(tokens)              # int
     name = parse_id(tokens)                # sumar
@@ -464,7 +631,7 @@ def parse_function_definition(tokens):
         param_name = parse_id(tokens)      # a
         params.append((param_type, param_name))
         if match(tokens, 'COMMA'):
-            tokens.pop(0)
+            tokens.advance()
 
     expect(tokens, 'RPAREN')               # )
     expect(tokens, 'LBRACE')               # {
@@ -479,49 +646,70 @@ def parse_function_definition(tokens):
     return ('FUNCTION_DEF', tipo, name, params, body)
 
 def parse_function_declaration(return_type, name, tokens):
-    tokens.pop(0)  # Consumir '('
+    tokens.functions += 1
+    tokens.advance()  # Consumir '('
     param_types = []
+    param_names = []
+    param_offsets = []
 
     if not match(tokens, 'RPAREN'):
         while True:
             param_type = parse_type(tokens)
             param_name = parse_id(tokens)
             param_types.append(param_type)
+            param_names.append(param_name)
+            param_offsets.append(tokens.last_token_offset)
             if match(tokens, 'COMMA'):
-                tokens.pop(0)
+                tokens.advance()
             else:
                 break
 
     if not match(tokens, 'RPAREN'):
-        tipo, val, line, col = tokens[0]
+        tipo, val, offset = tokens.peek()
+        line, col = tokens.line_index.position(offset)
         raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba ')' en la declaración de la función")
-    tokens.pop(0)  # Consumir ')'
+    tokens.advance()  # Consumir ')'
 
-    # Consumir el bloque de la función, aunque no lo procesemos
+    # Saltar el bloque de la función contando llaves; sus tokens quedan guardados para
+    # analizarlo cuando se llame (ver FunctionBody)
     if not match(tokens, 'LBRACE'):
-        tipo, val, line, col = tokens[0]
+        tipo, val, offset = tokens.peek()
+        line, col = tokens.line_index.position(offset)
         raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba '{{' en la declaración de la función")
-    
+
+    # De un flujo perezoso no se puede volver atrás: se guardan los tokens del cuerpo (con su '{')
+    kept = None if tokens.source is not None else [tokens.current]
+    start = tokens.index + 1
     brace_count = 1
-    tokens.pop(0)  # Consumir '{'
+    tokens.advance()  # Consumir '{'
     while brace_count > 0:
         if not tokens:
             raise SyntaxError("Se esperaba '}' al final del cuerpo de la función")
-        tok_type, tok_val, *_ = tokens.pop(0)
-        if tok_type == 'LBRACE':
+        token = tokens.advance()
+        if token[0] == 'LBRACE':
             brace_count += 1
-        elif tok_type == 'RBRACE':
+        elif token[0] == 'RBRACE':
             brace_count -= 1
+        if kept is not None:
+            kept.append(token)
+    stop = tokens.index - 1  # Sin la '}' final
 
-    return ('FUNC_DECL', name, param_types, return_type)
+    if kept is None:
+        body = FunctionBody(tokens.source, start, stop, param_names, tokens.line_index, tokens.pool,
+                            param_offsets)
+    else:
+        body = FunctionBody(kept, 1, len(kept) - 1, param_names, tokens.line_index, tokens.pool,
+                            param_offsets)
+    return FuncDecl(name, param_types, return_type, body)
 
 
 def parse_block(tokens):
     if not match(tokens, 'LBRACE'):
-        tipo, val, line, col = tokens[0]
+        tipo, val, offset = tokens.peek()
+        line, col = tokens.line_index.position(offset)
         raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba '{{' para iniciar el bloque de función")
     
-    tokens.pop(0)  # Consumimos '{'
+    tokens.advance()  # Consumimos '{'
     statements = []
 
     # Repetimos hasta encontrar '}'
@@ -529,7 +717,7 @@ def parse_block(tokens):
         stmt = parse_statement(tokens)
         statements.append(stmt)
 
-    tokens.pop(0)  # Consumimos '}'
+    tokens.advance()  # Consumimos '}'
     return ('BLOCK', statements)
 
 
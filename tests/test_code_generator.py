@@ -17,6 +17,12 @@ from src.semantico.semantic import semantic
 from src.generador.code_generator import CodeGenerator
 from src.CodigoObjeto.codigob import CodeGeneratorob
 from src.VM.virtualmachine import VirtualMachine
+from src.generador.optimizer import Optimizer, TEMP_NAME, operand_positions
+from src.generador.cfg import ControlFlowGraph
+from src.generador.ssa import to_ssa, from_ssa
+from src.sintactico.ast_nodes import from_tuple, is_variable
+from src.compiler import Compiler
+from tests.tests_compiler import TEST_CASES, PROGRAMAS
 
 def test_code_generation():
     """
@@ -284,19 +290,15 @@ def test_specific_example():
     print("EJEMPLO ESPECÍFICO DE LA IMAGEN")
     print(f"{'='*80}")
     
-    # Según la imagen, el código "int a = 5 + 2;" debería generar:
-    # (t1, =, 5, )
-    # (t2, =, 2, )
-    # (t3, +, t1, t2)
-    # (a, =, t3, )
+    # El código "int a = 5 + 2;" genera (los literales van directo como operandos):
+    # (t1, +, 5, 2)
+    # (a, =, t1, )
     
     codigo = "int a = 5 + 2;"
     print(f"Código: {codigo}")
-    print("Resultado esperado según la imagen:")
-    print("  (t1, =, 5, )")
-    print("  (t2, =, 2, )")
-    print("  (t3, +, t1, t2)")
-    print("  (a, =, t3, )")
+    print("Resultado esperado:")
+    print("  (t1, +, 5, 2)")
+    print("  (a, =, t1, )")
     
     try:
         tokens = lexer(codigo)
@@ -648,6 +650,355 @@ def test_stress_cases():
         except Exception as e:
             print(f"FALLO: {str(e)[:100]}...")
 
+def casos_de_exito():
+    """Casos del compilador (tests_compiler.TEST_CASES) que deben compilar, para comparar ejecuciones"""
+    return [caso for caso in TEST_CASES if caso["expect_success"]]
+
+
+def test_literal_operands():
+    """
+    Los literales (números, booleanos, strings y chars) van directo en las cuádruplas, sin un
+    temporal por literal, y el código objeto y la VM los aceptan en cualquier operando
+    """
+    print(f"\n{'='*80}")
+    print("LITERALES COMO OPERANDOS INMEDIATOS")
+    print(f"{'='*80}")
+
+    compiler = Compiler().compile("int a = 5 + 2;")
+    assert compiler.quads == [('t1', '+', 5, 2), ('a', '=', 't1', None)], f"Cuádruplas inesperadas: {compiler.quads}"
+    assert compiler.asm.splitlines()[1:] == ["LOAD 5", "IADD 2", "STORE @0"], f"Código objeto inesperado:\n{compiler.asm}"
+    print(f"ÉXITO: {compiler.quads}")
+
+    codigo = ('string s = "hola mundo"; string t = s + "!"; char c = \'x\'; bool b = s == "hola mundo";'
+              ' bool z = b == false; float e = 0.000001;'
+              ' int f(bool q) { if (q) { return 1; } return 2; } int r = f(true); if (true) { r = r + 1; }')
+    compiler = Compiler().compile(codigo)
+    assert compiler.quads[0] == ('s', '=', '"hola mundo"', None) and (None, 'param', True, None) in compiler.quads
+    assert (None, 'if_false', True, 'L1') in compiler.quads
+    estado = compiler.run().get_memory_state()
+    assert {nombre: estado[nombre] for nombre in ('s', 't', 'c', 'b', 'z', 'e', 'r')} == \
+        {'s': 'hola mundo', 't': 'hola mundo!', 'c': 'x', 'b': 1, 'z': 0, 'e': 1e-06, 'r': 2}, f"Memoria inesperada: {estado}"
+    print(f"ÉXITO: strings, chars, booleanos y flotantes inmediatos en la VM: {estado}")
+
+
+def test_optimizer():
+    """
+    Optimizador de cuádruplas (constantes y ramas) sobre los casos de éxito del compilador
+    (casos_de_exito): el programa optimizado deja las mismas variables en la VM, y se reportan las
+    cuádruplas e instrucciones de la VM eliminadas
+    """
+    print(f"\n{'='*80}")
+    print("OPTIMIZACIÓN DEL CÓDIGO INTERMEDIO")
+    print(f"{'='*80}")
+
+    def variables(vm):
+        # Los temporales que el optimizador elimina no quedan en memoria
+        return {nombre: valor for nombre, valor in vm.get_memory_state().items() if not TEMP_NAME.match(nombre)}
+
+    def ejecutar(compiler):
+        try:
+            return variables(compiler.run())
+        except Exception as e:
+            return str(e)
+
+    def contar_instrucciones(compiler):
+        return sum(not linea.startswith("SLOTS ") for linea in compiler.asm.splitlines())
+
+    casos = casos_de_exito()
+    total_cuadruplas = [0, 0]
+    total_instrucciones = [0, 0]
+    for caso in casos:
+        original = Compiler().compile(caso["code"])
+        optimizado = Compiler(optimize=True).compile(caso["code"])
+        assert ejecutar(optimizado) == ejecutar(original), f"Ejecución distinta al optimizar: {caso['code']}"
+
+        cuadruplas = (len(original.quads), len(optimizado.quads))
+        instrucciones = (contar_instrucciones(original), contar_instrucciones(optimizado))
+        for i in range(2):
+            total_cuadruplas[i] += cuadruplas[i]
+            total_instrucciones[i] += instrucciones[i]
+        print(f"  {caso['description'][:50]:<50} cuádruplas {cuadruplas[0]:>3} -> {cuadruplas[1]:>3}, "
+              f"instrucciones {instrucciones[0]:>3} -> {instrucciones[1]:>3}")
+
+    print(f"ÉXITO: {len(casos)} casos con la misma ejecución; cuádruplas {total_cuadruplas[0]} -> "
+          f"{total_cuadruplas[1]} ({total_cuadruplas[0] - total_cuadruplas[1]} eliminadas), instrucciones de la VM "
+          f"{total_instrucciones[0]} -> {total_instrucciones[1]} ({total_instrucciones[0] - total_instrucciones[1]} eliminadas)")
+
+    compiler = Compiler(optimize=True).compile("int a = 5 + 2;")
+    assert compiler.quads == [('a', '=', 7, None)], f"Cuádruplas inesperadas: {compiler.quads}"
+    assert compiler.optimizer.folded == 1
+    print("ÉXITO: int a = 5 + 2; se pliega a (a, =, 7, )")
+
+    # La condición es constante después de propagar x: solo queda la rama then
+    compiler = Compiler(optimize=True).compile("int x = 10; if (x > 5) { int y = 1; } else { int y = 0; } int z = x / 3;")
+    assert compiler.quads == [('x', '=', 10, None), ('y', '=', 1, None), ('z', '=', 3, None)], \
+        f"Cuádruplas inesperadas: {compiler.quads}"
+    assert compiler.optimizer.pruned == 1
+    print("ÉXITO: rama else eliminada al propagar la condición constante")
+
+    # Después de una etiqueta (dos caminos) el valor de r ya no se conoce
+    compiler = Compiler(optimize=True).compile(
+        "int f(int p) { int r = 1; if (p > 0) { r = 2; } return r * 3; } int x = f(4);")
+    multiplicaciones = [quad for quad in compiler.quads if quad[1] == '*']
+    assert len(multiplicaciones) == 1 and multiplicaciones[0][2:] == ('r', 3), f"Cuádruplas inesperadas: {compiler.quads}"
+    assert variables(compiler.run())['x'] == 6
+    print("ÉXITO: constantes propagadas solo dentro de cada bloque")
+
+    # Un temporal que nadie lee se quita, salvo una división que puede ser por cero
+    cuadruplas = [('t1', '/', 'x', 'y'), ('t2', '/', 'x', 0), ('t3', '/', 'x', 2), ('t4', '*', 'x', 'y'),
+                  (None, 'halt', None, None)]
+    optimizadas = Optimizer().optimize(cuadruplas)
+    assert optimizadas == cuadruplas[:2] + cuadruplas[4:], f"Cuádruplas inesperadas: {optimizadas}"
+    print("ÉXITO: las divisiones sin uso que pueden fallar se conservan")
+
+
+def test_control_flow_graph():
+    """
+    Bloques básicos, aristas, dominadores y bucles naturales de las cuádruplas: un while con
+    un if adentro (armado con from_tuple, el parser no tiene while) y un programa con función
+    """
+    print(f"\n{'='*80}")
+    print("GRAFO DE FLUJO DE CONTROL")
+    print(f"{'='*80}")
+
+    ast = from_tuple([
+        ('DECLARATION', 'int', 'i', 0),
+        ('DECLARATION', 'int', 'x', 0),
+        ('WHILE', ('<', 'i', 3), [
+            ('IF', ('==', 'i', 1), [('ASSIGNMENT', 'x', 1)]),
+            ('ASSIGNMENT', 'i', ('+', 'i', 1)),
+        ]),
+        ('ASSIGNMENT', 'x', ('+', 'x', 'i')),
+    ])
+    quads = CodeGenerator().generate(ast)
+    cfg = ControlFlowGraph(quads)
+    for block in cfg:
+        print(f"  {block}")
+
+    # 0: antes del while, 1: condición (L1), 2: if, 3: then, 4: después del if (L3, L4), 5: salida (L2)
+    assert [[s.index for s in block.successors] for block in cfg] == [[1], [2, 5], [3, 4], [4], [1], []]
+    assert [[p.index for p in block.predecessors] for block in cfg] == [[], [0, 4], [1], [2], [2, 3], [1]]
+    assert cfg.labels['L3'] is cfg.labels['L4'] is cfg.blocks[4] and cfg.blocks[4].labels == ['L3', 'L4']
+    assert (cfg.blocks[1].fallthrough, cfg.blocks[1].jump_target) == (cfg.blocks[2], cfg.blocks[5])
+    assert cfg.blocks[4].terminator == (None, 'goto', 'L1', None) and cfg.blocks[0].terminator is None
+    assert cfg.to_quads() == quads
+    print("ÉXITO: bloques básicos y aristas")
+
+    assert cfg.dominators() == [None, 0, 1, 2, 2, 1]
+    assert cfg.dominates(1, 4) and cfg.dominates(2, 2) and not cfg.dominates(3, 4) and not cfg.dominates(5, 1)
+    assert cfg.dominator_tree() == [[1], [2, 5], [3, 4], [], [], []]
+    assert cfg.natural_loops() == [(1, frozenset({1, 2, 3, 4}), (4,))]
+    print(f"ÉXITO: dominadores {cfg.dominators()} y bucle {cfg.natural_loops()[0]}")
+
+    compiler = Compiler().compile("int f(int p) { if (p > 0) { return 1; } return 2; } int r = f(3); int s = r + 1;")
+    cfg = ControlFlowGraph(compiler.quads)
+    assert [block.index for block in cfg.entries] == [0, 1], "El programa y la función son entradas"
+    assert cfg.labels['f'] is cfg.blocks[1] and cfg.blocks[0].successors == []
+    # El código después de cada return de la función no se alcanza: sin dominador
+    inalcanzables = [block.index for block in cfg if block.index > 1 and cfg.dominators()[block.index] is None]
+    assert [cfg.blocks[i].quads for i in inalcanzables] == \
+        [[(None, 'goto', 'L2', None)], [(None, 'return', None, None)]], inalcanzables
+    assert cfg.natural_loops() == []
+    print(f"ÉXITO: programa y función como entradas, {len(inalcanzables)} bloques inalcanzables")
+
+
+
+def test_ssa():
+    """
+    Forma SSA: phi en los bloques donde se juntan las versiones de una variable, ida y vuelta
+    con la misma ejecución en la VM para todos los programas de las suites, y vuelta a
+    cuádruplas con versiones superpuestas (después de propagar copias en SSA)
+    """
+    print(f"\n{'='*80}")
+    print("FORMA SSA")
+    print(f"{'='*80}")
+
+    # El while con un if de test_control_flow_graph: i y x cambian en el bucle
+    ast = from_tuple([
+        ('DECLARATION', 'int', 'i', 0),
+        ('DECLARATION', 'int', 'x', 0),
+        ('WHILE', ('<', 'i', 3), [
+            ('IF', ('==', 'i', 1), [('ASSIGNMENT', 'x', 1)]),
+            ('ASSIGNMENT', 'i', ('+', 'i', 1)),
+        ]),
+        ('ASSIGNMENT', 'x', ('+', 'x', 'i')),
+    ])
+    quads = CodeGenerator().generate(ast)
+    ssa = to_ssa(quads)
+    for block in ssa.cfg:
+        print(f"  {block.index}: {block.quads}")
+    phis = [[quad for quad in block.quads if quad[1] == 'phi'] for block in ssa.cfg]
+    assert phis[1] == [('i#2', 'phi', ((0, 'i#1'), (4, 'i#3')), None),
+                       ('x#2', 'phi', ((0, 'x#1'), (4, 'x#4')), None)], phis[1]
+    assert phis[4] == [('x#4', 'phi', ((2, 'x#2'), (3, 'x#3')), None)], phis[4]
+    assert phis[0] == phis[2] == phis[3] == phis[5] == []
+    assert ssa.cfg.blocks[5].quads[-1] == (None, 'exit', ('i#2', 'x#5'), None)
+    assert ssa.definitions()['x#4'] == (4, 2) and ssa.uses()['x#4'] == [(1, 2)]
+    assert from_ssa(ssa) == quads
+    print("ÉXITO: phi en el header del while y después del if, y vuelta a las mismas cuádruplas")
+
+    def ejecutar(compiler):
+        try:
+            vm = compiler.run()
+            return (vm.get_final_stack_top(), vm.get_memory_state())
+        except Exception as e:
+            return str(e)
+
+    programas = PROGRAMAS  # Todos los casos del compilador (también los de error) y programas con funciones
+    ejecutados = 0
+    for codigo in programas:
+        for hash_consing in (False, True):
+            try:
+                original = Compiler(hash_consing).compile(codigo)
+            except Exception:
+                continue
+            con_ssa = Compiler(hash_consing, ssa=True).compile(codigo)
+            assert con_ssa.quads == original.quads, f"Cuádruplas distintas con SSA: {codigo}"
+            assert ejecutar(con_ssa) == ejecutar(original), f"Ejecución distinta con SSA: {codigo}"
+            ejecutados += 1
+    print(f"ÉXITO: {ejecutados} compilaciones de {len(programas)} programas con la misma ejecución con y sin SSA")
+
+    # Intercambio en un bucle: después de propagar las copias t = a, a = b, b = t en SSA, las
+    # phi del header leen la versión de la otra variable y la vuelta necesita copias paralelas
+    ast = from_tuple([
+        ('DECLARATION', 'int', 'a', 1),
+        ('DECLARATION', 'int', 'b', 2),
+        ('DECLARATION', 'int', 'i', 0),
+        ('DECLARATION', 'int', 't', 0),
+        ('WHILE', ('<', 'i', 3), [
+            ('ASSIGNMENT', 't', 'a'),
+            ('ASSIGNMENT', 'a', 'b'),
+            ('ASSIGNMENT', 'b', 't'),
+            ('ASSIGNMENT', 'i', ('+', 'i', 1)),
+        ]),
+    ])
+    quads = CodeGenerator().generate(ast)
+    ssa = to_ssa(quads)
+    copias = {quad[0]: quad[2] for block in ssa.cfg for quad in block.quads
+              if quad[1] == '=' and is_variable(quad[2])}
+
+    def origen(nombre):
+        while nombre in copias:
+            nombre = copias[nombre]
+        return nombre
+
+    for block in ssa.cfg:
+        propagadas = []
+        for quad in block.quads:
+            dest, op, arg1, arg2 = quad
+            if op == 'phi':
+                arg1 = tuple((predecesor, origen(valor)) for predecesor, valor in arg1)
+            elif op not in ('use', 'exit'):
+                args = [arg1, arg2]
+                for position in operand_positions(quad):
+                    if is_variable(args[position - 2]):
+                        args[position - 2] = origen(args[position - 2])
+                arg1, arg2 = args
+            propagadas.append((dest, op, arg1, arg2))
+        block.quads = propagadas
+    lowered = from_ssa(ssa)
+    for quad in lowered:
+        print(f"  {quad}")
+
+    def variables(quads):
+        ocg = CodeGeneratorob()
+        ocg.generate_code(quads)
+        vm = VirtualMachine()
+        vm.load_program(ocg.get_code())
+        vm.run()
+        return {nombre: valor for nombre, valor in vm.get_memory_state().items() if nombre in ('a', 'b', 'i', 't')}
+
+    assert variables(lowered) == variables(quads) == {'a': 2, 'b': 1, 'i': 3, 't': 1}, variables(lowered)
+    assert any(quad[0].startswith('b#c') for quad in lowered if quad[1] == '='), "Falta la copia que rompe el ciclo a <-> b"
+    print(f"ÉXITO: intercambio con versiones superpuestas, memoria final {variables(lowered)}")
+
+
+
+def test_value_numbering():
+    """
+    Numeración de valores: una operación repetida reutiliza el temporal de la primera, pero
+    no después de reasignar un operando (en un if o en un while); todos los casos de éxito de
+    este archivo dan la misma ejecución, y se reportan las cuádruplas e instrucciones ahorradas
+    """
+    print(f"\n{'='*80}")
+    print("NUMERACIÓN DE VALORES (SUBEXPRESIONES COMUNES)")
+    print(f"{'='*80}")
+
+    def variables(vm):
+        return {nombre: valor for nombre, valor in vm.get_memory_state().items() if not TEMP_NAME.match(nombre)}
+
+    def operaciones(quads, op):
+        return [quad for quad in quads if quad[1] == op]
+
+    compiler = Compiler(cse=True).compile("int x = 2; int y = 3; int a = x * y + 1; int b = x * y - 2;")
+    assert len(operaciones(compiler.quads, '*')) == 1 and compiler.value_numbering.reused == 1, compiler.quads
+    assert ('t4', '-', 't1', 2) in compiler.quads, compiler.quads
+    assert variables(compiler.run()) == {'x': 2, 'y': 3, 'a': 7, 'b': 4}
+    print(f"ÉXITO: x * y se calcula una vez: {compiler.quads}")
+
+    # La condición y la rama then reutilizan x * 3, pero no después de x = 5; una copia es el mismo valor
+    compiler = Compiler(cse=True).compile(
+        "int x = 2; int c = x * 3; if (x * 3 > 1) { int e = x; int f = e * 3; x = 5; int d = x * 3; }")
+    assert [quad[2:] for quad in operaciones(compiler.quads, '*')] == [('x', 3), ('x', 3)], compiler.quads
+    assert compiler.value_numbering.reused == 2
+    assert variables(compiler.run()) == {'x': 5, 'c': 6, 'e': 2, 'f': 6, 'd': 15}
+    print("ÉXITO: x * 3 se vuelve a calcular después de reasignar x")
+
+    # En el while, x * 2 del cuerpo no es el de antes del bucle: x cambia en cada vuelta
+    ast = from_tuple([
+        ('DECLARATION', 'int', 'i', 0),
+        ('DECLARATION', 'int', 'x', 1),
+        ('DECLARATION', 'int', 'y', ('*', 'x', 2)),
+        ('WHILE', ('<', 'i', 3), [
+            ('ASSIGNMENT', 'y', ('+', 'y', ('*', 'x', 2))),
+            ('ASSIGNMENT', 'x', ('+', 'x', 1)),
+            ('ASSIGNMENT', 'y', ('-', 'y', ('*', 'x', 2))),
+            ('ASSIGNMENT', 'i', ('+', 'i', 1)),
+        ]),
+        ('ASSIGNMENT', 'i', ('*', 'x', 2)),
+    ])
+    compiler = Compiler(cse=True)
+    compiler.quads = CodeGenerator().generate(ast)
+    original = list(compiler.quads)
+    compiler.to_ssa()
+    compiler.number_values()
+    compiler.from_ssa()
+    assert len(operaciones(compiler.quads, '*')) == len(operaciones(original, '*')) == 4
+    compiler.assemble()
+    esperado = Compiler()
+    esperado.quads = original
+    esperado.assemble()
+    assert variables(compiler.run()) == variables(esperado.run()) == {'i': 8, 'x': 4, 'y': -4}
+    print("ÉXITO: nada se reutiliza entre vueltas del while")
+
+    def ejecutar(compiler):
+        try:
+            return variables(compiler.run())
+        except Exception as e:
+            return str(e)
+
+    def contar_instrucciones(compiler):
+        return sum(not linea.startswith("SLOTS ") for linea in compiler.asm.splitlines())
+
+    casos = casos_de_exito()
+    total_cuadruplas = [0, 0]
+    total_instrucciones = [0, 0]
+    reutilizadas = 0
+    for caso in casos:
+        original = Compiler().compile(caso["code"])
+        numerado = Compiler(cse=True).compile(caso["code"])
+        assert ejecutar(numerado) == ejecutar(original), f"Ejecución distinta con numeración de valores: {caso['code']}"
+        total_cuadruplas[0] += len(original.quads)
+        total_cuadruplas[1] += len(numerado.quads)
+        total_instrucciones[0] += contar_instrucciones(original)
+        total_instrucciones[1] += contar_instrucciones(numerado)
+        reutilizadas += numerado.value_numbering.reused
+
+    print(f"ÉXITO: {len(casos)} casos con la misma ejecución; {reutilizadas} operaciones reutilizadas, cuádruplas "
+          f"{total_cuadruplas[0]} -> {total_cuadruplas[1]}, instrucciones de la VM "
+          f"{total_instrucciones[0]} -> {total_instrucciones[1]}")
+
+
 if __name__ == "__main__":
     print("SUITE COMPLETA DE PRUEBAS DEL COMPILADOR")
     print("=" * 80)
@@ -657,6 +1008,11 @@ if __name__ == "__main__":
     test_edge_cases()
     test_comprehensive_cases()
     test_stress_cases()
+    test_literal_operands()
+    test_optimizer()
+    test_control_flow_graph()
+    test_ssa()
+    test_value_numbering()
     
     print(f"\n{'='*80}")
     print("¡SUITE DE PRUEBAS COMPLETADA!")
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Pruebas del contexto de compilación
+Verifica que muchas compilaciones concurrentes en hilos dan los mismos resultados que en serie
+"""
+
+import sys
+import os
+import io
+import json
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.compiler import Compiler
+from src.diagnostics import Diagnostics, TRACE, WARNING
+from src.semantico.semantic import SymbolTable, semantic
+from src.sintactico.parser import parser
+from src.lexico.lexer import lexer
+from src.CodigoObjeto.codigob import CodeGeneratorob
+from src.VM.virtualmachine import VirtualMachine
+from tests.tests_compiler import PROGRAMAS
+
+
+def compilar(codigo, hash_consing):
+    """Resultado completo de una compilación, o el error con el que se detuvo."""
+    diagnostics = Diagnostics(TRACE)
+    compiler = Compiler(hash_consing, diagnostics)
+    try:
+        compiler.compile(codigo)
+    except Exception as e:
+        return (type(e).__name__, str(e))
+    try:
+        vm = compiler.run()
+        ejecucion = (vm.get_final_stack_top(), vm.get_memory_state())
+    except Exception as e:
+        ejecucion = (type(e).__name__, str(e))
+    return (repr(compiler.symbol_table), compiler.quads, compiler.asm, repr(ejecucion),
+            tuple(diagnostics))
+
+
+def test_concurrent_compilations():
+    """
+    Cientos de compilaciones repartidas en un ThreadPoolExecutor: cada una tiene su propio
+    Compiler, así que todas deben coincidir con la misma compilación hecha en serie
+    """
+    print("PRUEBAS DE COMPILACIONES CONCURRENTES")
+    print("=" * 50)
+
+    trabajos = [(codigo, hash_consing) for hash_consing in (False, True) for codigo in PROGRAMAS] * 4
+
+    esperados = {trabajo: compilar(*trabajo) for trabajo in set(trabajos)}
+
+    # Cambios de hilo muy frecuentes para que las compilaciones se intercalen
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            resultados = list(executor.map(lambda trabajo: compilar(*trabajo), trabajos))
+    finally:
+        sys.setswitchinterval(intervalo)
+
+    for (codigo, hash_consing), resultado in zip(trabajos, resultados):
+        assert resultado == esperados[(codigo, hash_consing)], \
+            f"Resultado distinto en un hilo (hash_consing={hash_consing}):\n{codigo}"
+
+    errores = sum(len(r) == 2 for r in esperados.values())
+    print(f"ÉXITO: {len(trabajos)} compilaciones concurrentes iguales a las de la serie "
+          f"({len(esperados)} distintas, {errores} con error)")
+
+
+def test_diagnostics():
+    """
+    Las advertencias y trazas quedan como registros en el Diagnostics y se escriben en texto
+    o en JSON lines; sin Diagnostics no se reporta nada
+    """
+    print("\nPRUEBAS DE DIAGNÓSTICOS")
+    print("=" * 50)
+
+    codigo = "int sin_usar; int g(int p) { return 1; } int h = g(2); return h;"
+    diagnostics = Diagnostics()
+    compiler = Compiler(diagnostics=diagnostics).compile(codigo)
+    compiler.run()
+    registros = [(r.severity, r.code, r.location) for r in diagnostics]
+    assert registros == [(WARNING, 'unused-variable', 'global'), (WARNING, 'unused-variable', 'function_g')], \
+        f"Registros inesperados: {registros}"
+    print("ÉXITO: variables no usadas reportadas con su ámbito, sin trazas")
+
+    texto = io.StringIO()
+    diagnostics.write(texto)
+    assert texto.getvalue().splitlines()[0] == \
+        "warning[unused-variable] semántico (global, línea 1, columna 5): Variable 'sin_usar' no utilizada"
+    jsonl = io.StringIO()
+    diagnostics.write(jsonl, mode='jsonl')
+    objetos = [json.loads(linea) for linea in jsonl.getvalue().splitlines()]
+    assert objetos[1] == {'severity': 'warning', 'code': 'unused-variable', 'message': "Variable 'p' no utilizada",
+                          'phase': 'semántico', 'location': 'function_g', 'line': 1, 'column': 25}, \
+        f"JSON inesperado: {objetos[1]}"
+    print("ÉXITO: salida en texto y en JSON lines, con línea y columna")
+
+    # La línea y la columna salen del desplazamiento de la declaración, también leyendo por bloques
+    codigo_lineas = "int a = 1;\nint g(int p) {\n    return a;\n}\n\n  int sin_usar;\nint b = g(2);\nreturn b;"
+    for fuente in (codigo_lineas, io.StringIO(codigo_lineas)):
+        diagnostics = Diagnostics()
+        Compiler(diagnostics=diagnostics).compile(fuente)
+        posiciones = [(r.message, diagnostics.position(r)) for r in diagnostics]
+        assert posiciones == [("Variable 'sin_usar' no utilizada", (6, 7)), ("Variable 'p' no utilizada", (2, 11))], \
+            f"Posiciones inesperadas: {posiciones}"
+    print("ÉXITO: diagnósticos ubicados en la línea y columna de la declaración")
+
+    trazas = Diagnostics(TRACE)
+    compiler = Compiler(diagnostics=trazas).compile(codigo)
+    compiler.run()
+    assert [r.code for r in trazas] == ['ast', 'unused-variable', 'unused-variable', 'vm-simulated-return']
+    assert trazas.by_code('ast')[0].message == repr(compiler.ast)
+    print("ÉXITO: con TRACE se guardan el AST y el retorno simulado de la VM")
+
+    diagnostics = Diagnostics()
+    tabla = SymbolTable(diagnostics)
+    tabla.enter_scope("global")
+    tabla.declare_variable("x", "int", offset=4)
+    tabla.enter_scope("block_")
+    tabla.declare_variable("x", "float", offset=17)
+    assert [(r.code, r.location, r.offset) for r in diagnostics] == [('shadowed-variable', 'block_1', 17)]
+    assert diagnostics.position(diagnostics.records[0]) is None, "Sin LineIndex no hay línea ni columna"
+    assert tabla.lookup("x")['type'] == 'float'
+    try:
+        tabla.declare_variable("x", "bool")
+    except SyntaxError as e:
+        assert str(e) == "Variable 'x' ya declarada en ámbito 'block_1'", f"Mensaje inesperado: {e}"
+    else:
+        raise AssertionError("Se esperaba un error por la variable repetida en el mismo ámbito")
+    print("ÉXITO: variable que oculta otra de un ámbito exterior")
+
+    # Un bloque o una función (sus parámetros también) que oculta una global; los bloques
+    # hermanos no se ocultan entre sí
+    codigo_sombras = (
+        "int x = 1;\nif (x > 0) { float x = 2.5; x = x * 2.0; }\n"
+        "if (x > 1) { int y = 2; } else { int y = 3; }\nint f(int x) { return x; }\nint z = f(x);"
+    )
+    diagnostics = Diagnostics()
+    Compiler(diagnostics=diagnostics).compile(codigo_sombras)
+    sombras = [(r.location, diagnostics.position(r)) for r in diagnostics.by_code('shadowed-variable')]
+    assert sombras == [('block_1', (2, 20)), ('function_f', (4, 11))], f"Advertencias inesperadas: {sombras}"
+    print(f"ÉXITO: {diagnostics.by_code('shadowed-variable')[0].message}, en {sombras}")
+
+    # Sin Diagnostics el semántico no arma mensajes ni imprime nada
+    with contextlib.redirect_stdout(io.StringIO()) as salida:
+        semantic(parser(lexer(codigo)))
+    assert salida.getvalue() == "", f"El semántico imprimió: {salida.getvalue()!r}"
+    print("ÉXITO: sin Diagnostics no se imprime nada")
+
+
+def test_slots():
+    """
+    El semántico da un slot a cada variable y el generador a cada temporal; el ensamblador
+    usa los slots y la VM los guarda en una lista, con la misma memoria que resolviendo nombres
+    """
+    print("\nPRUEBAS DE SLOTS")
+    print("=" * 50)
+
+    codigo = "int a = 2; int f(int p) { int q = p * 3; return q; } int b = f(a) + a; if (b > 5) { int a = 1; b = a; }"
+    compiler = Compiler().compile(codigo)
+    tabla = compiler.symbol_table
+    assert (tabla['global']['a']['slot'], tabla['global']['b']['slot']) == (0, 1)
+    assert (tabla['function_f']['p']['slot'], tabla['function_f']['q']['slot']) == (2, 3)
+    assert (tabla['block_1']['a']['slot'], tabla['block_1']['a']['storage']) == (4, 'a.2'), \
+        "Cada declaración debe tener su slot"
+    assert tabla['global']['a']['storage'] == 'a', "La declaración más externa conserva el nombre"
+    assert sorted(compiler.slots.values()) == list(range(len(compiler.slots))), "Slots no densos"
+    print(f"ÉXITO: {len(compiler.slots)} slots densos, variables antes que temporales")
+
+    lineas = compiler.asm.splitlines()
+    nombres = [nombre.partition(':')[0] for nombre in lineas[0].split()[1:]]
+    assert lineas[0].startswith("SLOTS ") and nombres == sorted(compiler.slots, key=compiler.slots.get)
+    assert "STORE @1" in lineas and not any(linea.split()[-1] in ('a', 'b', 'q') for linea in lineas[1:])
+    vm = compiler.run()
+    assert len(vm.memory) + len(vm.ints) + len(vm.floats) == len(compiler.slots)
+
+    ocg = CodeGeneratorob()
+    ocg.generate_code(compiler.quads)
+    por_nombre = VirtualMachine()
+    por_nombre.load_program(ocg.get_code())
+    por_nombre.run()
+    assert vm.get_memory_state() == por_nombre.get_memory_state()
+    assert (vm.get_memory_state()['a'], vm.get_memory_state()['b'], vm.get_memory_state()['a.2']) == (2, 1, 1)
+    print(f"ÉXITO: misma memoria con slots y con nombres: {vm.get_memory_state()}")
+
+    vm = VirtualMachine()
+    vm.load_program("LOAD x\nSTORE y")
+    try:
+        vm.run()
+    except Exception as e:
+        assert str(e) == "Error de ejecución: Variable no inicializada o inexistente: 'x'", f"Mensaje inesperado: {e}"
+    else:
+        raise AssertionError("Se esperaba un error por variable sin inicializar")
+    print("ÉXITO: variable sin inicializar informada por su nombre")
+
+
+def test_typed_ops():
+    """
+    Con los tipos del semántico el ensamblador emite operaciones int y float y la VM guarda
+    esas variables en arreglos array('q') y array('d'); las demás siguen en la lista
+    """
+    print("\nPRUEBAS DE OPERACIONES TIPADAS")
+    print("=" * 50)
+
+    codigo = "int a = 7; int b = 0 - 2; int c = a / b; float x = 1.5; float y = x * 2.0; bool ok = a > b;"
+    compiler = Compiler().compile(codigo)
+    lineas = compiler.asm.splitlines()
+    assert lineas[0].split()[1:4] == ["a:int", "b:int", "c:int"], f"Cabecera inesperada: {lineas[0]}"
+    for instruccion in ("ISUB 2", "IDIV @1", "FMUL 2.0", "IGT @1"):
+        assert instruccion in lineas, f"Falta '{instruccion}' en:\n{compiler.asm}"
+    assert not any(linea.split()[0] in ("ADD", "SUB", "MUL", "DIV", "GT") for linea in lineas[1:])
+    print("ÉXITO: ISUB, IDIV, FMUL e IGT en lugar de las operaciones genéricas")
+
+    vm = compiler.run()
+    estado = vm.get_memory_state()
+    assert (vm.ints.typecode, vm.floats.typecode) == ('q', 'd')
+    assert (estado['a'], estado['b'], estado['c']) == (7, -2, -3), "La división entera trunca hacia cero"
+    assert (estado['x'], estado['y'], estado['ok']) == (1.5, 3.0, 1)
+    assert list(vm.ints[:3]) == [7, -2, -3] and list(vm.floats[:2]) == [1.5, 3.0]
+    print(f"ÉXITO: variables en sus bancos: {estado}")
+
+    # Sin tipos (asm escrito a mano o sin semántico) se usan las operaciones genéricas
+    ocg = CodeGeneratorob()
+    ocg.generate_code(compiler.quads, compiler.slots)
+    assert "DIV @1" in ocg.get_code().splitlines() and "IDIV @1" not in ocg.get_code()
+    vm = VirtualMachine()
+    vm.load_program(ocg.get_code())
+    vm.run()
+    assert vm.get_memory_state()['c'] == -3, "La DIV genérica de dos int también trunca"
+    print("ÉXITO: sin tipos, operaciones genéricas")
+
+    # Un nombre redeclarado con otro tipo tiene otro slot, con su tipo: la división int sigue
+    # entera (después en el mismo ámbito, en un bloque hermano o en un nodo compartido)
+    sombreados = [
+        ("int c = 9; int y = c / 7; if (true) { float c = 1.5; }", 'y', 1),
+        ("if (true) { int x = 7; int a = (x*x)/2; } if (true) { float x = 1.0; }", 'a', 24),
+        ("int a = 3; if (true) { float a = 1.5; float y = a + a; } int z = (a + a) / 4;", 'z', 1),
+    ]
+    for codigo, nombre, esperado in sombreados:
+        for opciones in ({}, {'optimize': True}, {'hash_consing': True}, {'cse': True}):
+            compiler = Compiler(**opciones).compile(codigo)
+            valor = compiler.run().get_memory_state()[nombre]
+            assert type(valor) is int and valor == esperado, f"{codigo} {opciones}: {nombre} = {valor!r}"
+            assert None not in compiler.types.values(), f"Slots sin tipo: {compiler.types}"
+        assert "IDIV" in compiler.asm, f"Se esperaba IDIV en:\n{compiler.asm}"
+    print("ÉXITO: división entera con nombres redeclarados con otro tipo")
+
+
+def test_division_and_big_ints():
+    """
+    '/' entre dos int da un int (el semántico la tipa int) truncado hacia cero, igual al
+    plegarla el optimizador y al ejecutarla la VM; entre dos float es la división real.
+    Un int de más de 64 bits se calcula exacto: su slot sale del banco int
+    """
+    print("\nPRUEBAS DE DIVISIÓN Y ENTEROS GRANDES")
+    print("=" * 50)
+
+    # Con literales el optimizador pliega la división; con variables la calcula la VM
+    divisiones = [("7 / 2", 3), ("(0 - 7) / 2", -3), ("42 / 3", 14), ("7.0 / 2.0", 3.5)]
+    for expresion, esperado in divisiones:
+        tipo = type(esperado).__name__
+        for codigo in (f"{tipo} r = {expresion};",
+                       f"{tipo} p = {expresion.replace(' / ', '; ' + tipo + ' q = ')}; {tipo} r = p / q;"):
+            for opciones in ({}, {'optimize': True}, {'cse': True}):
+                valor = Compiler(**opciones).compile(codigo).run().get_memory_state()['r']
+                assert type(valor) is type(esperado) and valor == esperado, f"{codigo} {opciones}: r = {valor!r}"
+    print(f"ÉXITO: {', '.join(f'{e} = {v}' for e, v in divisiones)}, plegadas y en la VM")
+
+    codigo = (
+        "int fact(int n) { int r = 1; if (n > 1) { r = n * fact(n - 1); } return r; }\n"
+        "int big = 9223372036854775807; big = big + 1; int f = fact(25); int back = big - 2;"
+    )
+    for opciones in ({}, {'optimize': True}, {'hash_consing': True}, {'ssa': True}):
+        compiler = Compiler(**opciones).compile(codigo)
+        vm = compiler.run()
+        estado = vm.get_memory_state()
+        assert (estado['big'], estado['back']) == (2 ** 63, 2 ** 63 - 2), f"{opciones}: {estado}"
+        assert estado['f'] == 15511210043330985984000000, f"{opciones}: 25! = {estado['f']}"
+        assert vm.slot_locations[compiler.slots['big']][0] is vm.memory, "El slot que desborda pasa a la lista"
+    print(f"ÉXITO: 2**63 = {estado['big']} y 25! = {estado['f']} exactos")
+
+
+if __name__ == "__main__":
+    print("SUITE DE PRUEBAS DEL CONTEXTO DE COMPILACIÓN")
+    print("=" * 80)
+
+    test_concurrent_compilations()
+    test_diagnostics()
+    test_slots()
+    test_typed_ops()
+    test_division_and_big_ints()
+
+    print(f"\n{'='*80}")
+    print("SUITE DEL CONTEXTO DE COMPILACIÓN COMPLETADA")
+    print("=" * 80)
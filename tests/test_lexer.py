@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Pruebas del analizador léxico
+Verifica los tokens producidos (tipo, valor, línea y columna) y los mensajes de error
+"""
+
+import sys
+import os
+import io
+import tempfile
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexico.lexer import lexer, iter_tokens, lexer_file, LineIndex
+from src.lexico.parallel import parallel_lexer, split_points
+from src.lexico.incremental import relex
+from src.sintactico.parser import parser
+from src.sintactico.ast_nodes import to_tuple
+
+def test_token_tuples():
+    """
+    Cada token conserva su tipo, valor, línea y columna
+    """
+    print("PRUEBAS DE TOKENS")
+    print("=" * 60)
+
+    casos = [
+        {
+            "codigo": "bool activo = !false;",
+            "esperado": [
+                ('KEYWORD', 'bool', 1, 1), ('IDENTIFIER', 'activo', 1, 6), ('OPERATOR', '=', 1, 13),
+                ('OPERATOR', '!', 1, 15), ('KEYWORD', 'false', 1, 16), ('SEMICOLON', ';', 1, 21),
+            ]
+        },
+        {
+            "codigo": "if (a <= 3.5) { b = a != c; }",
+            "esperado": [
+                ('KEYWORD', 'if', 1, 1), ('LPAREN', '(', 1, 4), ('IDENTIFIER', 'a', 1, 5),
+                ('LESSEQUAL', '<=', 1, 7), ('NUMBER', '3.5', 1, 10), ('RPAREN', ')', 1, 13),
+                ('LBRACE', '{', 1, 15), ('IDENTIFIER', 'b', 1, 17), ('OPERATOR', '=', 1, 19),
+                ('IDENTIFIER', 'a', 1, 21), ('NOTEQUAL', '!=', 1, 23), ('IDENTIFIER', 'c', 1, 26),
+                ('SEMICOLON', ';', 1, 27), ('RBRACE', '}', 1, 29),
+            ]
+        },
+        {
+            "codigo": "// comentario\nstring s = \"dos\nlineas\"; char c = '\\n';",
+            "esperado": [
+                ('KEYWORD', 'string', 2, 1), ('IDENTIFIER', 's', 2, 8), ('OPERATOR', '=', 2, 10),
+                ('STRING', '"dos\nlineas"', 2, 12), ('SEMICOLON', ';', 3, 8), ('KEYWORD', 'char', 3, 10),
+                ('IDENTIFIER', 'c', 3, 15), ('OPERATOR', '=', 3, 17), ('CHAR', "'\\n'", 3, 19),
+                ('SEMICOLON', ';', 3, 23),
+            ]
+        },
+    ]
+
+    for i, caso in enumerate(casos, 1):
+        print(f"\nCASO {i}: {caso['codigo']!r}")
+        tokens = list(lexer(caso["codigo"]).with_positions())
+        assert tokens == caso["esperado"], f"Tokens inesperados: {tokens}"
+        print(f"ÉXITO: {len(tokens)} tokens correctos")
+
+def test_lexical_error_messages():
+    """
+    Los errores léxicos indican el carácter, la línea y la columna
+    """
+    print(f"\nPRUEBAS DE MENSAJES DE ERROR")
+    print("=" * 60)
+
+    casos = [
+        ("int x = @invalid;", "Token no reconocido '@' en línea 1, columna 9"),
+        ("int a = 1;\n  int b = #;", "Token no reconocido '#' en línea 2, columna 11"),
+        ("string s = \"sin cerrar;", "Token no reconocido '\"' en línea 1, columna 12"),
+    ]
+
+    for codigo, mensaje in casos:
+        print(f"\nCódigo: {codigo!r}")
+        try:
+            lexer(codigo)
+        except SyntaxError as e:
+            assert str(e) == mensaje, f"Mensaje inesperado: {e}"
+            print(f"ÉXITO: {e}")
+        else:
+            raise AssertionError("Se esperaba un error léxico")
+
+def test_lazy_positions():
+    """
+    Las posiciones se calculan bajo demanda a partir del desplazamiento de cada token
+    """
+    print(f"\nPRUEBAS DE POSICIONES BAJO DEMANDA")
+    print("=" * 60)
+
+    index = LineIndex("ab\ncd\n\nef")
+    assert [index.position(o) for o in (0, 1, 2, 3, 6, 7)] == [(1, 1), (1, 2), (1, 3), (2, 1), (3, 1), (4, 1)]
+    print("ÉXITO: LineIndex traduce desplazamientos a (línea, columna)")
+
+    codigo = "int a = 1;\nif (a > 0) {\n    a = a + ;\n}"
+    tokens = lexer(codigo)
+    assert tokens[0] == ('KEYWORD', 'int', 0)
+    assert tokens.position(tokens[-3]) == (3, 11)
+    try:
+        parser(tokens)
+    except SyntaxError as e:
+        assert str(e) == "Error en línea 3, columna 13: token inesperado ';' en expresión", str(e)
+        print(f"ÉXITO: {e}")
+    else:
+        raise AssertionError("Se esperaba un error sintáctico")
+
+def test_iter_tokens_chunks():
+    """
+    El lexer por flujo produce los mismos tokens que lexer() con cualquier tamaño de bloque,
+    aunque cadenas, comentarios, números y operadores de dos caracteres crucen el borde
+    """
+    print(f"\nPRUEBAS DEL LEXER POR FLUJO")
+    print("=" * 60)
+
+    codigo = (
+        "// comentario con <= y \"comillas\"\n"
+        "int a = 12; float b = 3.14; string s = \"a \\\" b\nc\";\n"
+        "char c = 'x'; if (a <= 5) { a = a + 1; } bool q = a != 3; // fin"
+    )
+    esperado = list(lexer(codigo))
+    for chunk_size in (1, 2, 3, 5, 8, 13, 64, 4096):
+        obtenido = list(iter_tokens(io.StringIO(codigo), chunk_size=chunk_size))
+        assert obtenido == esperado, f"Bloques de {chunk_size}: {obtenido}"
+    print(f"ÉXITO: {len(esperado)} tokens idénticos con todos los tamaños de bloque")
+
+    for codigo in ("int x = @;", "string s = \"sin cerrar;", "int a;\n  #"):
+        try:
+            lexer(codigo)
+        except SyntaxError as e:
+            mensaje = str(e)
+        for chunk_size in (1, 4, 4096):
+            try:
+                list(iter_tokens(io.StringIO(codigo), chunk_size=chunk_size))
+            except SyntaxError as e:
+                assert str(e) == mensaje, f"Mensaje inesperado: {e}"
+            else:
+                raise AssertionError("Se esperaba un error léxico")
+        print(f"ÉXITO: mismo error por flujo - {mensaje}")
+
+    codigo = "int a = 5;\nint b = a * 2;\nif (b > a) { a = b; } else { b = a; }"
+    assert to_tuple(parser(iter_tokens(io.StringIO(codigo), chunk_size=4))) == to_tuple(parser(lexer(codigo)))
+    print("ÉXITO: el parser consume el flujo directamente")
+
+def test_lexer_file_mmap():
+    """
+    lexer_file mapea el archivo y produce los mismos tokens, posiciones y errores que lexer()
+    """
+    print(f"\nPRUEBAS DEL LEXER SOBRE ARCHIVOS MAPEADOS")
+    print("=" * 60)
+
+    casos = [
+        "int a = 5;\nfloat b = 2.5;\nif (a >= 3) { a = a - 1; }",
+        "// comentario con ñ\nstring s = \"año\nnuevo\"; int b = ;",
+        "int añb = 5;",
+        "int a = 5;\nint b = @;",
+        "",
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, codigo in enumerate(casos, 1):
+            path = os.path.join(tmp, f"caso{i}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(codigo)
+
+            resultados = []
+            for lexear in (lambda: lexer(codigo), lambda: lexer_file(path)):
+                try:
+                    tokens = lexear()
+                    vista = list(tokens.with_positions())
+                    try:
+                        ast = to_tuple(parser(tokens))
+                    except (SyntaxError, IndexError) as e:
+                        ast = str(e)
+                    resultados.append((vista, ast))
+                except SyntaxError as e:
+                    resultados.append(str(e))
+            assert resultados[0] == resultados[1], f"Resultados distintos: {resultados}"
+            print(f"ÉXITO: caso {i} idéntico con mmap")
+
+def test_parallel_lexer():
+    """
+    El lexer paralelo parte solo en saltos de línea seguros y da el mismo flujo que lexer()
+    """
+    print(f"\nPRUEBAS DEL LEXER PARALELO")
+    print("=" * 60)
+
+    bloque = (
+        "string s = \"primera\nsegunda\";\n"
+        "char c = '\n';\n"
+        "// comentario con \" comillas\n"
+        "int a = 3; float b = 2.5;\n"
+    )
+    codigo = bloque * 40
+    esperado = lexer(codigo)
+    puntos = split_points(codigo, 8)
+    assert len(puntos) == 7
+    for point in puntos:
+        assert codigo[point - 1] == '\n'
+        assert all(not start < point < end for start, end in zip(esperado.starts, esperado.ends)), \
+            f"Corte dentro de un token en {point}"
+    print("ÉXITO: los puntos de corte no caen dentro de cadenas ni caracteres")
+
+    for workers in (2, 3):
+        obtenido = parallel_lexer(codigo, workers=workers, min_size=0)
+        assert (obtenido.kinds, obtenido.starts, obtenido.ends, obtenido.lines) == \
+               (esperado.kinds, esperado.starts, esperado.ends, esperado.lines)
+    print(f"ÉXITO: {len(esperado)} tokens idénticos con 2 y 3 procesos")
+
+    try:
+        parallel_lexer(codigo + "int x = @;", workers=2, min_size=0)
+    except SyntaxError as e:
+        assert str(e) == "Token no reconocido '@' en línea 241, columna 9", str(e)
+        print(f"ÉXITO: {e}")
+    else:
+        raise AssertionError("Se esperaba un error léxico")
+
+def test_relex():
+    """
+    relex() después de una edición da el mismo flujo (o el mismo error) que lexer() sobre
+    el código editado, también encadenando ediciones con corrimientos pendientes
+    """
+    print(f"\nPRUEBAS DEL LEXER INCREMENTAL")
+    print("=" * 60)
+
+    codigo = (
+        "int a = 12; // comentario\n"
+        "string s = \"dos\nlineas\";\n"
+        "if (a <= 3.5) { a = a + 1; }\n"
+        "char c = 'x'; bool q = a != 3;\n"
+    )
+    # (texto donde empieza la edición, caracteres borrados, texto insertado)
+    ediciones = [
+        ("a = 12", 1, "alfa"),          # Renombrar un identificador
+        ("2;", 0, "3"),                 # Extender un número
+        ("int", 0, "float b = 1.5;\n\n"),  # Agregar líneas al inicio
+        ("comentario", 0, "otro "),     # Editar dentro de un comentario
+        ("<= 3.5", 1, ">"),             # '<=' pasa a ser '>='
+        ("\"dos", 4, "\"tres"),          # Cambiar una cadena de varias líneas
+        ("// ", 18, ""),                # Borrar el comentario completo
+    ]
+
+    tokens = lexer(codigo)
+    for ancla, deleted, inserted in ediciones:
+        offset = codigo.index(ancla)
+        codigo = codigo[:offset] + inserted + codigo[offset + deleted:]
+        tokens = relex(tokens, offset, deleted, inserted)
+        esperado = lexer(codigo)
+        assert [tokens.start(i) for i in range(len(tokens))] == list(esperado.starts)
+        assert [tokens.line(i) for i in range(len(tokens))] == list(esperado.lines)
+        print(f"ÉXITO: edición en {offset} con {len(tokens)} tokens")
+    assert list(tokens.with_positions()) == list(esperado.with_positions())
+    assert (tokens.kinds, tokens.starts, tokens.ends, tokens.lines) == \
+           (esperado.kinds, esperado.starts, esperado.ends, esperado.lines)
+    print("ÉXITO: flujo idéntico al de lexer() después de encadenar ediciones")
+
+    for offset, deleted, inserted in ((8, 0, "\""), (8, 2, "@")):
+        try:
+            relex(tokens, offset, deleted, inserted)
+        except SyntaxError as e:
+            nuevo = codigo[:offset] + inserted + codigo[offset + deleted:]
+            try:
+                lexer(nuevo)
+            except SyntaxError as esperado_error:
+                assert str(e) == str(esperado_error), f"Mensaje inesperado: {e}"
+            print(f"ÉXITO: {e}")
+        else:
+            raise AssertionError("Se esperaba un error léxico")
+
+if __name__ == "__main__":
+    print("SUITE DE PRUEBAS DEL ANALIZADOR LÉXICO")
+    print("=" * 80)
+
+    test_token_tuples()
+    test_lexical_error_messages()
+    test_lazy_positions()
+    test_iter_tokens_chunks()
+    test_lexer_file_mmap()
+    test_parallel_lexer()
+    test_relex()
+
+    print(f"\n{'='*80}")
+    print("SUITE DEL ANALIZADOR LÉXICO COMPLETADA")
+    print("=" * 80)
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Pruebas del analizador sintáctico
+Verifica la forma del AST de expresiones y sentencias y los mensajes de error
+"""
+
+import sys
+import os
+
+# Agregar el directorio padre al path para poder importar los módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexico.lexer import lexer
+from src.lexico.incremental import relex
+from src.sintactico.parser import parser
+from src.sintactico.incremental import IncrementalParser
+from src.sintactico import ast_nodes
+from src.sintactico.ast_nodes import to_tuple, from_tuple, literal_type, ExpressionPool
+from src.semantico.semantic import SymbolTable, semantic, format_ast, slot_types
+from src.diagnostics import Diagnostics, TRACE
+from src.generador.code_generator import CodeGenerator
+from src.CodigoObjeto.codigob import CodeGeneratorob
+from src.VM.virtualmachine import VirtualMachine
+from src.compiler import Compiler
+
+def test_expression_precedence():
+    """
+    Las expresiones agrupan por precedencia y asocian por la izquierda
+    """
+    print("PRUEBAS DE PRECEDENCIA DE EXPRESIONES")
+    print("=" * 60)
+
+    casos = [
+        ("x = 1 + 2 * 3;", ('+', 1, ('*', 2, 3))),
+        ("x = 1 - 2 - 3;", ('-', ('-', 1, 2), 3)),
+        ("x = (1 + 2) * 3 / 4;", ('/', ('*', ('+', 1, 2), 3), 4)),
+        ("x = a + 1 > b * 2;", ('>', ('+', 'a', 1), ('*', 'b', 2))),
+        ("x = a < b == c;", ('==', ('<', 'a', 'b'), 'c')),
+        ("x = a != b + 1;", ('!=', 'a', ('+', 'b', 1))),
+        ("x = !a >= 1 * 2;", ('>=', ('NOT', 'a'), ('*', 1, 2))),
+        ("x = !!true == f(a, 2 * b);", ('==', ('NOT', ('NOT', True)), ('FUNC_CALL', 'f', ['a', ('*', 2, 'b')]))),
+        ("x = int(\"5\") + 2.5;", ('+', ('CAST', 'int', '"5"'), 2.5)),
+    ]
+
+    for codigo, esperado in casos:
+        print(f"\nCódigo: {codigo}")
+        ast = parser(lexer(codigo))
+        assert to_tuple(ast) == [('ASSIGNMENT', 'x', esperado)], f"AST inesperado: {ast}"
+        print(f"ÉXITO: {ast[0].expr}")
+
+def test_statement_dispatch():
+    """
+    Cada sentencia se reconoce por su primer token
+    """
+    print(f"\nPRUEBAS DE SENTENCIAS")
+    print("=" * 60)
+
+    codigo = (
+        "const int k = 3;\n"
+        "float f;\n"
+        "int g(int a, float b) { return a; }\n"
+        "if (k != 2) { f = 1.5; } else { f = 0.5; }\n"
+        "return k;"
+    )
+    ast = parser(lexer(codigo))
+    esperado = [
+        ('DECLARATION', 'const', 'int', 'k', 3),
+        ('DECLARATION', 'float', 'f'),
+        ('FUNC_DECL', 'g', ['int', 'float'], 'int', ast[2].body),
+        ('IF_ELSE', ('!=', 'k', 2),
+         [('BLOCK_ENTER',), ('ASSIGNMENT', 'f', 1.5), ('BLOCK_EXIT',)],
+         [('BLOCK_ENTER',), ('ASSIGNMENT', 'f', 0.5), ('BLOCK_EXIT',)]),
+        ('RETURN', 'k'),
+    ]
+    assert to_tuple(ast) == esperado, f"AST inesperado: {ast}"
+    assert ast[2].body.param_names == ['a', 'b'] and to_tuple(ast[2].body.statements()) == [('RETURN', 'a')]
+    print(f"ÉXITO: {len(ast)} sentencias")
+
+    for codigo, mensaje in (
+        ("else { x = 1; }", "Error en línea 1, columna 1: sentencia inválida, token inesperado 'else'"),
+        ("int x = 1;\n  5 = x;", "Error en línea 2, columna 3: sentencia inválida, token inesperado '5'"),
+    ):
+        try:
+            parser(lexer(codigo))
+        except SyntaxError as e:
+            assert str(e) == mensaje, f"Mensaje inesperado: {e}"
+            print(f"ÉXITO: {e}")
+        else:
+            raise AssertionError("Se esperaba un error sintáctico")
+
+def test_deep_nesting():
+    """
+    Parser, semántico y generador de código no dependen del límite de recursión
+    """
+    print(f"\nPRUEBAS DE ANIDAMIENTO PROFUNDO")
+    print("=" * 60)
+
+    profundidad = 100_000
+    casos = [
+        ("paréntesis", "int x = " + "(" * profundidad + "1" + ")" * profundidad + ";", 1),
+        ("negaciones", "bool x = " + "!" * profundidad + "true;", profundidad + 1),
+        ("cadena +", "int x = " + " + ".join(["1"] * profundidad) + ";", profundidad),
+        ("if anidados", "int x = 0; " + "if (true) { " * profundidad + "x = 1;" + " }" * profundidad,
+         4 * profundidad + 2),
+    ]
+
+    for nombre, codigo, cuadruplas in casos:
+        ast = parser(lexer(codigo))
+        diagnostics = Diagnostics(TRACE)
+        semantic(ast, diagnostics=diagnostics)
+        assert diagnostics.by_code('ast')[0].message.startswith(format_ast(ast)[:50])
+        code = CodeGenerator().generate(ast)
+        assert len(code) == cuadruplas, f"{nombre}: {len(code)} cuádruplas"
+        print(f"ÉXITO: {nombre} con profundidad {profundidad} ({len(code)} cuádruplas)")
+
+    assert format_ast([('IF', ('!', 1), [('BLOCK_ENTER',), ('X', 'a', 2.5, None, [])])]) == \
+           repr([('IF', ('!', 1), [('BLOCK_ENTER',), ('X', 'a', 2.5, None, [])])])
+    print("ÉXITO: format_ast coincide con repr")
+
+def test_ast_nodes():
+    """
+    Los nodos tienen tipo entero y campos con nombre; to_tuple y from_tuple los convierten
+    """
+    print(f"\nPRUEBAS DE NODOS DEL AST")
+    print("=" * 60)
+
+    ast = parser(lexer("const int k = 3; if (k > 1) { k2 = !f(k, int(2.5)); } else { k2 = false; }"))
+    declaracion, condicional = ast
+    assert declaracion.kind == ast_nodes.DECLARATION and declaracion.const and declaracion.init == 3
+    assert condicional.kind == ast_nodes.IF_ELSE and condicional.cond.op == '>'
+    assert condicional.then_block[0] is condicional.else_block[0] is ast_nodes.BLOCK_ENTER_NODE
+    negacion = condicional.then_block[1].expr
+    assert negacion.kind == ast_nodes.NOT and negacion.operand.args[1].cast_type == 'int'
+    assert not hasattr(declaracion, '__dict__'), "Los nodos no deben tener __dict__"
+    print("ÉXITO: tipos y campos de los nodos")
+
+    # repr() de los nodos es el de sus tuplas, y from_tuple arma los mismos nodos
+    tuplas = to_tuple(ast)
+    assert repr(ast) == repr(tuplas) == format_ast(ast)
+    assert to_tuple(from_tuple(tuplas)) == tuplas
+    assert format_ast(from_tuple(('DECLARATION', 'int', 'x'))) == "('DECLARATION', 'int', 'x')"
+    print(f"ÉXITO: {tuplas[1][0]} ida y vuelta por tuplas")
+
+def test_hash_consing():
+    """
+    Con un ExpressionPool las subexpresiones iguales son un nodo, con su tipo y su temporal
+    reutilizados solo donde siguen valiendo
+    """
+    print(f"\nPRUEBAS DE EXPRESIONES COMPARTIDAS")
+    print("=" * 60)
+
+    codigo = (
+        "int x = 2; int y = x * 3 + 1; int z = x * 3 + 1;\n"
+        "if (y > 1) { y = x * 3 + 1; x = 5; z = x * 3 + 1; }\n"
+        "y = (x * 3 + 1) * (x * 3 + 1);\n"
+    )
+    pool = ExpressionPool()
+    ast = parser(lexer(codigo), pool=pool)
+    assert ast[1].init is ast[2].init is ast[3].then_block[1].expr, "No se compartió x * 3 + 1"
+    assert ast[4].expr.left is ast[4].expr.right
+    assert to_tuple(ast) == to_tuple(parser(lexer(codigo)))
+    print(f"ÉXITO: {pool.shared} nodos distintos para {pool.interned} subexpresiones")
+
+    semantic(ast, pool)
+    assert pool.type_hits > 0
+    print(f"ÉXITO: {pool.type_hits} tipos reutilizados de {pool.type_evals} evaluaciones")
+
+    # El temporal solo se reutiliza dentro del mismo camino y sin asignar x en el medio
+    memorias = []
+    for p in (None, pool):
+        code = CodeGenerator(p).generate(ast)
+        ocg = CodeGeneratorob()
+        ocg.generate_code(code)
+        vm = VirtualMachine()
+        vm.load_program(ocg.get_code())
+        vm.run()
+        memoria = vm.get_memory_state()
+        memorias.append((len(code), {k: memoria[k] for k in 'xyz'}))
+    (sin_pool, esperado), (con_pool, memoria) = memorias
+    assert memoria == esperado == {'x': 5, 'y': 256, 'z': 16}, f"Memoria inesperada: {memoria}"
+    assert con_pool < sin_pool
+    print(f"ÉXITO: {con_pool} cuádruplas en vez de {sin_pool}, misma memoria {memoria}")
+
+    # Un nodo compartido en ámbitos con tipos distintos se vuelve a revisar
+    codigo = "int x = 1; int y = x * 2; if (y > 1) { float x = 2.5; float w = x * 2; }"
+    pool = ExpressionPool()
+    try:
+        semantic(parser(lexer(codigo), pool=pool), pool)
+    except SyntaxError as e:
+        assert str(e) == "Tipos incompatibles en operación '*': float vs int", f"Mensaje inesperado: {e}"
+        print(f"ÉXITO: {e}")
+    else:
+        raise AssertionError("Se esperaba un error de tipos en el ámbito interno")
+
+def test_symbol_table():
+    """
+    La SymbolTable resuelve cada nombre en el ámbito más interno que lo declara, y el cuerpo
+    de una función solo ve el ámbito global y sus parámetros
+    """
+    print(f"\nPRUEBAS DE LA TABLA DE SÍMBOLOS")
+    print("=" * 60)
+
+    symbols = SymbolTable()
+    symbols.enter_scope("global")
+    symbols.declare_variable("x", "int")
+    symbols.enter_scope("block_")
+    symbols.declare_variable("x", "float")
+    symbols.declare_variable("y", "bool")
+    assert symbols.lookup("x")['type'] == 'float'
+    assert symbols.variable_types(("x", "y")) == ('float', 'bool')
+    saved = symbols.suspend()
+    assert symbols.lookup("x")['type'] == 'int' and symbols.variable_types(("y",)) is None
+    symbols.resume(saved)
+    assert symbols.lookup("y")['type'] == 'bool'
+    symbols.exit_scope()
+    assert symbols.lookup("x")['type'] == 'int' and symbols.variable_types(("y",)) is None
+    assert list(symbols.table) == ['functions', 'global', 'block_1']
+    print("ÉXITO: ámbitos anidados, suspendidos y cerrados")
+
+    # f se revisa desde un bloque que oculta 'a' con un float: adentro 'a' es la global
+    codigo = (
+        "int a = 1; int f(int n) { int b = n; return b + a; }\n"
+        "if (a > 0) { float a = 2.5; int b = f(1); a = a * 2.0; }\n"
+        "a = f(a);\n"
+    )
+    tabla = semantic(parser(lexer(codigo)))
+    assert list(tabla) == ['functions', 'global', 'block_1', 'function_f'], f"Ámbitos inesperados: {list(tabla)}"
+    assert tabla['block_1']['a']['type'] == 'float' and tabla['global']['a']['used']
+    print(f"ÉXITO: ámbitos {', '.join(tabla)}")
+
+    # Cada declaración tiene su slot: el 'a' float del bloque y el 'b' de f no pisan a los
+    # otros; la declaración más externa de cada nombre lo conserva en la memoria
+    for opciones in ({}, {'optimize': True}, {'hash_consing': True}, {'cse': True}, {'ssa': True}):
+        memoria = Compiler(**opciones).compile(codigo).run().get_memory_state()
+        assert (memoria['a'], memoria['a.2'], memoria['b']) == (2, 5.0, 2), f"Memoria inesperada con {opciones}: {memoria}"
+    print(f"ÉXITO: un slot por declaración: {memoria}")
+
+    # Las variables del bloque que llama no se ven dentro de la función
+    codigo = "int a = 1; int f(int n) { return n + b; } if (a > 0) { int b = 2; int r = f(b); }"
+    try:
+        semantic(parser(lexer(codigo)))
+    except SyntaxError as e:
+        assert str(e) == "Variable 'b' no declarada", f"Mensaje inesperado: {e}"
+        print(f"ÉXITO: {e}")
+    else:
+        raise AssertionError("Se esperaba un error por la variable del bloque que llama")
+
+def test_type_annotations():
+    """
+    El semántico revisa cada expresión en un solo recorrido, anota el tipo de sus nodos e
+    informa los errores en el mismo orden que con un recorrido para los tipos y otro para los usos
+    """
+    print(f"\nPRUEBAS DE TIPOS ANOTADOS")
+    print("=" * 60)
+
+    codigo = "int x = 2; float f = float(x) * 2.0; bool b = !(x > 1); int g(int n) { return n; } x = g(x) + 1;"
+    ast = parser(lexer(codigo))
+    semantic(ast)
+    f_init, b_init, x_expr = ast[1].init, ast[2].init, ast[4].expr
+    assert (f_init.type, f_init.left.type) == ('float', 'float')
+    assert (b_init.type, b_init.operand.type) == ('bool', 'bool')
+    assert (x_expr.type, x_expr.left.type) == ('int', 'int')
+    print("ÉXITO: tipos anotados en operaciones, casts, negaciones y llamadas")
+
+    # Los literales string y char llevan el tipo que registró el parser: nadie vuelve a
+    # mirar sus comillas (un str común entre comillas no es un literal)
+    ast = parser(lexer("string s = \"ho\" + \"la\"; char c = 'a';"))
+    concatenacion, caracter = ast[0].init, ast[1].init
+    assert (concatenacion.left.type, caracter.type) == ('string', 'char')
+    assert literal_type('"ho"') is None and literal_type(from_tuple(('+', '"ho"', 1)).left) == 'string'
+    symbols = semantic(ast)
+    icg = CodeGenerator(types=slot_types(symbols))
+    assert icg.generate(ast)[0] == ('t1', '+', '"ho"', '"la"') and icg.types['t1'] == 'string'
+    print(f"ÉXITO: {concatenacion.left} es {concatenacion.left.type} y {caracter} es {caracter.type}")
+
+    # Un char escapado ('\n', cuatro caracteres) sigue siendo char al pasar por tuplas
+    ast = parser(lexer("char c = '\\n'; char d = 'a';"))
+    tuplas = to_tuple(ast)
+    assert tuplas == [('DECLARATION', 'char', 'c', "'\\n'"), ('DECLARATION', 'char', 'd', "'a'")], f"AST inesperado: {tuplas}"
+    vuelta = from_tuple(tuplas)
+    assert [literal_type(declaracion.init) for declaracion in vuelta] == ['char', 'char']
+    assert to_tuple(vuelta) == tuplas
+    semantic(vuelta)
+    print(f"ÉXITO: {vuelta[0].init} es {literal_type(vuelta[0].init)} también desde tuplas")
+
+    # En una declaración se informan primero los usos; en una asignación, primero los tipos
+    casos = [
+        ("int u; int y = (1 + 2.5) + u;", "Variable 'u' usada antes de ser inicializada"),
+        ("int u; int y = 1; y = (1 + 2.5) + u;", "Tipos incompatibles en operación '+': int vs float"),
+        ("int u; int y = 1; y = u + 1.5;", "Tipos incompatibles en operación '+': int vs float"),
+        ("int u; int y = 1; if (u > 0) { y = 2; }", "Variable 'u' usada antes de ser inicializada"),
+        ("int y = 1; if (y + 1) { y = 2; }", "Condición inválida en 'if': se esperaba 'bool' pero se obtuvo 'int'"),
+    ]
+    for codigo, esperado in casos:
+        try:
+            semantic(parser(lexer(codigo)))
+        except SyntaxError as e:
+            assert str(e) == esperado, f"Mensaje inesperado para {codigo!r}: {e}"
+        else:
+            raise AssertionError(f"Se esperaba un error en {codigo!r}")
+    print(f"ÉXITO: {len(casos)} errores en el orden esperado")
+
+def test_lazy_function_bodies():
+    """
+    Los cuerpos de función se analizan, revisan y generan solo si se llaman
+    """
+    print(f"\nPRUEBAS DE CUERPOS DE FUNCIÓN BAJO DEMANDA")
+    print("=" * 60)
+
+    codigo = (
+        "int nunca(int a) { return a +* 1; }\n"  # Error sintáctico en una función sin llamadas
+        "int doble(int a) { return a * 2; }\n"
+        "int fact(int n) { int r = 1; if (n > 1) { r = n * fact(n - 1); } return r; }\n"
+        "int x = doble(3);\n"
+        "int y = fact(5) + doble(x);\n"
+    )
+    ast = parser(lexer(codigo))
+    cuerpos = {node.name: node.body for node in ast if node.kind == ast_nodes.FUNC_DECL}
+    semantic(ast)
+    assert cuerpos['nunca']._statements is None, "Se analizó una función que nadie llama"
+    assert cuerpos['fact']._statements is not None
+    print("ÉXITO: solo se analizaron los cuerpos llamados")
+
+    code = CodeGenerator().generate(ast)
+    etiquetas = [q[0] for q in code if q[1] == 'label']
+    assert etiquetas == ['doble', 'fact', 'L1', 'L2'], f"Etiquetas inesperadas: {etiquetas}"
+    ocg = CodeGeneratorob()
+    ocg.generate_code(code)
+    vm = VirtualMachine()
+    vm.load_program(ocg.get_code())
+    vm.run()
+    memoria = vm.get_memory_state()
+    assert (memoria['x'], memoria['y']) == (6, 132), f"Memoria inesperada: {memoria}"
+    print(f"ÉXITO: x = {memoria['x']}, y = {memoria['y']} (llamada recursiva incluida)")
+
+    # La llamada solo restaura los nombres propios de la función: lo que asigna a una
+    # variable global queda, también al optimizar, en SSA y con expresiones compartidas
+    codigo = (
+        "int g = 1; int x = 7;\n"
+        "int f(int a) { g = a; return a + 1; }\n"
+        "int fact(int n) { int x = 1; if (n > 1) { x = n * fact(n - 1); g = g + 1; } return x; }\n"
+        "int c = g * 3; int r = f(5); int d = g * 3; int y = fact(4);\n"
+    )
+    frame = [q[2] for q in CodeGenerator().generate(parser(lexer(codigo))) if q[1] == 'frame']
+    assert frame == [('a', 't5'), ('n', 'x', 't6', 't7', 't8', 't9', 't10')], f"Frames inesperados: {frame}"
+    for opciones in ({}, {'optimize': True}, {'cse': True}, {'hash_consing': True}):
+        memoria = Compiler(**opciones).compile(codigo).run().get_memory_state()
+        valores = {nombre: memoria[nombre] for nombre in ('g', 'x', 'c', 'r', 'd', 'y')}
+        assert valores == {'g': 8, 'x': 7, 'c': 3, 'r': 6, 'd': 15, 'y': 24}, f"{opciones}: memoria inesperada: {valores}"
+    print(f"ÉXITO: la función asigna la global g y restaura su x local: {valores}")
+
+    for codigo, mensaje in (
+        ("int g() {\n int k = 1\n}\nint y = g();",
+         "Error en línea 2: se esperaba ';', pero no se encontró más tokens."),
+        ("float h(int a) { return a; }\nfloat q = h(1);",
+         "Retorno incompatible en la función 'h': esperado float, obtenido int"),
+    ):
+        try:
+            semantic(parser(lexer(codigo)))
+        except SyntaxError as e:
+            assert str(e) == mensaje, f"Mensaje inesperado: {e}"
+            print(f"ÉXITO: {e}")
+        else:
+            raise AssertionError("Se esperaba un error al llamar la función")
+
+def test_incremental_reparse():
+    """
+    El parser incremental da el mismo AST que parser() y solo analiza las sentencias editadas
+    """
+    print(f"\nPRUEBAS DEL PARSER INCREMENTAL")
+    print("=" * 60)
+
+    codigo = (
+        "int a = 1;\n"
+        "int doble(int n) { return n * 2; }\n"
+        "if (a > 0) { a = a + 1; }\n"
+        "float b = 2.5;\n"
+        "int c = doble(a);\n"
+    )
+    tokens = lexer(codigo)
+    incremental = IncrementalParser()
+    ast, cambiadas = incremental.parse(tokens)
+    assert format_ast(ast) == format_ast(parser(tokens)) and cambiadas == {0, 1, 2, 3, 4}
+
+    # (descripción, texto donde se edita, caracteres borrados, texto insertado, cambiadas)
+    ediciones = [
+        ("dentro del if", "a + 1", 5, "a + 7", {2}),
+        ("sentencia nueva", "float b", 0, "int d = a;\n", {3}),
+        ("agregar else", "\nint d =", 0, " else { a = 0; }", {2}),
+        ("cuerpo de función", "n * 2", 5, "n + n", {1}),
+        ("borrar sentencia", "int d = a;\n", 11, "", set()),
+        ("error sintáctico", "b = 2.5;", 8, "b = ;", None),
+    ]
+    for nombre, ancla, borrados, insertado, esperadas in ediciones:
+        desplazamiento = codigo.index(ancla)
+        nuevo = codigo[:desplazamiento] + insertado + codigo[desplazamiento + borrados:]
+        nuevos_tokens = relex(tokens, desplazamiento, borrados, insertado)
+        try:
+            esperado = format_ast(parser(lexer(nuevo)))
+        except SyntaxError as e:
+            try:
+                incremental.parse(nuevos_tokens)
+            except SyntaxError as e2:
+                assert str(e2) == str(e), f"{nombre}: mensaje inesperado: {e2}"
+                print(f"ÉXITO: {nombre}: {e2}")
+                continue
+            raise AssertionError(f"{nombre}: se esperaba un error sintáctico")
+
+        anterior = incremental.ast
+        ast, cambiadas = incremental.parse(nuevos_tokens)
+        assert format_ast(ast) == esperado, f"{nombre}: AST inesperado: {ast}"
+        assert cambiadas == esperadas, f"{nombre}: sentencias cambiadas {cambiadas}"
+        assert ast[0] is anterior[0], f"{nombre}: no se reutilizó la primera sentencia"
+        cuerpo = [node for node in ast if node.kind == ast_nodes.FUNC_DECL][0].body
+        assert to_tuple(cuerpo.statements()) == to_tuple(parser(lexer(nuevo))[1].body.statements())
+        print(f"ÉXITO: {nombre}: cambiadas {sorted(cambiadas)} de {len(ast)}")
+        codigo, tokens = nuevo, nuevos_tokens
+
+if __name__ == "__main__":
+    print("SUITE DE PRUEBAS DEL ANALIZADOR SINTÁCTICO")
+    print("=" * 80)
+
+    test_expression_precedence()
+    test_statement_dispatch()
+    test_deep_nesting()
+    test_ast_nodes()
+    test_hash_consing()
+    test_symbol_table()
+    test_type_annotations()
+    test_lazy_function_bodies()
+    test_incremental_reparse()
+
+    print(f"\n{'='*80}")
+    print("SUITE DEL ANALIZADOR SINTÁCTICO COMPLETADA")
+    print("=" * 80)
@@ -5,6 +5,8 @@ Cada caso es un dict con:
   - description: descripción legible
   - code: el snippet a compilar
   - expect_success: True si debe completarse sin errores, False si debe fallar
+PROGRAMAS reúne el código de esos casos y otros programas, para las pruebas que
+recorren todo el corpus (test_compiler y test_code_generator).
 """
 
 TEST_CASES = [
@@ -192,3 +194,33 @@ int total = suma2 + suma3;""",
         "expect_success": True
     },
 ]
+
+# Programas con funciones, bloques anidados y errores con línea, además de los casos del compilador
+PROGRAMAS = [caso["code"] for caso in TEST_CASES] + [
+    """\
+int suma(int a, int b) {
+    int r = a + b;
+    return r;
+}
+int total = suma(2, 3) * 2;
+if (total > 5) { total = total - 1; } else { total = total + 1; }""",
+    """\
+float escala(float x) { return x * 2.5; }
+int n = 3;
+float y = escala((float) n);
+bool ok = !(y < 1.0);""",
+    """\
+int x = 1;
+int y = 2;
+int z = (x + y * 3;""",
+    """\
+int a = 1;
+if (a > 0) {
+    if (a < 10) { int b = a + 1; a = b; }
+}
+int f(int p) { return p + q; }""",
+    """\
+int sin_usar;
+int g(int p) { return 1; }
+int h = g(2);""",
+]